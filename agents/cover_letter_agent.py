@@ -1,9 +1,9 @@
 # Resume_Tailoring/agents/cover_letter_agent.py
 import logging
 from typing import Dict, List, Optional
-import re # For parsing project titles from tailored_projects_text
 
 from models import JobDescription, ResumeSections
+from src.resume_model import parse_projects
 from utils.llm_gemini import GeminiClient, get_cover_letter_prompt, LLMRouter
 
 class CoverLetterAgent:
@@ -23,35 +23,16 @@ class CoverLetterAgent:
         if not tailored_projects_text:
             return project_details
 
-        # This parsing needs to be robust, similar to add_projects_docx,
-        # to extract project titles correctly.
-        # Assuming tailored_projects_text has titles and then bullets.
-        # A simple split by double newline might separate projects.
-        raw_project_entries = re.split(r'\n\s*\n+(?=\s*(?:(?:##|###)\s+)?\s*(?:\*\*)?\s*[A-Z0-9])', tailored_projects_text)
-
         temp_hyperlinks = self.project_hyperlinks_config.copy()
         if github_base_url: # Add dynamic GitHub links if base URL is known
             temp_hyperlinks["AI-Text Discriminator"] = f"{github_base_url}/AI-Content-Filter" # Example
 
-        for entry_text in raw_project_entries:
-            entry_text = entry_text.strip()
-            if not entry_text:
-                continue
-            
-            lines = [line.strip() for line in entry_text.split('\n') if line.strip()]
-            if not lines:
-                continue
-
-            title_line_from_llm = lines[0]
-            cleaned_project_title = re.sub(r"^\s*#+\s*", "", title_line_from_llm).strip()
-            title_parts = cleaned_project_title.split('|', 1)
-            project_name = title_parts[0].replace("**", "").strip()
-
-            if project_name:
-                details = {"title": project_name}
-                if project_name in temp_hyperlinks:
-                    details["url"] = temp_hyperlinks[project_name]
-                project_details.append(details)
+        # Same parsed entries the resume renderer uses (cached by text hash)
+        for project in parse_projects(tailored_projects_text):
+            details = {"title": project.title}
+            if project.title in temp_hyperlinks:
+                details["url"] = temp_hyperlinks[project.title]
+            project_details.append(details)
         
         return project_details
 
@@ -73,14 +54,8 @@ class CoverLetterAgent:
         candidate_name = contact_info.get("name", "The Candidate")
         
         job_title_str = job_desc.job_title or "the advertised position"
-        company_name = company_name_override 
-        if not company_name:
-            if " at " in job_title_str.lower():
-                parts = job_title_str.lower().split(" at ")
-                if len(parts) > 1: company_name = parts[-1].strip().title()
-            elif " - " in job_title_str: 
-                parts = job_title_str.split(" - ")
-                if len(parts) > 1: company_name = parts[-1].strip().title()
+        # Company comes from JDAnalysisAgent's structured extraction; no title-splitting heuristics here.
+        company_name = company_name_override or job_desc.company_name
         if not company_name:
             company_name = "the Hiring Company"; logging.warning(f"Using fallback company name: '{company_name}'")
         
@@ -1,6 +1,9 @@
 # Resume_Tailoring/agents/jd_analysis.py
 import logging
-from typing import List, Optional
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 # Assuming your project structure allows these imports
@@ -11,6 +14,95 @@ from utils.file_utils import read_text_file # Assuming read_text_file is what yo
 from models import JobDescription
 from utils.llm_gemini import GeminiClient, LLMRouter
 
+# --- Structured field extraction (company, title, location, seniority, employment type) ---
+# Results are cached per JD hash so repeated analyses of the same posting (reruns, batch jobs)
+# skip the regex passes and, more importantly, the optional LLM fallback. The key includes whether the
+# fallback was allowed, so a regex-only result never stands in for one that would have asked the LLM.
+_JD_FIELDS_CACHE: Dict[Tuple[str, bool], Dict[str, Optional[str]]] = {}
+_JD_FIELDS_CACHE_MAX_ENTRIES = 128
+_HEADER_SCAN_LINES = 20  # Structured fields live near the top of a posting
+
+_LABELED_FIELD_RE = re.compile(
+    r'^\s*(job\s*title|title|company(?:\s*name)?|employer|organization|(?:job\s*)?location|'
+    r'seniority(?:\s*level)?|experience\s*level|employment\s*type|job\s*type)\s*:\s*(.+?)\s*$',
+    re.IGNORECASE
+)
+_LABEL_TO_FIELD = {
+    'job title': 'job_title', 'title': 'job_title',
+    'company': 'company_name', 'company name': 'company_name', 'employer': 'company_name', 'organization': 'company_name',
+    'location': 'location', 'job location': 'location',
+    'seniority': 'seniority', 'seniority level': 'seniority', 'experience level': 'seniority',
+    'employment type': 'employment_type', 'job type': 'employment_type',
+}
+# Job boards (e.g. Jobright) render icon captions on their own line followed by the value.
+_ICON_LABEL_TO_FIELD = {'position': 'location', 'time': 'employment_type', 'seniority': 'seniority', 'remote': 'work_mode'}
+
+_EMPLOYMENT_TYPE_LEXICON = [
+    (re.compile(r'\bcontract[\s-]to[\s-]hire\b', re.I), 'Contract-to-hire'),
+    (re.compile(r'\bfull[\s-]?time\b', re.I), 'Full-time'),
+    (re.compile(r'\bpart[\s-]?time\b', re.I), 'Part-time'),
+    (re.compile(r'\binternship\b', re.I), 'Internship'),
+    (re.compile(r'\b(?:contract|contractor)\b', re.I), 'Contract'),
+    (re.compile(r'\b(?:temporary|temp)\b', re.I), 'Temporary'),
+    (re.compile(r'\bfreelance\b', re.I), 'Freelance'),
+]
+_SENIORITY_LEXICON = [
+    (re.compile(r'\bintern(?:ship)?\b', re.I), 'Internship'),
+    (re.compile(r'\b(?:entry[\s-]level|new\s+grad(?:uate)?|junior|jr\.?)\b', re.I), 'Entry Level'),
+    (re.compile(r'\b(?:mid[\s-]senior|mid[\s-]level|intermediate)\b', re.I), 'Mid Level'),
+    (re.compile(r'\b(?:vice\s+president|vp)\b', re.I), 'Executive'),
+    (re.compile(r'\b(?:director|head\s+of)\b', re.I), 'Director'),
+    (re.compile(r'\bprincipal\b', re.I), 'Principal'),
+    (re.compile(r'\bstaff\b', re.I), 'Staff'),
+    (re.compile(r'\b(?:lead|manager)\b', re.I), 'Lead'),
+    (re.compile(r'\b(?:senior|sr\.?)\b', re.I), 'Senior'),
+]
+_WORK_MODE_LEXICON = [
+    (re.compile(r'\bhybrid\b', re.I), 'Hybrid'),
+    (re.compile(r'\b(?:on[\s-]?site|in[\s-]office)\b', re.I), 'On-site'),
+    (re.compile(r'\bremote\b', re.I), 'Remote'),
+]
+_CITY_STATE_RE = re.compile(r"^[A-Z][A-Za-z.'\- ]{1,30},\s*(?:[A-Z]{2}|[A-Z][a-z]+(?: [A-Z][a-z]+)?)(?:\s+\d{5})?$")
+# (pattern, trust the tail as the company when no other company candidate was found)
+_TITLE_COMPANY_SEPARATORS = [
+    (re.compile(r'^(.+?)\s+at\s+(.+)$', re.I), True),
+    (re.compile(r'^(.+?)\s+[-|–—@]\s+(.+)$'), True),
+    (re.compile(r'^(.+?),\s+(.+)$'), False),  # "Title, Team" is too ambiguous on its own
+]
+_COMPANY_PHRASE = r"([A-Z][\w&.'-]*(?:\s+[A-Z][\w&.'-]*){0,3})"
+_COMPANY_BODY_PATTERNS = [
+    re.compile(rf'^About\s+{_COMPANY_PHRASE}\s*:?\s*$', re.M),
+    re.compile(rf'(?:^|[.!?]\s+){_COMPANY_PHRASE}\s+is\s+(?:a|an|the|one)\b', re.M),
+    re.compile(rf'\b(?:Join|At)\s+{_COMPANY_PHRASE}(?:,|\s+we\b)'),
+    re.compile(r'@\s?([A-Z][\w&.\'-]*(?:\s+[A-Z][\w&.\'-]*){0,2})\s*$', re.M),
+]
+_NOT_A_COMPANY = {
+    'we', 'our', 'the', 'this', 'you', 'they', 'it', 'in', 'as', 'company', 'the company', 'the role',
+    'the team', 'the job', 'the position', 'us', 'role', 'team', 'job', 'position', 'responsibilities',
+    'remote', 'hybrid', 'on-site', 'onsite',
+}
+
+
+def _jd_text_hash(jd_text: str) -> str:
+    return hashlib.sha256(jd_text.encode('utf-8')).hexdigest()
+
+
+def _match_lexicon(text: str, lexicon) -> Optional[str]:
+    for pattern, canonical in lexicon:
+        if pattern.search(text):
+            return canonical
+    return None
+
+
+def _clean_company(candidate: Optional[str]) -> Optional[str]:
+    if not candidate:
+        return None
+    cleaned = candidate.strip().strip('.,:;')
+    if not cleaned or cleaned.lower() in _NOT_A_COMPANY or len(cleaned) > 60:
+        return None
+    return cleaned
+
+
 class JDAnalysisAgent:
     """Agent to analyze the job description text and extract key information, including ATS keywords."""
 
@@ -110,6 +202,130 @@ Comma-separated ATS keywords:
             logging.warning(f"Statistical ATS extraction failed: {e}")
             return []
 
+    def _extract_fields_with_patterns(self, jd_text: str) -> Dict[str, Optional[str]]:
+        """Regex/lexicon pass over the JD header for structured fields. No LLM involved."""
+        fields: Dict[str, Optional[str]] = {
+            "job_title": None, "company_name": None, "location": None,
+            "seniority": None, "employment_type": None, "work_mode": None,
+        }
+        lines = [line.strip() for line in jd_text.splitlines() if line.strip()]
+        header_lines = lines[:_HEADER_SCAN_LINES]
+
+        # 1) Explicit "Label: value" lines anywhere in the header
+        for line in header_lines:
+            labeled = _LABELED_FIELD_RE.match(line)
+            if labeled:
+                field = _LABEL_TO_FIELD.get(re.sub(r'\s+', ' ', labeled.group(1).lower()))
+                if field and not fields[field]:
+                    fields[field] = labeled.group(2).strip()
+
+        # 2) Job-board icon captions ("position", "time", ...) followed by their value
+        value_checks = {
+            'location': lambda v: bool(_CITY_STATE_RE.match(v)) or v.lower() == 'remote',
+            'employment_type': lambda v: _match_lexicon(v, _EMPLOYMENT_TYPE_LEXICON) is not None,
+            'seniority': lambda v: _match_lexicon(v, _SENIORITY_LEXICON) is not None,
+            'work_mode': lambda v: _match_lexicon(v, _WORK_MODE_LEXICON) is not None,
+        }
+        for idx in range(len(header_lines) - 1):
+            field = _ICON_LABEL_TO_FIELD.get(header_lines[idx].lower())
+            value = header_lines[idx + 1]
+            if field and not fields[field] and value_checks[field](value):
+                fields[field] = value
+
+        # 3) Bare "City, ST" line in the header
+        if not fields["location"]:
+            fields["location"] = next((l for l in header_lines[1:] if _CITY_STATE_RE.match(l)), None)
+
+        # 4) Company from body phrasing ("About Acme", "Acme is a ...", "Join Acme", "@Acme")
+        if not fields["company_name"]:
+            for pattern in _COMPANY_BODY_PATTERNS:
+                for m in pattern.finditer(jd_text):
+                    company = _clean_company(m.group(1))
+                    if company:
+                        fields["company_name"] = company
+                        break
+                if fields["company_name"]:
+                    break
+
+        # 5) Title line: split off a trailing company ("Title at Acme", "Title - Acme", "Title, Acme TV")
+        title_line = fields["job_title"] or (lines[0] if lines else None)
+        if title_line and not fields["job_title"]:
+            fields["job_title"] = title_line
+            for pattern, trust_tail in _TITLE_COMPANY_SEPARATORS:
+                m = pattern.match(title_line)
+                if not m:
+                    continue
+                head, tail = m.group(1).strip(), m.group(2).strip()
+                known = fields["company_name"]
+                if known and tail.lower().startswith(known.lower()):
+                    fields["job_title"] = head
+                    break
+                if not known and trust_tail:
+                    fields["job_title"] = head
+                    fields["company_name"] = _clean_company(tail)
+                    break
+
+        # 6) Lexicon fallbacks: title tokens first, then header text
+        header_text = "\n".join(header_lines)
+        if not fields["seniority"]:
+            fields["seniority"] = _match_lexicon(fields["job_title"] or "", _SENIORITY_LEXICON) or \
+                                  _match_lexicon(header_text, _SENIORITY_LEXICON[:3])
+        if not fields["employment_type"]:
+            fields["employment_type"] = _match_lexicon(header_text, _EMPLOYMENT_TYPE_LEXICON)
+        if not fields["work_mode"]:
+            fields["work_mode"] = _match_lexicon(header_text, _WORK_MODE_LEXICON)
+        return fields
+
+    def _extract_fields_with_llm(self, jd_text: str, missing: List[str]) -> Dict[str, Optional[str]]:
+        """Low-token fallback: only the JD header and only the missing keys are sent."""
+        if not self.llm_client and not self.router:
+            return {}
+        prompt = (
+            "Extract the following fields from this job posting header and return ONLY a JSON object "
+            f"with exactly these keys (use null when unknown): {', '.join(missing)}.\n\n"
+            f"---\n{jd_text[:1200]}\n---\nJSON:"
+        )
+        try:
+            if self.llm_client:
+                response = self.llm_client.generate_text(prompt, temperature=0.0, max_tokens=120)
+            else:
+                response = self.router.generate(prompt, temperature=0.0, max_tokens=120, task="jd_fields")
+            json_match = re.search(r'\{.*\}', response, re.DOTALL)
+            parsed = json.loads(json_match.group(0)) if json_match else {}
+            return {k: str(v).strip() for k, v in parsed.items() if k in missing and v}
+        except Exception as e:
+            logging.warning(f"JDAnalysisAgent: LLM field extraction fallback failed: {e}")
+            return {}
+
+    def extract_structured_fields(self, jd_text: str, use_llm_fallback: bool = True) -> Dict[str, Optional[str]]:
+        """
+        Returns job_title, company_name, location, seniority and employment_type for a JD.
+        Regex/lexicon passes run first; the LLM is asked only for fields they could not find.
+        Results are cached per SHA-256 of the JD text and use_llm_fallback.
+        """
+        cache_key = (_jd_text_hash(jd_text), use_llm_fallback)
+        cached = _JD_FIELDS_CACHE.get(cache_key)
+        if cached is not None:
+            logging.info("JDAnalysisAgent: Using cached structured fields for this JD.")
+            return dict(cached)
+
+        fields = self._extract_fields_with_patterns(jd_text)
+        missing = [k for k in ("job_title", "company_name") if not fields.get(k)]
+        if missing and use_llm_fallback:
+            fields.update(self._extract_fields_with_llm(jd_text, missing))
+
+        work_mode = fields.pop("work_mode", None)
+        if work_mode and fields.get("location") and work_mode.lower() not in fields["location"].lower():
+            fields["location"] = f"{fields['location']} ({work_mode})"
+        elif work_mode and not fields.get("location"):
+            fields["location"] = work_mode
+
+        if len(_JD_FIELDS_CACHE) >= _JD_FIELDS_CACHE_MAX_ENTRIES:
+            _JD_FIELDS_CACHE.pop(next(iter(_JD_FIELDS_CACHE)))
+        _JD_FIELDS_CACHE[cache_key] = dict(fields)
+        logging.info(f"JDAnalysisAgent: Structured fields extracted: {fields}")
+        return fields
+
     # *** MODIFIED run method signature and logic ***
     def run(self, jd_txt_path: Optional[str] = None, jd_text: Optional[str] = None) -> JobDescription:
         """
@@ -148,7 +364,8 @@ Comma-separated ATS keywords:
 
         # Parse job title and requirements from the final_jd_text_content
         lines = [line.strip() for line in final_jd_text_content.splitlines() if line.strip()]
-        job_title_extracted = lines[0] if lines else "Unknown Position"
+        structured_fields = self.extract_structured_fields(final_jd_text_content)
+        job_title_extracted = structured_fields.get("job_title") or (lines[0] if lines else "Unknown Position")
         # For requirements, you can pass the full text or split lines.
         # Passing list of lines is consistent with current JobDescription model.
         requirements_extracted_as_list = lines[1:] if len(lines) > 1 else lines
@@ -182,7 +399,12 @@ Comma-separated ATS keywords:
         job_desc_data = {
             "job_title": job_title_extracted,
             "requirements": requirements_extracted_as_list,
-            "ats_keywords": combined
+            "ats_keywords": combined,
+            "company_name": structured_fields.get("company_name"),
+            "location": structured_fields.get("location"),
+            "seniority": structured_fields.get("seniority"),
+            "employment_type": structured_fields.get("employment_type"),
+            "jd_hash": _jd_text_hash(final_jd_text_content),
         }
         
         job_desc = JobDescription(**job_desc_data)
@@ -193,5 +415,5 @@ Comma-separated ATS keywords:
             logging.warning(f"No ATS keywords were extracted by the LLM from the JD {source_description}.")
             
         logging.info(f"JDAnalysisAgent: Completed analysis {source_description}. Title: '{job_desc.job_title}', "
-                     f"Req lines: {len(job_desc.requirements)}, ATS keywords: {len(job_desc.ats_keywords)}.")
+                     f"Company: '{job_desc.company_name}', Req lines: {len(job_desc.requirements)}, ATS keywords: {len(job_desc.ats_keywords)}.")
         return job_desc
\ No newline at end of file
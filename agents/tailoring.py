@@ -70,6 +70,8 @@ class TailoringAgent:
                     job_title=job_desc.job_title or "the specified position",
                     requirements=current_requirements,
                     ats_keywords=current_ats_keywords,
+                    company_name_from_jd=job_desc.company_name,
+                    job_location_type=job_desc.location,
                     master_profile_text=master_profile_text,
                     previously_tailored_sections_text=accumulated_tailored_text
                 )
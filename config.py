@@ -59,6 +59,22 @@ DEFAULT_TAILORED_JSON_PATH = os.path.join(DEFAULT_PDF_OUTPUT_DIR, TAILORED_JSON_
 # --- Google Cloud Storage Configuration ---
 GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "tailoring-agent") # "tailoring-agent"#Or directly your bucket name
 # Ensure GOOGLE_CREDENTIALS_JSON_CONTENT is also set and has permissions for this bucket.
+# Where artifacts are stored: "gcs", "local" (LOCAL_STORAGE_DIR, same object names) or "auto"
+# (GCS when credentials or an emulator are configured, otherwise local disk)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "auto").lower()
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", os.path.join(DATA_DIR, "storage"))
+# Local fake-GCS stand-in (e.g. fake-gcs-server), such as "http://localhost:4443"; uploads then need no credentials.
+STORAGE_EMULATOR_HOST = os.getenv("STORAGE_EMULATOR_HOST")
+GCS_UPLOAD_MAX_WORKERS = int(os.getenv("GCS_UPLOAD_MAX_WORKERS", 4))
+# Chunk size for resumable uploads (objects above 8 MiB; smaller ones go up in one request)
+GCS_UPLOAD_CHUNK_MB = int(os.getenv("GCS_UPLOAD_CHUNK_MB", 8))
+# Write-behind publishing: artifacts wait in this outbox until the background worker has uploaded them
+ARTIFACT_OUTBOX_DIR = os.getenv("ARTIFACT_OUTBOX_DIR", os.path.join(DATA_DIR, "outbox"))
+ARTIFACT_PUBLISH_MAX_ATTEMPTS = int(os.getenv("ARTIFACT_PUBLISH_MAX_ATTEMPTS", 20))
+ARTIFACT_PUBLISH_BACKOFF_SECONDS = float(os.getenv("ARTIFACT_PUBLISH_BACKOFF_SECONDS", 2))
+ARTIFACT_PUBLISH_MAX_BACKOFF_SECONDS = float(os.getenv("ARTIFACT_PUBLISH_MAX_BACKOFF_SECONDS", 600))
+# Local SQLite index of application manifests and stored content hashes (rebuildable from the manifests)
+ARTIFACT_INDEX_PATH = os.getenv("ARTIFACT_INDEX_PATH", os.path.join(DATA_DIR, "artifact_index.sqlite"))
 
 # ... (rest of your configurations) ...
 # --- Predefined Profile Information for DOCX/PDF Generation ---
@@ -109,6 +125,37 @@ OPENROUTER_FREE_MODEL_PRIORITY = [
 ]
 DRIVE_PARENT_FOLDER_ID = os.getenv("DRIVE_PARENT_FOLDER_ID")
 
+# --- PDF Extraction Cache ---
+# Process-wide cache of PDF extraction results keyed by SHA-256 of the file bytes
+PDF_EXTRACTION_CACHE_MAX_MB = int(os.getenv("PDF_EXTRACTION_CACHE_MAX_MB", 32))
+
+# --- DOCX -> PDF Rendering ---
+# "auto" renders locally with LibreOffice when it is installed and falls back to Google Drive;
+# "libreoffice" or "drive" pin a single backend (Drive is still tried if LibreOffice fails).
+PDF_RENDER_BACKEND = os.getenv("PDF_RENDER_BACKEND", "auto").lower()
+# "docx" builds a DOCX and converts it with the backend above; "vector" draws the PDF directly with reportlab.
+PDF_RENDERER = os.getenv("PDF_RENDERER", "docx").lower()
+# Points of page height the one-page fit estimate keeps in reserve for renderer differences
+LAYOUT_FIT_SAFETY_PT = float(os.getenv("LAYOUT_FIT_SAFETY_PT", 4))
+LIBREOFFICE_BINARY = os.getenv("LIBREOFFICE_BINARY", "soffice")
+LIBREOFFICE_POOL_SIZE = int(os.getenv("LIBREOFFICE_POOL_SIZE", 2))
+LIBREOFFICE_TIMEOUT_SECONDS = int(os.getenv("LIBREOFFICE_TIMEOUT_SECONDS", 60))
+# Threads rendering the resume and cover letter side by side
+RENDER_MAX_WORKERS = int(os.getenv("RENDER_MAX_WORKERS", 2))
+# Rendered PDFs keyed by a hash of content + layout; LRU-evicted past the size bound, 0 disables
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.join(DATA_DIR, "render_cache"))
+RENDER_CACHE_MAX_MB = int(os.getenv("RENDER_CACHE_MAX_MB", 256))
+# Post-render size pass (stream deflate, object dedup, object streams, font re-subsetting)
+PDF_OPTIMIZE = os.getenv("PDF_OPTIMIZE", "true").lower() in ("1", "true", "yes")
+PDF_OPTIMIZE_SUBSET_FONTS = os.getenv("PDF_OPTIMIZE_SUBSET_FONTS", "true").lower() in ("1", "true", "yes")
+# Resolution of the page-1 preview thumbnails in the results view; 0 turns previews off
+PDF_PREVIEW_DPI = int(os.getenv("PDF_PREVIEW_DPI", 80))
+
+# --- HTML (Jinja2 + xhtml2pdf) Rendering ---
+# Compiled-template cache shared across processes (default: a folder in the system temp dir)
+JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR")
+XHTML2PDF_MAX_WORKERS = int(os.getenv("XHTML2PDF_MAX_WORKERS", 2))
+
 # --- Logging Configuration ---
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper() 
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(module)s.%(funcName)s - %(message)s" 
@@ -148,6 +195,16 @@ class Config:
     GCS_BUCKET_NAME = GCS_BUCKET_NAME
     SERVICE_ACCOUNT_JSON_CONTENT = SERVICE_ACCOUNT_JSON_CONTENT
     GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    STORAGE_BACKEND = STORAGE_BACKEND
+    LOCAL_STORAGE_DIR = LOCAL_STORAGE_DIR
+    STORAGE_EMULATOR_HOST = STORAGE_EMULATOR_HOST
+    GCS_UPLOAD_MAX_WORKERS = GCS_UPLOAD_MAX_WORKERS
+    GCS_UPLOAD_CHUNK_MB = GCS_UPLOAD_CHUNK_MB
+    ARTIFACT_OUTBOX_DIR = ARTIFACT_OUTBOX_DIR
+    ARTIFACT_PUBLISH_MAX_ATTEMPTS = ARTIFACT_PUBLISH_MAX_ATTEMPTS
+    ARTIFACT_PUBLISH_BACKOFF_SECONDS = ARTIFACT_PUBLISH_BACKOFF_SECONDS
+    ARTIFACT_PUBLISH_MAX_BACKOFF_SECONDS = ARTIFACT_PUBLISH_MAX_BACKOFF_SECONDS
+    ARTIFACT_INDEX_PATH = ARTIFACT_INDEX_PATH
     
     # Project Paths
     PROJECT_ROOT = PROJECT_ROOT
@@ -200,5 +257,26 @@ class Config:
     # Google Drive (optional) parent folder for uploads (My Drive or Shared Drive)
     DRIVE_PARENT_FOLDER_ID = DRIVE_PARENT_FOLDER_ID
     
+    # PDF extraction cache bound (megabytes of extracted content)
+    PDF_EXTRACTION_CACHE_MAX_MB = PDF_EXTRACTION_CACHE_MAX_MB
+
+    # DOCX -> PDF rendering backend and LibreOffice worker pool
+    PDF_RENDER_BACKEND = PDF_RENDER_BACKEND
+    PDF_RENDERER = PDF_RENDERER
+    LAYOUT_FIT_SAFETY_PT = LAYOUT_FIT_SAFETY_PT
+    LIBREOFFICE_BINARY = LIBREOFFICE_BINARY
+    LIBREOFFICE_POOL_SIZE = LIBREOFFICE_POOL_SIZE
+    LIBREOFFICE_TIMEOUT_SECONDS = LIBREOFFICE_TIMEOUT_SECONDS
+    RENDER_MAX_WORKERS = RENDER_MAX_WORKERS
+    RENDER_CACHE_DIR = RENDER_CACHE_DIR
+    RENDER_CACHE_MAX_MB = RENDER_CACHE_MAX_MB
+    PDF_OPTIMIZE = PDF_OPTIMIZE
+    PDF_OPTIMIZE_SUBSET_FONTS = PDF_OPTIMIZE_SUBSET_FONTS
+    PDF_PREVIEW_DPI = PDF_PREVIEW_DPI
+
+    # HTML rendering (Jinja2 bytecode cache, xhtml2pdf worker pool)
+    JINJA_BYTECODE_CACHE_DIR = JINJA_BYTECODE_CACHE_DIR
+    XHTML2PDF_MAX_WORKERS = XHTML2PDF_MAX_WORKERS
+
     # Jobright Profile
     JOBRIGHT_PROFILE_DIR_RELATIVE = JOBRIGHT_PROFILE_DIR_RELATIVE
\ No newline at end of file
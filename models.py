@@ -7,6 +7,11 @@ class JobDescription(BaseModel):
     job_title: Optional[str] = Field(None, description="Title of the job role")
     requirements: List[str] = Field(..., description="List of key requirements or responsibilities from the JD")
     ats_keywords: List[str] = Field(default_factory=list, description="Specific ATS keywords extracted from the JD") # NEW FIELD
+    company_name: Optional[str] = Field(None, description="Hiring company extracted from the JD")
+    location: Optional[str] = Field(None, description="Job location or work mode (e.g., 'San Jose, CA', 'Remote')")
+    seniority: Optional[str] = Field(None, description="Seniority level (e.g., 'Entry Level', 'Senior')")
+    employment_type: Optional[str] = Field(None, description="Employment type (e.g., 'Full-time', 'Contract')")
+    jd_hash: Optional[str] = Field(None, description="SHA-256 of the analyzed JD text, used as a cache key")
 class ResumeSections(BaseModel):
     summary: Optional[str] = None
     work_experience: Optional[str] = None
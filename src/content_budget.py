@@ -0,0 +1,164 @@
+# Resume_Tailoring/src/content_budget.py
+"""
+Fits the tailored resume onto one page by dropping its least relevant bullets.
+
+Every work-experience and project bullet is scored against the JD's ATS keywords and
+requirements, and costed by its measured height (vector_pdf_renderer.bullet_height) under the
+densest readable layout. A 0/1 knapsack over whole points then keeps the highest-value set that
+fits the page, so shortening needs neither a second LLM call nor a render-and-check loop. Each
+entry keeps its best bullet, so no job or project is left as a bare header.
+"""
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .layout_fit import FitEstimate, estimate_resume_fit
+from .layout_params import RESUME_DENSEST, LayoutParams
+from .resume_model import (
+    ExperienceEntry, ParsedResume, ProjectEntry, format_projects, format_work_experience, parse_tailored_resume,
+)
+from .vector_pdf_renderer import bullet_height
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_WEIGHT = 3.0      # Per distinct ATS keyword a bullet mentions
+REQUIREMENT_WEIGHT = 4.0  # Times the best term overlap with a single JD requirement (0..1)
+POSITION_WEIGHT = 1.0     # Divided by (1 + index): the tailoring prompt puts the strongest bullets first
+
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+_STOP_TERMS = frozenset({
+    "and", "the", "for", "with", "from", "into", "using", "use", "our", "you", "your", "are", "will",
+    "have", "has", "that", "this", "such", "other", "ability", "experience", "strong", "work", "working",
+    "including", "across", "years", "plus", "knowledge", "understanding", "skills", "etc",
+})
+
+
+@dataclass(frozen=True, slots=True)
+class ScoredBullet:
+    section: str  # "work_experience" or "projects"
+    entry: int
+    index: int
+    text: str
+    value: float
+    cost: int     # Measured height in whole points, rounded up
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetResult:
+    tailored_data: Dict[str, Any]       # Unchanged input when nothing had to go
+    dropped: Tuple[ScoredBullet, ...]
+    estimate: FitEstimate               # Fit of the returned data under the budget layout
+
+
+def _terms(text: str) -> Set[str]:
+    return {t for t in _TERM_RE.findall(text.lower().replace("**", "")) if len(t) > 2 and t not in _STOP_TERMS}
+
+
+def score_bullets(parsed: ParsedResume, ats_keywords: Optional[Sequence[str]],
+                  requirements: Optional[Sequence[str]], params: LayoutParams = RESUME_DENSEST) -> List[ScoredBullet]:
+    keywords = [k for k in ats_keywords or [] if k and k.strip()]
+    keyword_patterns = [re.compile(rf"(?<!\w){re.escape(k.strip())}(?!\w)", re.IGNORECASE) for k in keywords]
+    requirement_terms = [terms for terms in (_terms(r) for r in requirements or [] if r) if terms]
+    scored = []
+    sections: Tuple[Tuple[str, Sequence[Any]], ...] = (
+        ("work_experience", parsed.work_experience), ("projects", parsed.projects))
+    for section, entries in sections:
+        for entry_index, entry in enumerate(entries):
+            for index, bullet in enumerate(entry.bullets):
+                plain = bullet.replace("**", "")
+                keyword_hits = sum(1 for pattern in keyword_patterns if pattern.search(plain))
+                terms = _terms(plain)
+                overlap = max((len(terms & req) / len(req) for req in requirement_terms), default=0.0)
+                value = 1.0 + KEYWORD_WEIGHT * keyword_hits + REQUIREMENT_WEIGHT * overlap + POSITION_WEIGHT / (1 + index)
+                cost = math.ceil(bullet_height(bullet, keywords, params))
+                scored.append(ScoredBullet(section, entry_index, index, bullet, round(value, 3), cost))
+    return scored
+
+
+def _knapsack(items: Sequence[ScoredBullet], capacity: int) -> Set[int]:
+    """Indexes into `items` of the highest-value subset whose total cost is at most `capacity`."""
+    if capacity <= 0:
+        return set()
+    best = [0.0] * (capacity + 1)
+    took = [bytearray(capacity + 1) for _ in items]
+    for i, item in enumerate(items):
+        for c in range(capacity, item.cost - 1, -1):
+            candidate = best[c - item.cost] + item.value
+            if candidate > best[c]:
+                best[c] = candidate
+                took[i][c] = 1
+    chosen, c = set(), capacity
+    for i in range(len(items) - 1, -1, -1):
+        if took[i][c]:
+            chosen.add(i)
+            c -= items[i].cost
+    return chosen
+
+
+def _with_bullets(tailored_data: Dict[str, Any], parsed: ParsedResume, kept: Set[Tuple[str, int, int]]) -> Dict[str, Any]:
+    work = tuple(
+        ExperienceEntry(job.title, job.company, job.location, job.dates,
+                        tuple(b for i, b in enumerate(job.bullets) if ("work_experience", e, i) in kept))
+        for e, job in enumerate(parsed.work_experience))
+    projects = tuple(
+        ProjectEntry(project.title, project.tagline,
+                     tuple(b for i, b in enumerate(project.bullets) if ("projects", e, i) in kept))
+        for e, project in enumerate(parsed.projects))
+    updated = dict(tailored_data)
+    if work != parsed.work_experience:
+        updated["work_experience"] = format_work_experience(work)
+    if projects != parsed.projects:
+        updated["projects"] = format_projects(projects)
+    return updated
+
+
+def fit_resume_content(tailored_data: Dict[str, Any], contact_info: Dict[str, str],
+                       education_info: List[Dict[str, str]], ats_keywords: Optional[Sequence[str]] = None,
+                       requirements: Optional[Sequence[str]] = None, params: LayoutParams = RESUME_DENSEST,
+                       max_rounds: int = 3) -> BudgetResult:
+    """
+    Drops the lowest-value bullets until the resume fits one page under `params` (by default the
+    densest readable layout, so content is only cut once spacing and type size are exhausted).
+    ats_keywords defaults to tailored_data["ats_keywords"].
+    """
+    estimate = estimate_resume_fit(tailored_data, contact_info, education_info, params)
+    if estimate.fits:
+        return BudgetResult(tailored_data, (), estimate)
+    if ats_keywords is None:
+        ats_keywords = tailored_data.get("ats_keywords")
+
+    parsed = parse_tailored_resume(tailored_data)
+    scored = score_bullets(parsed, ats_keywords, requirements, params)
+    best_per_entry: Dict[Tuple[str, int], ScoredBullet] = {}
+    for item in scored:
+        current = best_per_entry.get((item.section, item.entry))
+        if current is None or item.value > current.value:
+            best_per_entry[(item.section, item.entry)] = item
+    required = set(best_per_entry.values())
+    optional = [item for item in scored if item not in required]
+
+    capacity = sum(item.cost for item in optional) - math.ceil(-estimate.slack)
+    kept_optional: Set[int] = set(range(len(optional)))
+    data = tailored_data
+    for _ in range(max_rounds):
+        kept_optional = _knapsack(optional, capacity)
+        kept = {(item.section, item.entry, item.index) for item in required}
+        kept |= {(optional[i].section, optional[i].entry, optional[i].index) for i in kept_optional}
+        data = _with_bullets(tailored_data, parsed, kept)
+        estimate = estimate_resume_fit(data, contact_info, education_info, params)
+        if estimate.fits or not kept_optional:
+            break
+        # Costs are rounded per bullet and a page break wastes part of a line, so the set can come out a
+        # few points over. Tighten below what was actually chosen and retry.
+        capacity = sum(optional[i].cost for i in kept_optional) - max(1, math.ceil(-estimate.slack))
+
+    dropped = tuple(item for i, item in enumerate(optional) if i not in kept_optional)
+    if estimate.fits:
+        logger.info(f"Content budget dropped {len(dropped)} of {len(scored)} bullets to fit one page "
+                    f"(value kept {sum(i.value for i in scored) - sum(i.value for i in dropped):.1f}"
+                    f"/{sum(i.value for i in scored):.1f}, slack {estimate.slack:.0f}pt).")
+    else:
+        logger.warning(f"Resume still overflows by {-estimate.slack:.0f}pt after dropping {len(dropped)} bullets.")
+    return BudgetResult(data, dropped, estimate)
@@ -3,13 +3,88 @@ import re
 import logging
 from typing import List, Dict, Any, Optional
 
+from utils.file_utils import PdfLayout
+from .resume_model import parse_projects, parse_technical_skills, parse_work_experience
+
 # It's good practice to have a logger for each module
 logger = logging.getLogger(__name__)
 
-def parse_contact_info_from_resume_pdf_text(resume_pdf_text: str) -> Dict[str, Optional[str]]:
+_URL_IN_TEXT_RE = re.compile(r'(https?://\S+)')
+_GENERIC_LINK_LABELS = {"link", "demo", "live", "live demo", "github", "code", "repo", "website", "app"}
+
+
+def _contact_line_indexes(layout: PdfLayout) -> set:
+    """Lines carrying a mailto: link are the contact line; links there are profile links, not projects."""
+    return {link.line_index for link in layout.links if link.uri.startswith("mailto:") and link.line_index is not None}
+
+
+def parse_contact_links_from_layout(layout: Optional[PdfLayout]) -> Dict[str, str]:
+    """Email / LinkedIn / GitHub / portfolio URLs read from the PDF's link annotations."""
+    found: Dict[str, str] = {}
+    if not layout:
+        return found
+    contact_lines = _contact_line_indexes(layout)
+    for link in layout.links:
+        uri = link.uri.strip()
+        lower_uri = uri.lower()
+        if lower_uri.startswith("mailto:"):
+            found.setdefault("email", uri[len("mailto:"):])
+        elif "linkedin.com" in lower_uri:
+            found.setdefault("linkedin_url", uri)
+        elif "github.com" in lower_uri and link.line_index in contact_lines:
+            found.setdefault("github_url", uri)
+        elif link.line_index in contact_lines and lower_uri.startswith("http"):
+            found.setdefault("portfolio_url", uri)
+    return found
+
+
+def parse_project_links_from_layout(layout: Optional[PdfLayout]) -> Dict[str, str]:
+    """
+    Maps project titles to URLs using the link annotations and in-text URLs of a PdfLayout.
+    A link's title is its anchor text when that reads like a title, otherwise the text before
+    the URL on the same line, otherwise the closest preceding non-bullet line.
+    """
+    project_links: Dict[str, str] = {}
+    if not layout:
+        return project_links
+    contact_lines = _contact_line_indexes(layout)
+
+    def title_for_line(line_index: int, exclude: str) -> Optional[str]:
+        for idx in range(line_index, max(line_index - 3, -1), -1):
+            text = layout.lines[idx].text.replace(exclude, "") if idx == line_index else layout.lines[idx].text
+            candidate = text.replace("**", "").split("|", 1)[0].strip()
+            if candidate and not candidate.startswith(("•", "*", "-", "http")) and len(candidate) <= 80:
+                return candidate
+        return None
+
+    for link in layout.links:
+        if not link.uri.lower().startswith("http") or link.line_index is None or link.line_index in contact_lines:
+            continue
+        anchor = link.anchor_text.replace("**", "").strip()
+        if anchor and not anchor.lower().startswith("http") and anchor.lower() not in _GENERIC_LINK_LABELS:
+            title = anchor.split("|", 1)[0].strip()
+        else:
+            title = title_for_line(link.line_index, link.anchor_text)
+        if title:
+            project_links.setdefault(title, link.uri)
+
+    for idx, line in enumerate(layout.lines):
+        if idx in contact_lines:
+            continue
+        url_match = _URL_IN_TEXT_RE.search(line.text)
+        if url_match:
+            title = title_for_line(idx, url_match.group(1))
+            if title:
+                project_links.setdefault(title, url_match.group(1))
+    logger.info(f"Found {len(project_links)} project links in resume layout.")
+    return project_links
+
+
+def parse_contact_info_from_resume_pdf_text(resume_pdf_text: str, layout: Optional[PdfLayout] = None) -> Dict[str, Optional[str]]:
     """
     Parses contact information from the raw text of the original resume PDF.
     This is tailored based on the structure of "Shanmugam_AI_2025_4_YOE.pdf".
+    When a PdfLayout is given, profile URLs come from the PDF's link annotations.
     """
     contact_info = {
         "name": "Venkatesh Shanmugam", # Default from your resume
@@ -30,177 +105,56 @@ def parse_contact_info_from_resume_pdf_text(resume_pdf_text: str) -> Dict[str, O
     # You can replace these with your actual URLs:
     contact_info["github_url"] = "https://github.com/your_actual_github_username" # Replace
     contact_info["portfolio_url"] = "your_actual_portfolio_link" # Replace
+    contact_info.update(parse_contact_links_from_layout(layout))
 
     return contact_info
 
 def parse_llm_work_experience_string(text_block: str) -> List[Dict[str, Any]]:
     """
-    Parses the LLM's generated string for work experience into a list of job dictionaries.
-    This function is built based on the observed output format of your LLM.
+    Work experience entries from the LLM output as dictionaries for the HTML template.
+    Parsing is shared with the DOCX renderer through src.resume_model.
     """
-    jobs = []
     if not text_block or not text_block.strip():
         logger.warning("Work experience text block is empty.")
-        return jobs
-
-    # Remove potential "## Work Experience" markdown header from LLM output
-    if text_block.strip().startswith("## Work Experience"):
-        text_block = re.sub(r"^## Work Experience\s*\n+", "", text_block, flags=re.IGNORECASE).strip()
-
-    # Split into individual job entries. LLM often uses double newlines between entries.
-    # This regex tries to split by one or more empty lines, but only if the next line
-    # looks like a job title (often bolded by LLM with ** or starting with caps).
-    raw_jobs = re.split(r'\n\s*\n+(?=\s*(?:\*\*)?[A-Z][\w\s.,-]+?\s*(?:\*\*)?\s*\|)', text_block.strip())
-
-    for raw_job_entry in raw_jobs:
-        raw_job_entry = raw_job_entry.strip()
-        if not raw_job_entry:
-            continue
-
-        lines = [line.strip() for line in raw_job_entry.split('\n') if line.strip()]
-        if not lines:
-            continue
-
-        job_details: Dict[str, Any] = {
-            "title": None, "company": None, "location": None, "dates": None, "bullet_points": []
+        return []
+    return [
+        {
+            "title": job.title,
+            "company": job.company or "N/A",
+            "location": job.location or "N/A",
+            "dates": job.dates or "Dates N/A",
+            "bullet_points": list(job.bullets),
         }
-        
-        # Regex for Job Title | Company | Location (first line typically)
-        # e.g., **Senior AI/ML Engineer** | **ScriptChain Health** | Washington, DC
-        header_match = re.match(r'^(?:\*\*)?(.+?)(?:\*\*)?\s*\|\s*(?:\*\*)?(.+?)(?:\*\*)?\s*\|\s*(.+)$', lines[0])
-        current_line_idx = 0
-
-        if header_match:
-            job_details["title"] = header_match.group(1).strip()
-            job_details["company"] = header_match.group(2).strip()
-            job_details["location"] = header_match.group(3).strip()
-            current_line_idx = 1
-        else:
-            logger.warning(f"Could not parse standard job header line: '{lines[0]}'. Attempting fallback.")
-            # Fallback: Assume first line is title if no pipes, or try to split by first pipe for title/company
-            parts = lines[0].split('|', 1)
-            job_details["title"] = parts[0].replace("**", "").strip()
-            if len(parts) > 1:
-                 job_details["company"] = parts[1].replace("**", "").strip() # Company might include location here
-            else:
-                job_details["company"] = "N/A"
-            job_details["location"] = "N/A" # Will be overwritten if found
-            current_line_idx = 1
-
-
-        # Parsing Dates (usually the next line after header)
-        if current_line_idx < len(lines) and \
-           re.match(r'^(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|Present|September)[\w\s,–-]+$', lines[current_line_idx].strip(), re.IGNORECASE):
-            job_details["dates"] = lines[current_line_idx].strip()
-            current_line_idx += 1
-        else:
-            # Try to find dates if they were part of location in a simpler header
-            if job_details["location"] and not job_details["dates"]:
-                date_in_loc_match = re.search(r'(.*?)(\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|Present)[\w\s,-–]+)$', job_details["location"])
-                if date_in_loc_match:
-                    job_details["location"] = date_in_loc_match.group(1).strip().rstrip(' |')
-                    job_details["dates"] = date_in_loc_match.group(2).strip()
-
-            if not job_details["dates"]:
-                 job_details["dates"] = "Dates N/A"
-                 logger.warning(f"Could not parse dates for job: {job_details.get('title')} at {job_details.get('company')}")
-        
-        # Parsing Bullet Points
-        for i in range(current_line_idx, len(lines)):
-            if lines[i].startswith('*'):
-                job_details["bullet_points"].append(lines[i][1:].strip())
-        
-        if job_details.get("title"):
-            jobs.append(job_details)
-        else:
-            logger.warning(f"Skipping job entry due to inability to parse title: '{raw_job_entry[:100]}...'")
-            
-    logger.info(f"Parsed {len(jobs)} work experience entries from LLM output.")
-    return jobs
+        for job in parse_work_experience(text_block)
+    ]
 
 def parse_llm_technical_skills_string(text_block: str) -> List[Dict[str, str]]:
     """
-    Parses the LLM's generated string for technical skills into a list of category dictionaries.
-    Assumes format like: "**Category Name:** Skill1, Skill2"
+    Technical skill categories from the LLM output ("**Category Name:** Skill1, Skill2").
+    Lines without a category prefix are skipped, as the template renders name/value pairs.
     """
-    skill_categories = []
     if not text_block or not text_block.strip():
         logger.warning("Technical skills text block is empty.")
-        return skill_categories
-
-    if text_block.strip().startswith("## Technical Skills"):
-        text_block = re.sub(r"^## Technical Skills\s*\n+", "", text_block, flags=re.IGNORECASE).strip()
-
-    lines = text_block.split('\n')
-    for line in lines:
-        line = line.strip()
-        if not line: 
-            continue
-        
-        match = re.match(r'^(?:\*\*)?(.+?)(?:\*\*)?\s*:\s*(.+)$', line)
-        if match:
-            category_name = match.group(1).strip()
-            skills_list_str = match.group(2).strip()
-            skill_categories.append({
-                "name": category_name,
-                "skills_list_str": skills_list_str
-            })
+        return []
+    skill_categories = []
+    for category in parse_technical_skills(text_block):
+        if category.name:
+            skill_categories.append({"name": category.name, "skills_list_str": category.skills})
         else:
-            logger.warning(f"Could not parse skill line into category and skills: '{line}'")
-            # Fallback: Treat the whole line as a skill item if no colon, or skip
-            # skill_categories.append({"name": "General Skills", "skills_list_str": line})
-            
-    logger.info(f"Parsed {len(skill_categories)} technical skill categories from LLM output.")
+            logger.warning(f"Could not parse skill line into category and skills: '{category.skills}'")
     return skill_categories
 
 def parse_llm_projects_string(text_block: str) -> List[Dict[str, Any]]:
     """
-    Parses the LLM's generated string for projects into a list of project dictionaries.
+    Project entries from the LLM output as dictionaries for the HTML template.
     """
-    projects = []
     if not text_block or not text_block.strip():
         logger.warning("Projects text block is empty.")
-        return projects
-    
-    # Remove header like "## Rewritten Projects Section:" or "## PROJECTS"
-    text_block = re.sub(r"^## (?:Rewritten )?Projects(?: Section)?:\s*\n+", "", text_block, flags=re.IGNORECASE).strip()
-
-    # Split by what appears to be double newlines between project entries.
-    # The lookahead tries to ensure the next block starts with something like a bolded title or a title with a pipe.
-    raw_project_entries = re.split(r'\n\s*\n+(?=\s*(?:\*\*)?[A-Z][\w\s\-]+?(?:\*\*)?\s*(?:\||\n))', text_block.strip())
-
-    for entry in raw_project_entries:
-        entry = entry.strip()
-        if not entry:
-            continue
-        lines = [line.strip() for line in entry.split('\n') if line.strip()]
-        if not lines:
-            continue
-
-        project_details: Dict[str, Any] = {"title": None, "tagline": None, "bullet_points": []}
-        
-        # Example Title line: **Intelligent Building Code QA | _NLP, RAG_** or just **AI-Text Discriminator**
-        title_line_match = re.match(r'^\s*(?:\*\*)?(.+?)(?:\*\*)?\s*(?:\|\s*_(.+?)_)?$', lines[0])
-        if title_line_match:
-            project_details["title"] = title_line_match.group(1).strip()
-            project_details["tagline"] = title_line_match.group(2).strip() if title_line_match.group(2) else None
-            bullet_lines_start_index = 1
-        else:
-            # Fallback if no pipe and underscore, assume whole first line is title
-            project_details["title"] = lines[0].replace("**", "").strip()
-            project_details["tagline"] = None
-            bullet_lines_start_index = 1
-            logger.warning(f"Could not parse project title line with tagline: '{lines[0]}'. Using full line as title.")
-
-
-        for i in range(bullet_lines_start_index, len(lines)):
-            if lines[i].startswith('*'):
-                project_details["bullet_points"].append(lines[i][1:].strip())
-        
-        if project_details.get("title"):
-            projects.append(project_details)
-    logger.info(f"Parsed {len(projects)} project entries from LLM output.")
-    return projects
+        return []
+    return [
+        {"title": project.title, "tagline": project.tagline, "bullet_points": list(project.bullets)}
+        for project in parse_projects(text_block)
+    ]
 
 def parse_education_from_resume_pdf_text(resume_pdf_text: str) -> List[Dict[str, Optional[str]]]:
     """
@@ -267,7 +221,8 @@ def parse_education_from_resume_pdf_text(resume_pdf_text: str) -> List[Dict[str,
 
 def preprocess_tailored_data_for_pdf(
     tailored_json_data: Dict[str, str], 
-    original_resume_pdf_text: str # Raw text from the original PDF
+    original_resume_pdf_text: str, # Raw text from the original PDF
+    original_resume_layout: Optional[PdfLayout] = None
 ) -> Dict[str, Any]:
     """
     Transforms the flat JSON output from the LLM and original resume PDF text
@@ -277,7 +232,7 @@ def preprocess_tailored_data_for_pdf(
     processed_data: Dict[str, Any] = {}
 
     # 1. Parse Contact Info from original PDF text
-    processed_data["contact_info"] = parse_contact_info_from_resume_pdf_text(original_resume_pdf_text)
+    processed_data["contact_info"] = parse_contact_info_from_resume_pdf_text(original_resume_pdf_text, original_resume_layout)
 
     # 2. Get LLM-tailored Summary
     processed_data["summary"] = tailored_json_data.get("summary", "").strip()
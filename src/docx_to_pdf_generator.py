@@ -1,17 +1,26 @@
 # Resume_Tailoring/src/docx_to_pdf_generator.py
 import logging
 import re
-from typing import Dict, List, Any, Optional
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
 import os
 import tempfile # Keep for potential DOCX generation before upload
 import json
+import atexit
+import pathlib
+import queue
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 # --- Google Drive API Imports ---
 import io
 from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials as UserCredentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
-from google.auth.transport.requests import Request as AuthRequest # Added
+from googleapiclient.http import MediaIoBaseUpload
 
 # --- Document Generation Imports (python-docx) ---
 from docx import Document
@@ -20,7 +29,20 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.opc.constants import RELATIONSHIP_TYPE
-from PyPDF2 import PdfReader
+
+from .resume_model import (
+    ExperienceEntry, ProjectEntry, SkillCategory,
+    parse_projects, parse_tailored_resume, parse_technical_skills, parse_work_experience, resolve_project_link,
+)
+from .text_markup import cover_letter_paragraphs, keyword_bold_spans
+from .layout_params import (
+    COVER_LETTER_COMPACT, COVER_LETTER_DENSEST, COVER_LETTER_NORMAL, RESUME_COMPACT, RESUME_DENSEST, RESUME_NORMAL,
+    LayoutParams, cover_letter_preset, resume_preset,
+)
+from .pdf_optimizer import optimize_rendered_pdf
+from .pdf_verifier import pdf_page_count
+from .render_cache import cached_render, render_cache_key
+from .vector_pdf_renderer import render_cover_letter_pdf_bytes, render_resume_pdf_bytes
 
 # --- Configuration Import ---
 app_config = None # Initialize
@@ -34,7 +56,6 @@ except ImportError as e:
     # app_config remains None
 
 logger = logging.getLogger(__name__)
-EMU_PER_POINT = Pt(1)
 
 def _remove_table_borders(table):
     """Remove borders by setting each cell's borders to nil (works across python-docx versions)."""
@@ -52,161 +73,404 @@ def _remove_table_borders(table):
                     tcBorders.append(element)
                 element.set(qn('w:val'), 'nil')
 
-# --- Google Drive API Helper Functions (from your example) ---
+# --- Google Drive API Helper Functions ---
 SCOPES = ['https://www.googleapis.com/auth/drive']
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+GOOGLE_DOC_MIME_TYPE = 'application/vnd.google-apps.document'
+
+# Credentials are built once per process; google-auth refreshes the access token when it expires.
+# The service is built once per thread because its httplib2 transport is not thread-safe.
+_drive_credentials = None
+_drive_credentials_lock = threading.Lock()
+_drive_local = threading.local()
+# Deleting the scratch Google Doc is housekeeping; it runs here instead of delaying the exported PDF
+_drive_cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="drive_cleanup")
 
-def get_drive_service():
-    """Authenticates and returns a Google Drive API service object.
-    Prefers user OAuth (refresh token) if env vars present; otherwise uses service account.
-    """
-    creds = None
 
-    # 1) Try user OAuth credentials from environment
+def _build_drive_credentials():
+    """User OAuth (refresh token) if the env vars are present, otherwise the configured service account."""
     oauth_client_id = os.getenv("GOOGLE_OAUTH_CLIENT_ID")
     oauth_client_secret = os.getenv("GOOGLE_OAUTH_CLIENT_SECRET")
     oauth_refresh_token = os.getenv("GOOGLE_OAUTH_REFRESH_TOKEN")
     if oauth_client_id and oauth_client_secret and oauth_refresh_token:
-        try:
-            creds = UserCredentials(
-                None,
-                refresh_token=oauth_refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=oauth_client_id,
-                client_secret=oauth_client_secret,
-                scopes=SCOPES,
-            )
-            service = build('drive', 'v3', credentials=creds, static_discovery=False)
-            logger.info("Google Drive API service created successfully (user OAuth).")
-            return service
-        except Exception as e:
-            logger.error(f"Failed to build Drive service with user OAuth: {e}")
+        logger.info("Using user OAuth credentials for Google Drive.")
+        return UserCredentials(
+            None,
+            refresh_token=oauth_refresh_token,
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id=oauth_client_id,
+            client_secret=oauth_client_secret,
+            scopes=SCOPES,
+        )
 
-    # 2) Fallback to service account JSON content
     service_account_json_content_str = getattr(app_config, 'SERVICE_ACCOUNT_JSON_CONTENT', None)
-
     if not service_account_json_content_str or not isinstance(service_account_json_content_str, str):
         logger.error("Service account JSON content is not set or not a string in config.")
         logger.error("Please set the SERVICE_ACCOUNT_JSON_CONTENT variable in config.py correctly.")
         return None
-        
     try:
-        # Parse the JSON string into a dictionary
         service_account_info = json.loads(service_account_json_content_str)
-        
-        # Create credentials from the parsed info
-        creds = service_account.Credentials.from_service_account_info(
-            service_account_info, scopes=SCOPES
-        )
+        creds = service_account.Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
         logger.info("Successfully created Google Drive credentials from JSON content.")
+        return creds
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse SERVICE_ACCOUNT_JSON_CONTENT: {e}", exc_info=True)
-        return None
     except Exception as e:
         logger.error(f"Error creating credentials from service account info: {e}", exc_info=True)
-        return None
+    return None
 
-    try:
-        service = build('drive', 'v3', credentials=creds, static_discovery=False)
-        logger.info("Google Drive API service created successfully.")
+
+def get_drive_service():
+    """
+    Returns this thread's cached Google Drive API service, or None if no credentials are configured.
+    Discovery uses the document bundled with google-api-python-client, so building is offline.
+    """
+    global _drive_credentials
+    service = getattr(_drive_local, "service", None)
+    if service is not None:
         return service
+    with _drive_credentials_lock:
+        if _drive_credentials is None:
+            _drive_credentials = _build_drive_credentials()
+        creds = _drive_credentials
+    if creds is None:
+        return None
+    try:
+        service = build('drive', 'v3', credentials=creds, static_discovery=True)
     except Exception as e:
         logger.error(f"Failed to build Google Drive service: {e}", exc_info=True)
         return None
+    _drive_local.service = service
+    logger.info("Google Drive API service created.")
+    return service
+
 
-def upload_and_convert_to_google_doc(drive_service, local_docx_path, drive_filename_prefix):
+def upload_docx_as_google_doc(drive_service, docx_bytes: bytes, drive_filename: str) -> Optional[str]:
     """
-    Uploads a local DOCX file to Google Drive, then copies it to create a native Google Doc.
-    Returns the File ID of the native Google Doc and the ID of the original uploaded DOCX.
+    Uploads DOCX bytes and has Drive convert them to a native Google Doc in the same create call
+    (multipart upload, one round trip). Returns the Google Doc's file ID.
     """
-    if not os.path.exists(local_docx_path):
-        logger.error(f"Local DOCX file not found: {local_docx_path}")
-        return None, None
-
-    original_docx_file_metadata = {
-        'name': f"{drive_filename_prefix}_original.docx",
-        'mimeType': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-    }
+    metadata = {'name': drive_filename, 'mimeType': GOOGLE_DOC_MIME_TYPE}
     parent_id = getattr(app_config, 'DRIVE_PARENT_FOLDER_ID', None)
     if parent_id:
-        original_docx_file_metadata['parents'] = [parent_id]
-    media = MediaFileUpload(local_docx_path,
-                            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                            resumable=True)
-    original_uploaded_file_id = None
+        metadata['parents'] = [parent_id]
+    media = MediaIoBaseUpload(io.BytesIO(docx_bytes), mimetype=DOCX_MIME_TYPE, resumable=False)
     try:
-        logger.info(f"Uploading original DOCX '{original_docx_file_metadata['name']}' to Google Drive...")
-        original_file = drive_service.files().create(
-            body=original_docx_file_metadata,
-            media_body=media,
-            fields='id, name', supportsAllDrives=True
+        created = drive_service.files().create(
+            body=metadata, media_body=media, fields='id', supportsAllDrives=True
         ).execute()
-        original_uploaded_file_id = original_file.get('id')
-        logger.info(f"Original DOCX uploaded. Drive File ID: {original_uploaded_file_id}, Name: {original_file.get('name')}")
-        if not original_uploaded_file_id:
-            logger.error("Failed to upload original DOCX or get its ID.")
-            return None, None
     except Exception as e:
-        logger.error(f"Error uploading original DOCX to Google Drive: {e}", exc_info=True)
-        return None, None
+        logger.error(f"Error uploading DOCX to Google Drive as a Google Doc: {e}", exc_info=True)
+        return None
+    file_id = created.get('id')
+    if not file_id:
+        logger.error("Drive upload returned no file ID.")
+        return None
+    logger.info(f"Uploaded DOCX as native Google Doc '{drive_filename}' (ID: {file_id}).")
+    return file_id
+
 
-    google_doc_native_id = None
+def export_pdf_bytes_from_drive(drive_service, file_id) -> Optional[bytes]:
+    """Exports a Google Doc as PDF in a single request (Drive caps exports at 10 MB)."""
     try:
-        copy_metadata = {
-            'name': f"{drive_filename_prefix}_native_gdoc",
-            'mimeType': 'application/vnd.google-apps.document'
-        }
-        logger.info(f"Converting/Copying uploaded DOCX (ID: {original_uploaded_file_id}) to a native Google Doc format...")
-        copied_file = drive_service.files().copy(
-            fileId=original_uploaded_file_id,
-            body=copy_metadata,
-            fields='id, name', supportsAllDrives=True
-        ).execute()
-        google_doc_native_id = copied_file.get('id')
-        logger.info(f"Successfully converted to native Google Doc. New File ID: {google_doc_native_id}, Name: {copied_file.get('name')}")
-        return original_uploaded_file_id, google_doc_native_id
+        pdf_bytes = drive_service.files().export(fileId=file_id, mimeType='application/pdf').execute()
     except Exception as e:
-        logger.error(f"Error converting/copying DOCX to Google Doc format: {e}", exc_info=True)
-        return original_uploaded_file_id, None
+        logger.error(f"Error exporting PDF from Google Drive: {e}", exc_info=True)
+        return None
+    if not pdf_bytes:
+        logger.error(f"PDF export of Drive File ID '{file_id}' returned no data.")
+        return None
+    return pdf_bytes
+
 
 def export_pdf_from_drive(drive_service, file_id, local_pdf_path):
     """Exports a file from Google Drive as PDF and saves it locally."""
+    pdf_bytes = export_pdf_bytes_from_drive(drive_service, file_id)
+    if not pdf_bytes:
+        return False
+    output_dir = os.path.dirname(local_pdf_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(local_pdf_path, "wb") as f:
+        f.write(pdf_bytes)
+    logger.info(f"PDF exported and saved successfully to: {os.path.abspath(local_pdf_path)}")
+    return True
+
+
+def delete_files_from_drive(drive_service, file_ids: Sequence[str]) -> None:
+    """Deletes files through one batch HTTP request. Failures are logged, not raised."""
+    file_ids = [file_id for file_id in file_ids if file_id]
+    if not file_ids:
+        return
+
+    def _on_delete(request_id, _response, exception):
+        if exception is not None:
+            logger.warning(f"Could not delete file from Google Drive (ID: {request_id}): {exception}")
+
+    batch = drive_service.new_batch_http_request(callback=_on_delete)
+    for file_id in file_ids:
+        batch.add(drive_service.files().delete(fileId=file_id, supportsAllDrives=True), request_id=file_id)
     try:
-        logger.info(f"Exporting Drive File ID '{file_id}' as PDF to '{local_pdf_path}'...")
-        request = drive_service.files().export_media(fileId=file_id, mimeType='application/pdf')
-        output_dir = os.path.dirname(local_pdf_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-            logger.info(f"Created output directory: {output_dir}")
-
-        fh = io.FileIO(local_pdf_path, mode='wb')
-        downloader = MediaIoBaseDownload(fh, request)
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
-            if status:
-                logger.info(f"PDF Download progress: {int(status.progress() * 100)}%")
-        fh.close()
-        if os.path.exists(local_pdf_path) and os.path.getsize(local_pdf_path) > 0:
-            logger.info(f"PDF exported and saved successfully to: {os.path.abspath(local_pdf_path)}")
-            return True
-        else:
-            logger.error(f"PDF export failed: Output file '{local_pdf_path}' not found or is empty after download attempt.")
-            return False
+        batch.execute()
+        logger.info(f"Deleted {len(file_ids)} file(s) from Google Drive.")
     except Exception as e:
-        logger.error(f"Error exporting PDF from Google Drive: {e}", exc_info=True)
-        return False
+        logger.warning(f"Batch delete from Google Drive failed for {file_ids}: {e}", exc_info=True)
+
+
+def _delete_drive_files_in_background(file_ids: Sequence[str]) -> None:
+    def _delete():
+        drive_service = get_drive_service()  # The cleanup thread's own service
+        if drive_service:
+            delete_files_from_drive(drive_service, file_ids)
+    _drive_cleanup_executor.submit(_delete)
+
 
 def delete_file_from_drive(drive_service, file_id):
     """Deletes a file from Google Drive."""
     if not file_id:
         logger.warning("No file_id provided for deletion.")
         return
-    try:
-        logger.info(f"Deleting Drive File ID '{file_id}'...")
-        drive_service.files().delete(fileId=file_id, supportsAllDrives=True).execute()
-        logger.info(f"File deleted successfully from Google Drive (ID: {file_id}).")
-    except Exception as e:
-        logger.warning(f"Could not delete file from Google Drive (ID: {file_id}): {e}", exc_info=True)
+    delete_files_from_drive(drive_service, [file_id])
+
+
+
+# --- Render backends (DOCX bytes -> PDF bytes) ---
+
+
+class RenderBackend(ABC):
+    """Converts a serialized DOCX into PDF bytes. Implementations log and return None on failure."""
+    name = "base"
+
+    def is_available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def render(self, docx_bytes: bytes, base_filename: str) -> Optional[bytes]:
+        ...
+
+
+class DriveRenderBackend(RenderBackend):
+    """Upload with conversion to a native Google Doc, export PDF, delete the Drive copy."""
+    name = "drive"
+
+    def render(self, docx_bytes: bytes, base_filename: str) -> Optional[bytes]:
+        drive_service = get_drive_service()
+        if not drive_service:
+            logger.error("Could not get Google Drive service. PDF generation via Drive failed.")
+            return None
+        drive_filename = re.sub(r'[^\w\-_]', '_', base_filename)
+        google_doc_id = upload_docx_as_google_doc(drive_service, docx_bytes, drive_filename)
+        if not google_doc_id:
+            logger.error("Failed to create a native Google Doc from the DOCX. PDF generation via Drive failed.")
+            return None
+        try:
+            pdf_bytes = export_pdf_bytes_from_drive(drive_service, google_doc_id)
+            if not pdf_bytes:
+                logger.error("PDF export from native Google Doc failed.")
+            return pdf_bytes
+        finally:
+            _delete_drive_files_in_background([google_doc_id])
+
+
+def _free_local_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _LibreOfficeWorker:
+    """
+    One headless LibreOffice instance with its own user profile, so workers never contend for
+    the profile lock and the profile is initialised only once. When unoserver is installed the
+    office process stays resident and documents are piped through unoconvert's stdin/stdout;
+    otherwise each conversion is a one-shot soffice call that still reuses the warm profile.
+    """
+
+    def __init__(self, binary: str, index: int):
+        self.binary = binary
+        self.index = index
+        self.server: Optional[subprocess.Popen] = None
+        self.port: Optional[int] = None
+        self._new_profile()
+
+    def _new_profile(self) -> None:
+        self.profile_dir = tempfile.mkdtemp(prefix=f"lo_profile_{self.index}_")
+        self.profile_url = pathlib.Path(self.profile_dir).as_uri()
+
+    def _ensure_server(self, timeout: float) -> None:
+        if self.server is not None and self.server.poll() is None:
+            return
+        self.port = _free_local_port()
+        self.server = subprocess.Popen(
+            ["unoserver", "--interface", "127.0.0.1", "--port", str(self.port),
+             "--uno-port", str(_free_local_port()), "--executable", shutil.which(self.binary) or self.binary,
+             "--user-installation", self.profile_url],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.server.poll() is not None:
+                raise RuntimeError(f"unoserver exited with code {self.server.returncode}")
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.5):
+                    logger.info(f"LibreOffice worker ready on port {self.port} (profile {self.profile_dir}).")
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("Timed out waiting for unoserver to accept connections.")
+
+    def convert(self, docx_bytes: bytes, timeout: float) -> bytes:
+        if shutil.which("unoserver") and shutil.which("unoconvert"):
+            self._ensure_server(timeout)
+            result = subprocess.run(
+                ["unoconvert", "--host", "127.0.0.1", "--port", str(self.port),
+                 "--input-filter", "MS Word 2007 XML", "--convert-to", "pdf", "-", "-"],
+                input=docx_bytes, capture_output=True, timeout=timeout, check=True,
+            )
+            return result.stdout
+        with tempfile.TemporaryDirectory(prefix="lo_convert_") as work_dir:
+            docx_path = os.path.join(work_dir, "document.docx")
+            with open(docx_path, "wb") as f:
+                f.write(docx_bytes)
+            subprocess.run(
+                [self.binary, f"-env:UserInstallation={self.profile_url}", "--headless", "--norestore",
+                 "--nologo", "--nodefault", "--nolockcheck", "--convert-to", "pdf", "--outdir", work_dir, docx_path],
+                capture_output=True, timeout=timeout, check=True,
+            )
+            with open(os.path.join(work_dir, "document.pdf"), "rb") as f:
+                return f.read()
+
+    def close(self) -> None:
+        if self.server is not None and self.server.poll() is None:
+            self.server.terminate()
+            try:
+                self.server.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.server.kill()
+        self.server = None
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def reset(self) -> None:
+        self.close()
+        self._new_profile()
+
+
+class LibreOfficeRenderBackend(RenderBackend):
+    """Local, network-free rendering on a small pool of warm LibreOffice workers."""
+    name = "libreoffice"
+
+    def __init__(self, binary: str = "soffice", pool_size: int = 2, timeout: float = 60):
+        self.binary = binary
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self._idle: "queue.Queue[_LibreOfficeWorker]" = queue.Queue()
+        self._workers: List[_LibreOfficeWorker] = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def is_available(self) -> bool:
+        return shutil.which(self.binary) is not None
+
+    def _acquire(self) -> _LibreOfficeWorker:
+        with self._lock:
+            if self._idle.empty() and len(self._workers) < self.pool_size:
+                worker = _LibreOfficeWorker(self.binary, len(self._workers))
+                self._workers.append(worker)
+                return worker
+        return self._idle.get(timeout=self.timeout)
+
+    def render(self, docx_bytes: bytes, base_filename: str) -> Optional[bytes]:
+        try:
+            worker = self._acquire()
+        except queue.Empty:
+            logger.error("No LibreOffice worker became free in time.")
+            return None
+        try:
+            start = time.perf_counter()
+            pdf_bytes = worker.convert(docx_bytes, self.timeout)
+            logger.info(f"Rendered '{base_filename}' with LibreOffice in {time.perf_counter() - start:.2f}s.")
+            return pdf_bytes or None
+        except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+            logger.error(f"LibreOffice rendering failed for '{base_filename}': {e}")
+            worker.reset()  # A wedged office process or corrupt profile should not poison later renders
+            return None
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+            self._workers.clear()
+        self._idle = queue.Queue()
+
+
+_RENDER_BACKENDS: Dict[str, RenderBackend] = {}
+_RENDER_BACKENDS_LOCK = threading.Lock()
+
+
+def get_render_backend(name: str) -> RenderBackend:
+    """Process-wide backend instances, so the LibreOffice pool stays warm between documents."""
+    with _RENDER_BACKENDS_LOCK:
+        backend = _RENDER_BACKENDS.get(name)
+        if backend is None:
+            if name == "libreoffice":
+                backend = LibreOfficeRenderBackend(
+                    binary=getattr(app_config, 'LIBREOFFICE_BINARY', 'soffice'),
+                    pool_size=getattr(app_config, 'LIBREOFFICE_POOL_SIZE', 2),
+                    timeout=getattr(app_config, 'LIBREOFFICE_TIMEOUT_SECONDS', 60),
+                )
+            elif name == "drive":
+                backend = DriveRenderBackend()
+            else:
+                raise ValueError(f"Unknown PDF render backend: {name}")
+            _RENDER_BACKENDS[name] = backend
+        return backend
+
+
+def _render_backend_order() -> List[str]:
+    preference = getattr(app_config, 'PDF_RENDER_BACKEND', 'auto')
+    if preference == "drive":
+        return ["drive"]
+    return ["libreoffice", "drive"]  # "auto" and "libreoffice": local first, Drive as fallback
+
+
+def render_docx_bytes_to_pdf(docx_bytes: bytes, base_filename: str) -> Optional[bytes]:
+    """Renders DOCX bytes with the configured backend, falling back to the next one on failure."""
+    for name in _render_backend_order():
+        backend = get_render_backend(name)
+        if not backend.is_available():
+            logger.info(f"PDF render backend '{name}' is not available; trying the next one.")
+            continue
+        pdf_bytes = backend.render(docx_bytes, base_filename)
+        if pdf_bytes:
+            return pdf_bytes
+        logger.warning(f"PDF render backend '{name}' failed for '{base_filename}'.")
+    logger.error(f"All PDF render backends failed for '{base_filename}'.")
+    return None
+
+
+def render_document_to_pdf_bytes(document: Document, base_filename: str) -> Optional[bytes]:
+    """Serializes a python-docx Document in memory and renders it; nothing touches the disk here."""
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return render_docx_bytes_to_pdf(buffer.getvalue(), base_filename)
+
+
+def render_document_to_pdf(document: Document, output_pdf_directory: str, base_filename: str) -> Optional[str]:
+    """render_document_to_pdf_bytes() written to '<output_pdf_directory>/<base_filename>.pdf'."""
+    return _write_pdf_file(render_document_to_pdf_bytes(document, base_filename), output_pdf_directory, base_filename)
+
+
+def _write_pdf_file(pdf_bytes: Optional[bytes], output_pdf_directory: str, base_filename: str) -> Optional[str]:
+    if not pdf_bytes:
+        return None
+    os.makedirs(output_pdf_directory, exist_ok=True)
+    final_pdf_filepath = os.path.join(output_pdf_directory, f"{base_filename}.pdf")
+    with open(final_pdf_filepath, "wb") as f:
+        f.write(pdf_bytes)
+    logger.info(f"PDF saved to: '{final_pdf_filepath}'")
+    return final_pdf_filepath
 
 
 # --- Existing Helper functions (add_hyperlink, add_runs_with_markdown_bold, add_styled_paragraph) ---
@@ -226,12 +490,12 @@ def add_hyperlink(paragraph, url, text, font_name='Times New Roman', font_size=P
         rFonts.set(qn('w:eastAsia'), font_name)
         rPr.append(rFonts)
     if font_size:
-        point_value = int(font_size / EMU_PER_POINT)
+        half_points = round(font_size.pt * 2)  # w:sz is in half-points, so 9.5pt layouts keep their size
         size_el = OxmlElement('w:sz')
-        size_el.set(qn('w:val'), str(point_value * 2))
+        size_el.set(qn('w:val'), str(half_points))
         rPr.append(size_el)
         size_cs_el = OxmlElement('w:szCs')
-        size_cs_el.set(qn('w:val'), str(point_value * 2))
+        size_cs_el.set(qn('w:val'), str(half_points))
         rPr.append(size_cs_el)
     if color_hex:
         color_el = OxmlElement('w:color')
@@ -254,11 +518,10 @@ def add_runs_with_markdown_bold(paragraph, text_with_markdown: str,
                                 font_name: Optional[str],
                                 font_size: Optional[Pt],
                                 base_bold: bool = False,
-                                base_italic: bool = False):
-    parts = re.split(r'(\*\*[^*]+\*\*)', text_with_markdown)
-    for part_idx, part_text in enumerate(parts):
-        if not part_text:
-            continue
+                                base_italic: bool = False,
+                                ats_keywords: Optional[Sequence[str]] = None):
+    """One run per **bold** span or ATS keyword match (single pass with the JD's cached highlighter)."""
+    for span_text, span_bold in keyword_bold_spans(text_with_markdown, ats_keywords, base_bold):
         run = paragraph.add_run()
         if font_name:
             run.font.name = font_name
@@ -273,15 +536,8 @@ def add_runs_with_markdown_bold(paragraph, text_with_markdown: str,
         if font_size:
             run.font.size = font_size
         run.italic = base_italic
-        text_to_add = ""
-        if part_text.startswith('**') and part_text.endswith('**'):
-            text_to_add = part_text[2:-2]
-            run.bold = True
-        else:
-            text_to_add = part_text
-            run.bold = base_bold
-        final_text = text_to_add.replace('**', '')
-        run.text = final_text
+        run.bold = span_bold
+        run.text = span_text
 
 def add_styled_paragraph(document, text: str, style_name: Optional[str] = None,
                          font_name: str = 'Times New Roman',
@@ -290,7 +546,8 @@ def add_styled_paragraph(document, text: str, style_name: Optional[str] = None,
                          is_italic: Optional[bool] = None,
                          alignment: Optional[WD_ALIGN_PARAGRAPH] = None,
                          space_after: Optional[Pt] = None, space_before: Optional[Pt] = None,
-                         line_spacing: Optional[float] = None, keep_with_next: Optional[bool] = None):
+                         line_spacing: Optional[float] = None, keep_with_next: Optional[bool] = None,
+                         ats_keywords: Optional[Sequence[str]] = None):
     p = document.add_paragraph(style=style_name)
     if alignment is not None: p.alignment = alignment
     if space_before is not None: p.paragraph_format.space_before = space_before
@@ -302,16 +559,17 @@ def add_styled_paragraph(document, text: str, style_name: Optional[str] = None,
     current_base_italic = is_italic if is_italic is not None else False
     add_runs_with_markdown_bold(p, text, font_name, font_size,
                                 base_bold=current_base_bold,
-                                base_italic=current_base_italic)
+                                base_italic=current_base_italic,
+                                ats_keywords=ats_keywords)
     return p
 
 # --- Existing DOCX Section Adding Functions ---
 # (add_contact_info_docx, add_section_header_docx, add_summary_docx, etc.)
 # These should largely remain the same, as they format the DOCX content.
-def add_contact_info_docx(document, contact_data: Dict[str, str]):
+def add_contact_info_docx(document, contact_data: Dict[str, str], params: LayoutParams = RESUME_NORMAL):
     logger.info("Adding contact information to DOCX...")
     add_styled_paragraph(document, contact_data.get("name", "Candidate Name"),
-                         font_name='Times New Roman', font_size=Pt(16), is_bold=True,
+                         font_name='Times New Roman', font_size=Pt(params.name_font_size), is_bold=True,
                          alignment=WD_ALIGN_PARAGRAPH.CENTER, space_after=Pt(3))
 
     line1_full_text = contact_data.get("line1_info", "")
@@ -322,7 +580,7 @@ def add_contact_info_docx(document, contact_data: Dict[str, str]):
     p_line1.paragraph_format.space_after = Pt(1)
     p_line1.paragraph_format.widow_control = True
     current_font_name = 'Times New Roman'
-    current_font_size = Pt(10)
+    current_font_size = Pt(params.font_size)
 
     if match:
         email_address = match.group(0)
@@ -342,7 +600,7 @@ def add_contact_info_docx(document, contact_data: Dict[str, str]):
 
     p_links = document.add_paragraph()
     p_links.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p_links.paragraph_format.space_after = Pt(18)
+    p_links.paragraph_format.space_after = Pt(params.contact_space_after)
     p_links.paragraph_format.widow_control = True
     add_hyperlink(p_links, contact_data.get("linkedin_url", "#"), contact_data.get("linkedin_text", "linkedin.com"),
                   font_name=current_font_name, font_size=current_font_size, color_hex="0563C1", is_underline=True)
@@ -353,10 +611,10 @@ def add_contact_info_docx(document, contact_data: Dict[str, str]):
     add_hyperlink(p_links, contact_data.get("portfolio_url", "#"), contact_data.get("portfolio_text", "Portfolio"),
                   font_name=current_font_name, font_size=current_font_size, color_hex="0563C1", is_underline=True)
 
-def add_section_header_docx(document, header_text: str):
+def add_section_header_docx(document, header_text: str, params: LayoutParams = RESUME_NORMAL):
     p = add_styled_paragraph(document, header_text.upper(), font_name='Times New Roman',
-                             font_size=Pt(10), is_bold=True, alignment=WD_ALIGN_PARAGRAPH.LEFT,
-                             space_before=Pt(6), space_after=Pt(4))
+                             font_size=Pt(params.font_size), is_bold=True, alignment=WD_ALIGN_PARAGRAPH.LEFT,
+                             space_before=Pt(params.section_space_before), space_after=Pt(params.section_space_after))
     pPr = p._p.get_or_add_pPr()
     pBdr = OxmlElement('w:pBdr')
     bottom_border = OxmlElement('w:bottom')
@@ -364,223 +622,134 @@ def add_section_header_docx(document, header_text: str):
     bottom_border.set(qn('w:space'), '1'); bottom_border.set(qn('w:color'), '444444')
     pBdr.append(bottom_border); pPr.append(pBdr)
 
-def _apply_keyword_bolding(text: str, ats_keywords: Optional[List[str]]) -> str:
-    """Wrap up to a few ATS keywords in ** for programmatic bolding. Case-insensitive, avoids double-wrapping."""
-    if not text or not ats_keywords:
-        return text
-    processed = text
-    # Sort keywords by length to avoid partial overlaps (longest first)
-    for kw in sorted({k for k in ats_keywords if k}, key=len, reverse=True):
-        escaped = re.escape(kw)
-        # Loose boundary to handle C++, ML/DL, CI/CD; avoid double-wrapping
-        pattern = re.compile(rf'(?i)(?<!\*)(?<![A-Za-z0-9])({escaped})(?![A-Za-z0-9])(?!\*)')
-        processed = pattern.sub(r'**\1**', processed)
-    return processed
-
-def add_summary_docx(document, summary_text: str, ats_keywords: Optional[List[str]] = None):
+def add_summary_docx(document, summary_text: str, ats_keywords: Optional[List[str]] = None,
+                     params: LayoutParams = RESUME_NORMAL):
     logger.info("Adding summary to DOCX...")
-    add_section_header_docx(document, "SUMMARY")
-    add_styled_paragraph(document, _apply_keyword_bolding(summary_text, ats_keywords), font_name='Times New Roman', font_size=Pt(10),
-                         line_spacing=1.15, space_after=Pt(6))
+    add_section_header_docx(document, "SUMMARY", params)
+    add_styled_paragraph(document, summary_text, ats_keywords=ats_keywords, font_name='Times New Roman', font_size=Pt(params.font_size),
+                         line_spacing=params.line_spacing, space_after=Pt(params.entry_space_after))
 
-def add_work_experience_docx(document, work_experience_text: str, ats_keywords: Optional[List[str]] = None):
+def add_work_experience_docx(document, work_experience: Union[str, Sequence[ExperienceEntry]],
+                             ats_keywords: Optional[List[str]] = None, params: LayoutParams = RESUME_NORMAL):
     logger.info("Adding work experience to DOCX...")
-    add_section_header_docx(document, "WORK EXPERIENCE")
-    if not work_experience_text or not work_experience_text.strip():
+    add_section_header_docx(document, "WORK EXPERIENCE", params)
+    jobs = parse_work_experience(work_experience) if isinstance(work_experience, str) else work_experience
+    if not jobs:
         logger.warning("Work experience text is empty. Skipping section content.")
-        add_styled_paragraph(document, "N/A", font_size=Pt(10))
+        add_styled_paragraph(document, "N/A", font_size=Pt(params.font_size))
         return
 
-    cleaned_text = re.sub(r"^## Work Experience\s*\n+", "", work_experience_text, flags=re.IGNORECASE).strip()
-    job_entries = re.split(r'\n\s*\n+(?=\s*(?:\*\*)?[A-Z][\w\s.,-]+?\s*(?:\*\*)?\s*\|)', cleaned_text)
-    # ATS-friendly: no tables. Use a consistent left-aligned tab stop for the date column
-    date_tab_stop = Inches(5.1)
-
-    # Month pattern: short and long forms
-    month_pat = r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
-    date_line_re = re.compile(rf'^\*?\s*{month_pat}\s+\d{{4}}\s*[\u2013\-\–]\s*(?:{month_pat}\s+\d{{4}}|Present)\s*(?:\*)?\s*$', re.IGNORECASE)
-
-    for entry_text in job_entries:
-        entry_text = entry_text.strip()
-        if not entry_text: continue
-        lines = [line.strip() for line in entry_text.split('\n') if line.strip()]
-        if not lines: continue
-
+    # ATS-friendly: no tables. Dates sit on the header line behind a right-aligned tab stop.
+    for job in jobs:
         p_job_header = document.add_paragraph()
         p_job_header.paragraph_format.widow_control = True
         p_job_header.paragraph_format.tab_stops.clear_all()
-        p_job_header.paragraph_format.tab_stops.add_tab_stop(Inches(7.2), WD_TAB_ALIGNMENT.RIGHT)
-        header_parts = [part.strip() for part in lines[0].split('|')]
-        composed_header = header_parts[0]
-        if len(header_parts) > 1:
-            composed_header += f" | {header_parts[1]}"
-        if len(header_parts) > 2:
-            composed_header += f" | {header_parts[2]}"
-        add_runs_with_markdown_bold(p_job_header, composed_header, 'Times New Roman', Pt(10), base_bold=True)
-
-        bullet_start_index = 1
-        # Detect date line on the next line and move into header as a tab-aligned run
-        found_date_line = None
-        if len(lines) > 1 and date_line_re.match(lines[1].strip()):
-            found_date_line = lines[1].strip().lstrip('*').strip()
-            bullet_start_index = 2
-        else:
-            # Fallback: search any line for a date range pattern, remove it from that line
-            for i in range(1, len(lines)):
-                if date_line_re.match(lines[i].strip()):
-                    found_date_line = lines[i].strip().lstrip('*').strip()
-                    bullet_start_index = 1 if i == 1 else 1  # bullets still start after header
-                    # Remove the date line from content lines
-                    lines.pop(i)
-                    break
-
-        if found_date_line:
-            date_line_str = found_date_line.replace('*','')
-            run_date = p_job_header.add_run('\t' + date_line_str)
-            run_date.font.name = 'Times New Roman'; run_date.font.size = Pt(10); run_date.italic = True
+        p_job_header.paragraph_format.tab_stops.add_tab_stop(Inches(params.date_tab_stop), WD_TAB_ALIGNMENT.RIGHT)
+        composed_header = " | ".join(part for part in (job.title, job.company, job.location) if part)
+        add_runs_with_markdown_bold(p_job_header, composed_header, 'Times New Roman', Pt(params.font_size), base_bold=True)
+
+        if job.dates:
+            run_date = p_job_header.add_run('\t' + job.dates)
+            run_date.font.name = 'Times New Roman'; run_date.font.size = Pt(params.font_size); run_date.italic = True
         
-        p_job_header.paragraph_format.space_after = Pt(2)
+        p_job_header.paragraph_format.space_after = Pt(params.paragraph_space_after)
         p_job_header.paragraph_format.keep_with_next = True
 
-        for i in range(bullet_start_index, len(lines)):
-            line = lines[i]
-            # If a date-pattern bullet slipped in, skip it
-            if date_line_re.match(line):
-                continue
-            if line.startswith('*'):
-                bullet_text = _apply_keyword_bolding(line[1:].strip(), ats_keywords)
-                add_styled_paragraph(document, bullet_text, style_name='List Bullet',
-                                     font_name='Times New Roman', font_size=Pt(10),
-                                     space_after=Pt(2), line_spacing=1.15)
-        if len(lines) > bullet_start_index and document.paragraphs:
-            document.paragraphs[-1].paragraph_format.space_after = Pt(6)
-
-
-def add_technical_skills_docx(document, skills_text: str, ats_keywords: Optional[List[str]] = None):
+        for bullet in job.bullets:
+            add_styled_paragraph(document, bullet, ats_keywords=ats_keywords, style_name='List Bullet',
+                                 font_name='Times New Roman', font_size=Pt(params.font_size),
+                                 space_after=Pt(params.paragraph_space_after), line_spacing=params.line_spacing)
+        if job.bullets and document.paragraphs:
+            document.paragraphs[-1].paragraph_format.space_after = Pt(params.entry_space_after)
+
+
+def add_technical_skills_docx(document, skills: Union[str, Sequence[SkillCategory]],
+                              ats_keywords: Optional[List[str]] = None, params: LayoutParams = RESUME_NORMAL):
     logger.info("Adding technical skills to DOCX...")
-    add_section_header_docx(document, "TECHNICAL SKILLS")
-    if not skills_text or not skills_text.strip():
+    add_section_header_docx(document, "TECHNICAL SKILLS", params)
+    categories = parse_technical_skills(skills) if isinstance(skills, str) else skills
+    if not categories:
         logger.warning("Technical skills text is empty. Skipping section content.")
-        add_styled_paragraph(document, "N/A", font_size=Pt(10))
+        add_styled_paragraph(document, "N/A", font_size=Pt(params.font_size))
         return
         
-    cleaned_text = re.sub(r"^## Technical Skills\s*\n+", "", skills_text, flags=re.IGNORECASE).strip()
-    categories = cleaned_text.split('\n')
-    for category_line in categories:
-        category_line = category_line.strip()
-        if not category_line: continue
+    for category in categories:
         p = document.add_paragraph()
-        p.paragraph_format.space_after = Pt(2)
+        p.paragraph_format.space_after = Pt(params.paragraph_space_after)
         p.paragraph_format.widow_control = True
-        parts = category_line.split(':', 1)
-        if len(parts) == 2:
-            add_runs_with_markdown_bold(p, parts[0].strip() + ": ", 'Times New Roman', Pt(10), base_bold=True)
-            add_runs_with_markdown_bold(p, _apply_keyword_bolding(parts[1].strip(), ats_keywords), 'Times New Roman', Pt(10))
-        else:
-            add_runs_with_markdown_bold(p, _apply_keyword_bolding(category_line, ats_keywords), 'Times New Roman', Pt(10))
+        if category.name:
+            add_runs_with_markdown_bold(p, category.name + ": ", 'Times New Roman', Pt(params.font_size), base_bold=True)
+        add_runs_with_markdown_bold(p, category.skills, 'Times New Roman', Pt(params.font_size), ats_keywords=ats_keywords)
 
 def add_projects_docx(
     document,
-    projects_text: str,
+    projects: Union[str, Sequence[ProjectEntry]],
     contact_data: Dict[str, str],
     ats_keywords: Optional[List[str]] = None,
     project_links: Optional[Dict[str, str]] = None,
     source_resume_filename: Optional[str] = None,
+    params: LayoutParams = RESUME_NORMAL,
 ):
     logger.info("Adding projects to DOCX...")
-    add_section_header_docx(document, "PROJECTS")
-    if not projects_text or not projects_text.strip():
+    add_section_header_docx(document, "PROJECTS", params)
+    project_entries = parse_projects(projects) if isinstance(projects, str) else projects
+    if not project_entries:
         logger.warning("Projects text is empty. Skipping section content.")
-        add_styled_paragraph(document, "N/A", font_size=Pt(10))
-        return
-
-    cleaned_projects_text = re.sub(r"^(## |### )[\w\s]*Projects?[\w\s]*(?:Section)?:?\s*\n*", "", projects_text.strip(), flags=re.IGNORECASE).strip()
-    if not cleaned_projects_text:
-        logger.warning("Projects text is empty after cleaning headers.")
+        add_styled_paragraph(document, "N/A", font_size=Pt(params.font_size))
         return
 
-    github_base_url = contact_data.get("github_url", "https://github.com/DefaultUser").rstrip('/')
-    # Prefer links extracted from the user's resume text
-    safe_links = project_links or {}
-    # If this is the user's own resume (filename contains these names), we can add a conservative fallback
-    is_user_resume = False
-    if source_resume_filename:
-        lower_name = source_resume_filename.lower()
-        is_user_resume = ("shanmugam" in lower_name) or ("venkatesh" in lower_name)
-    
-    project_entries = re.split(r'\n\s*\n+(?=\s*(?:\*\*)?[A-Z0-9][\w\s\-()]+?(?:\*\*)?\s*(?:\||\n))', cleaned_projects_text)
-    
-    for entry_text in project_entries:
-        entry_text = entry_text.strip()
-        if not entry_text: continue
-        lines = [line.strip() for line in entry_text.split('\n') if line.strip()]
-        if not lines: continue
-            
-        title_line = lines[0]
-        # Remove trailing taglines like "| _NLP, RAG_"
-        title_parts = title_line.split('|', 1)
-        project_name_raw = re.sub(r"^\*\*(.*?)\*\*$", r"\1", title_parts[0].strip())
+    for project in project_entries:
+        project_name_raw = project.title
 
         p_title = document.add_paragraph()
         p_title.paragraph_format.widow_control = True
-        project_url = safe_links.get(project_name_raw)
-        # User-specific conservative fallback: only add obvious GitHub repo for known project
-        if not project_url and is_user_resume and project_name_raw == "AI-Text Discriminator":
-            project_url = f"{github_base_url}/AI-Content-Filter"
-        # Known public demo link for Building Codes RAG app (only for owner's resume)
-        if not project_url and is_user_resume and project_name_raw == "Agentic Graph RAG for Building Codes":
-            project_url = "https://vabuildingcode.netlify.app/"
+        project_url = resolve_project_link(project_name_raw, project_links, contact_data, source_resume_filename)
         
         if project_url:
             add_hyperlink(p_title, project_url, project_name_raw,
-                          font_name='Times New Roman', font_size=Pt(10),
+                          font_name='Times New Roman', font_size=Pt(params.font_size),
                           is_bold=True, color_hex="0563C1", is_underline=True)
         else:
-            add_runs_with_markdown_bold(p_title, project_name_raw, 'Times New Roman', Pt(10), base_bold=True)
+            add_runs_with_markdown_bold(p_title, project_name_raw, 'Times New Roman', Pt(params.font_size), base_bold=True)
             logger.warning(f"No hyperlink used for project: {project_name_raw}")
             
         # Taglines removed per request
             
-        p_title.paragraph_format.space_after = Pt(2)
+        p_title.paragraph_format.space_after = Pt(params.paragraph_space_after)
         p_title.paragraph_format.keep_with_next = True
         
-        for i in range(1, len(lines)):
-            line = lines[i]
-            if line.startswith('*'):
-                bullet_text = _apply_keyword_bolding(line[1:].strip(), ats_keywords)
-                add_styled_paragraph(document, bullet_text, style_name='List Bullet',
-                                     font_name='Times New Roman', font_size=Pt(10),
-                                     space_after=Pt(2), line_spacing=1.15)
-        if len(lines) > 1 and document.paragraphs:
-            if document.paragraphs[-1].text.strip() == lines[-1][1:].strip().replace("**",""):
-                document.paragraphs[-1].paragraph_format.space_after = Pt(6)
-
-def add_education_docx(document, education_list: List[Dict[str, str]]):
+        for bullet in project.bullets:
+            add_styled_paragraph(document, bullet, ats_keywords=ats_keywords, style_name='List Bullet',
+                                 font_name='Times New Roman', font_size=Pt(params.font_size),
+                                 space_after=Pt(params.paragraph_space_after), line_spacing=params.line_spacing)
+        if project.bullets and document.paragraphs:
+            document.paragraphs[-1].paragraph_format.space_after = Pt(params.entry_space_after)
+
+def add_education_docx(document, education_list: List[Dict[str, str]], params: LayoutParams = RESUME_NORMAL):
     logger.info("Adding education to DOCX...")
-    add_section_header_docx(document, "EDUCATION")
+    add_section_header_docx(document, "EDUCATION", params)
     if not education_list:
         logger.warning("Education list is empty. Skipping section content.")
-        add_styled_paragraph(document, "N/A", font_size=Pt(10))
+        add_styled_paragraph(document, "N/A", font_size=Pt(params.font_size))
         return
 
-    date_tab_stop = Inches(5.2)
     for edu_item in education_list:
         p_edu_line = document.add_paragraph()
         p_edu_line.paragraph_format.tab_stops.clear_all()
-        p_edu_line.paragraph_format.tab_stops.add_tab_stop(Inches(7.2), WD_TAB_ALIGNMENT.RIGHT)
+        p_edu_line.paragraph_format.tab_stops.add_tab_stop(Inches(params.date_tab_stop), WD_TAB_ALIGNMENT.RIGHT)
         p_edu_line.paragraph_format.widow_control = True
         degree_str = edu_item.get('degree_line', 'Degree N/A')
         uni_str = edu_item.get('university_line', 'University N/A')
         dates_str = edu_item.get("dates_line", "Dates N/A")
-        add_runs_with_markdown_bold(p_edu_line, degree_str, 'Times New Roman', Pt(10), base_bold=True)
+        add_runs_with_markdown_bold(p_edu_line, degree_str, 'Times New Roman', Pt(params.font_size), base_bold=True)
         p_edu_line.add_run(", ").font.name = 'Times New Roman'
-        add_runs_with_markdown_bold(p_edu_line, uni_str, 'Times New Roman', Pt(10))
+        add_runs_with_markdown_bold(p_edu_line, uni_str, 'Times New Roman', Pt(params.font_size))
         run_dates = p_edu_line.add_run('\t' + dates_str)
-        run_dates.font.name = 'Times New Roman'; run_dates.font.size = Pt(10); run_dates.italic = True
-        p_edu_line.paragraph_format.space_after = Pt(6)
+        run_dates.font.name = 'Times New Roman'; run_dates.font.size = Pt(params.font_size); run_dates.italic = True
+        p_edu_line.paragraph_format.space_after = Pt(params.entry_space_after)
 
 
-# --- Modified PDF Generation Functions to use Google Drive ---
+# --- Drive-only rendering (kept for callers that need the Google Docs layout engine explicitly) ---
 
 def generate_pdf_via_google_drive(
     document: Document, # The python-docx Document object
@@ -588,114 +757,55 @@ def generate_pdf_via_google_drive(
     base_filename: str # e.g., "Venkatesh_Shanmugam_Resume_TargetCompany_AI_4YOE"
 ) -> Optional[str]:
     """
-    Saves a DOCX Document to a temporary file, uploads to Google Drive,
-    converts to Google Doc, exports as PDF, saves it locally, and cleans up Drive files.
+    Renders the document through Google Drive only (no local backend) and saves it locally.
     Returns the path to the locally saved PDF or None on failure.
     """
-    # Primary: Google Drive conversion
-    drive_service = get_drive_service()
-    if not drive_service:
-        logger.error("Could not get Google Drive service. PDF generation via Drive failed.")
-        return None
-
-    temp_docx_file_path = None
-    original_docx_id_on_drive = None
-    native_gdoc_id_on_drive = None
-    final_pdf_filepath = None
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return _write_pdf_file(get_render_backend("drive").render(buffer.getvalue(), base_filename),
+                           output_pdf_directory, base_filename)
 
+def ensure_one_page_pdf(pdf: Union[str, bytes, bytearray, memoryview]) -> bool:
+    """True if the PDF, given as a path or as in-memory bytes, has exactly one page."""
     try:
-        # 1. Save the python-docx Document to a temporary local DOCX file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx", prefix="temp_resume_") as tmpfile:
-            temp_docx_file_path = tmpfile.name
-        document.save(temp_docx_file_path)
-        logger.info(f"Temporary DOCX for Drive conversion saved to: {temp_docx_file_path}")
-
-        # 2. Upload DOCX and convert to Google Doc
-        # Use a prefix derived from base_filename for Drive files
-        drive_filename_prefix = re.sub(r'[^\w\-_]', '_', base_filename) # Sanitize
-        original_docx_id_on_drive, native_gdoc_id_on_drive = upload_and_convert_to_google_doc(
-            drive_service, temp_docx_file_path, drive_filename_prefix
-        )
-
-        if not native_gdoc_id_on_drive:
-            logger.error("Failed to create a native Google Doc from the uploaded DOCX. PDF generation via Drive failed.")
-            return None # Critical failure
-
-        # 3. Export the native Google Doc as PDF
-        # Ensure output directory exists
-        os.makedirs(output_pdf_directory, exist_ok=True)
-        final_pdf_filepath = os.path.join(output_pdf_directory, f"{base_filename}.pdf")
-
-        pdf_export_successful = export_pdf_from_drive(
-            drive_service, native_gdoc_id_on_drive, final_pdf_filepath
-        )
-
-        if pdf_export_successful:
-            logger.info(f"PDF generated successfully via Google Drive: '{final_pdf_filepath}'")
-            return final_pdf_filepath
-        else:
-            logger.error("PDF export from native Google Doc failed.")
-            return None
-
-    except Exception as e:
-        logger.error(f"Error during Google Drive PDF generation pipeline: {e}", exc_info=True)
-        return None
-    finally:
-        # 4. Clean up: Delete files from Drive
-        if drive_service: # Only attempt deletion if service was obtained
-            if native_gdoc_id_on_drive:
-                delete_file_from_drive(drive_service, native_gdoc_id_on_drive)
-            if original_docx_id_on_drive:
-                delete_file_from_drive(drive_service, original_docx_id_on_drive)
-        
-        # 5. Clean up: Delete local temporary DOCX file
-        if temp_docx_file_path and os.path.exists(temp_docx_file_path):
-            try:
-                os.remove(temp_docx_file_path)
-                logger.info(f"Local temporary DOCX '{temp_docx_file_path}' removed.")
-            except OSError as e_remove:
-                logger.warning(f"Could not remove local temporary DOCX: {e_remove}")
-
-def ensure_one_page_pdf(pdf_path: str) -> bool:
-    try:
-        reader = PdfReader(pdf_path)
-        return len(reader.pages) == 1
-    except Exception as e:
+        return pdf_page_count(pdf) == 1
+    except ValueError as e:
         logger.warning(f"Failed to inspect PDF page count: {e}")
         return False
 
 
-# --- Main PDF Generation Functions (MODIFIED to use Google Drive conversion) ---
+# --- Main PDF Generation Functions (rendered in memory through render_document_to_pdf_bytes) ---
 
-def generate_styled_resume_pdf(
-    tailored_data: Dict[str, Any],
-    contact_info: Dict[str, str],
-    education_info: List[Dict[str, str]],
-    output_pdf_directory: str,
-    target_company_name: Optional[str] = None, # Used in filename
-    years_of_experience: Optional[int] = None, # Used in filename
-    filename_keyword: str = "Resume", # Base keyword for the filename
-    compact: bool = False
-) -> Optional[str]:
+# --- Prebuilt base documents ---
+# Document() parses python-docx's bundled template (~800KB of style XML, most of it 164 unused style
+# definitions and a stylesWithEffects copy), and every render then restyled it the same way. The
+# styled, pruned base is built once per (kind, layout) and kept serialized; a render starts from a
+# clone of those bytes, which parses a few KB instead.
+_BASE_STYLE_NAMES = {"resume": ("Normal", "List Bullet"), "cover_letter": ("Normal",)}
+_PRUNED_RELATIONSHIP_TYPES = {
+    "http://schemas.microsoft.com/office/2007/relationships/stylesWithEffects",  # Word 2010 compatibility copy
+    RELATIONSHIP_TYPE.CUSTOM_XML, RELATIONSHIP_TYPE.THUMBNAIL,
+}
+_DOCX_BASE_TEMPLATES: Dict[Tuple[str, LayoutParams], bytes] = {}
+_DOCX_BASE_TEMPLATES_MAX_ENTRIES = 32  # The layout search produces arbitrary densities between the presets
 
-    logger.info(f"Starting styled RESUME PDF generation using Google Drive. Output dir: '{output_pdf_directory}'")
-    document = Document()
-    # (Setup styles and margins as before - this part is for python-docx DOCX creation)
+
+def _style_resume_base(document, params: LayoutParams) -> None:
     normal_style = document.styles['Normal']
-    normal_font = normal_style.font; normal_font.name = 'Times New Roman'; normal_font.size = Pt(9 if compact else 10)
+    normal_font = normal_style.font; normal_font.name = 'Times New Roman'; normal_font.size = Pt(params.font_size)
     ct_style_rpr = normal_style.element.get_or_add_rPr()
     ct_style_fonts = ct_style_rpr.get_or_add_rFonts()
     for attr in [qn('w:asciiTheme'), qn('w:hAnsiTheme'), qn('w:eastAsiaTheme'), qn('w:cstheme')]:
         if attr in ct_style_fonts.attrib: del ct_style_fonts.attrib[attr]
     ct_style_fonts.set(qn('w:ascii'), 'Times New Roman'); ct_style_fonts.set(qn('w:hAnsi'), 'Times New Roman')
     ct_style_fonts.set(qn('w:cs'), 'Times New Roman'); ct_style_fonts.set(qn('w:eastAsia'), 'Times New Roman')
-    normal_style.paragraph_format.space_before = Pt(0); normal_style.paragraph_format.space_after = Pt(1 if compact else 2)
-    normal_style.paragraph_format.line_spacing = 1.05 if compact else 1.15
+    normal_style.paragraph_format.space_before = Pt(0); normal_style.paragraph_format.space_after = Pt(params.paragraph_space_after)
+    normal_style.paragraph_format.line_spacing = params.line_spacing
     normal_style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
 
     try:
         list_bullet_style = document.styles['List Bullet']
-        lb_font = list_bullet_style.font; lb_font.name = 'Times New Roman'; lb_font.size = Pt(9 if compact else 10)
+        lb_font = list_bullet_style.font; lb_font.name = 'Times New Roman'; lb_font.size = Pt(params.font_size)
         lb_ct_style_rpr = list_bullet_style.element.get_or_add_rPr()
         lb_ct_style_fonts = lb_ct_style_rpr.get_or_add_rFonts()
         for attr in [qn('w:asciiTheme'), qn('w:hAnsiTheme'), qn('w:eastAsiaTheme'), qn('w:cstheme')]:
@@ -703,79 +813,23 @@ def generate_styled_resume_pdf(
         lb_ct_style_fonts.set(qn('w:ascii'), 'Times New Roman'); lb_ct_style_fonts.set(qn('w:hAnsi'), 'Times New Roman')
         lb_ct_style_fonts.set(qn('w:cs'), 'Times New Roman'); lb_ct_style_fonts.set(qn('w:eastAsia'), 'Times New Roman')
         list_bullet_style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-        list_bullet_style.paragraph_format.line_spacing = 1.05 if compact else 1.15
-        list_bullet_style.paragraph_format.left_indent = Inches(0.25)
-        list_bullet_style.paragraph_format.first_line_indent = Inches(-0.25)
+        list_bullet_style.paragraph_format.line_spacing = params.line_spacing
+        list_bullet_style.paragraph_format.left_indent = Inches(params.bullet_indent)
+        list_bullet_style.paragraph_format.first_line_indent = Inches(-params.bullet_indent)
     except KeyError:
         logger.warning("'List Bullet' style not found. Bulleted lists may not be properly formatted.")
 
     for section_elm in document.sections:
-        section_elm.left_margin = Inches(0.45 if compact else 0.51); section_elm.right_margin = Inches(0.45 if compact else 0.51)
-        section_elm.top_margin = Inches(0.1 if compact else 0.13); section_elm.bottom_margin = Inches(0.05 if compact else 0.06)
-    
-    # Add content to the DOCX document in enforced order
-    add_contact_info_docx(document, contact_info)
-    if tailored_data.get("summary"): add_summary_docx(document, tailored_data["summary"], tailored_data.get("ats_keywords"))
-    if tailored_data.get("technical_skills"): add_technical_skills_docx(document, tailored_data["technical_skills"], tailored_data.get("ats_keywords"))
-    if tailored_data.get("work_experience"): add_work_experience_docx(document, tailored_data["work_experience"], tailored_data.get("ats_keywords"))
-    add_education_docx(document, education_info)
-    if tailored_data.get("projects"): 
-        add_projects_docx(
-            document,
-            tailored_data["projects"],
-            contact_info,
-            tailored_data.get("ats_keywords"),
-            tailored_data.get("project_links"),
-            tailored_data.get("source_resume_filename")
-        )
-
-    # Construct the base filename for the PDF
-    candidate_last_name = contact_info.get("name", "Candidate").split()[-1] if contact_info.get("name") else "Resume"
-    yoe_str = str(years_of_experience) if years_of_experience is not None else "X"
-    company_str = re.sub(r'\W+', '', target_company_name) if target_company_name else "TargetCompany"
-    
-    # filename_keyword can be a role, e.g., "AI_Engineer"
-    # The full filename_keyword passed from scrape.py might already be very descriptive.
-    # If filename_keyword already contains company/role, this might be redundant.
-    # Let's assume filename_keyword is a general keyword like "AI" or "DataScience" for now if scrape.py isn't updated.
-    # If scrape.py sends a full prefix in filename_keyword, this becomes simpler.
-    # For now, using the logic from your original main.py for filename parts.
-    # If filename_keyword already contains company/role, this might be redundant.
-    # Let's assume filename_keyword is a general keyword like "AI" or "DataScience" for now if scrape.py isn't updated.
-    # If scrape.py sends a full prefix in filename_keyword, this becomes simpler.
-    # For now, using the logic from your original main.py for filename parts.
-    base_pdf_filename = f"{filename_keyword}_{company_str}_{candidate_last_name}_{yoe_str}YOE"
-    base_pdf_filename = re.sub(r'[^\w\.\-_]', '_', base_pdf_filename) # Sanitize
-
-    pdf_path = generate_pdf_via_google_drive(document, output_pdf_directory, base_pdf_filename)
-    return pdf_path
+        section_elm.page_width = Inches(params.page_width); section_elm.page_height = Inches(params.page_height)
+        section_elm.left_margin = Inches(params.margin_left); section_elm.right_margin = Inches(params.margin_right)
+        section_elm.top_margin = Inches(params.margin_top); section_elm.bottom_margin = Inches(params.margin_bottom)
 
-# In Resume_Tailoring/src/docx_to_pdf_generator.py
-# Make sure all necessary imports like re, os, logging, Document, Pt, Inches, WD_ALIGN_PARAGRAPH, qn,
-# add_styled_paragraph, add_hyperlink, generate_pdf_via_google_drive are present at the top of your file.
 
-logger = logging.getLogger(__name__) # Ensure logger is defined
-
-def generate_cover_letter_pdf(
-    cover_letter_body_text: str,
-    contact_info: Dict[str, str],
-    job_title: str,
-    company_name: str,
-    output_pdf_directory: str,
-    filename_keyword: str = "CoverLetter",
-    years_of_experience: Optional[int] = None,
-    compact: bool = False
-) -> Optional[str]:
-
-    logger.info(f"Starting styled COVER LETTER PDF generation. Output dir: '{output_pdf_directory}'")
-    document = Document()
-
-    # --- Default Styles and Margins for Cover Letter ---
-    # (Your existing style setup from the previous corrected version, ensuring normal_style.paragraph_format.widow_control = True)
+def _style_cover_letter_base(document, params: LayoutParams) -> None:
     normal_style = document.styles['Normal']
     normal_font = normal_style.font
     normal_font.name = 'Times New Roman'
-    normal_font.size = Pt(10 if compact else 11)
+    normal_font.size = Pt(params.font_size)
 
     ct_style_rpr = normal_style.element.get_or_add_rPr()
     ct_style_fonts = ct_style_rpr.get_or_add_rFonts()
@@ -786,7 +840,7 @@ def generate_cover_letter_pdf(
     for attr in theme_font_attributes:
         if attr in ct_style_fonts.attrib:
             del ct_style_fonts.attrib[attr]
-    
+
     ct_style_fonts.set(qn('w:ascii'), 'Times New Roman')
     ct_style_fonts.set(qn('w:hAnsi'), 'Times New Roman')
     ct_style_fonts.set(qn('w:cs'), 'Times New Roman')
@@ -794,20 +848,197 @@ def generate_cover_letter_pdf(
 
     normal_style.paragraph_format.space_before = Pt(0)
     normal_style.paragraph_format.space_after = Pt(0)
-    normal_style.paragraph_format.line_spacing = 1.05 if compact else 1.15
+    normal_style.paragraph_format.line_spacing = params.line_spacing
     normal_style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.LEFT
     normal_style.paragraph_format.widow_control = True
 
     for section_elm in document.sections:
-        section_elm.left_margin = Inches(0.6 if compact else 1)
-        section_elm.right_margin = Inches(0.6 if compact else 1)
-        section_elm.top_margin = Inches(0.5 if compact else 0.75) 
-        section_elm.bottom_margin = Inches(0.5 if compact else 0.75)
+        section_elm.page_width = Inches(params.page_width)
+        section_elm.page_height = Inches(params.page_height)
+        section_elm.left_margin = Inches(params.margin_left)
+        section_elm.right_margin = Inches(params.margin_right)
+        section_elm.top_margin = Inches(params.margin_top)
+        section_elm.bottom_margin = Inches(params.margin_bottom)
+
+
+def _prune_base_document(document, keep_style_names: Sequence[str]) -> None:
+    """Drops the template parts and style definitions our documents never reference."""
+    for rels in (document.part.rels, document.part.package.rels):
+        for r_id in [r_id for r_id, rel in rels.items() if rel.reltype in _PRUNED_RELATIONSHIP_TYPES]:
+            del rels[r_id]
+    styles = document.styles.element
+    latent_styles = styles.find(qn('w:latentStyles'))
+    if latent_styles is not None:
+        styles.remove(latent_styles)
+    by_id = {style.get(qn('w:styleId')): style for style in styles.findall(qn('w:style'))}
+    keep = set()
+    # Defaults seed the traversal like any named style, so their basedOn/link/next targets are kept too
+    pending = [style_id for style_id, style in by_id.items() if style.get(qn('w:default')) in ('1', 'true')]
+    pending += [style.style_id for style in document.styles if style.name in keep_style_names]
+    while pending:  # Close over basedOn/link/next so no kept style points at a removed one
+        style_id = pending.pop()
+        if style_id in keep or style_id not in by_id:
+            continue
+        keep.add(style_id)
+        for tag in ('w:basedOn', 'w:link', 'w:next'):
+            ref = by_id[style_id].find(qn(tag))
+            if ref is not None:
+                pending.append(ref.get(qn('w:val')))
+    for style_id, style in by_id.items():
+        if style_id not in keep:
+            styles.remove(style)
+
+
+def build_base_document_bytes(kind: str, params: LayoutParams) -> bytes:
+    """Serialized empty document for `kind` ("resume" or "cover_letter") with styles and page setup applied."""
+    document = Document()
+    (_style_resume_base if kind == "resume" else _style_cover_letter_base)(document, params)
+    _prune_base_document(document, _BASE_STYLE_NAMES[kind])
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def new_base_document(kind: str, params: LayoutParams) -> Document:
+    """A fresh, independently editable Document cloned from the cached base for (kind, params)."""
+    key = (kind, params)
+    base = _DOCX_BASE_TEMPLATES.get(key)
+    if base is None:
+        base = build_base_document_bytes(kind, params)
+        if len(_DOCX_BASE_TEMPLATES) >= _DOCX_BASE_TEMPLATES_MAX_ENTRIES:
+            _DOCX_BASE_TEMPLATES.pop(next(iter(_DOCX_BASE_TEMPLATES), None), None)  # Tolerates a concurrent eviction
+        _DOCX_BASE_TEMPLATES[key] = base
+    return Document(io.BytesIO(base))
+
+
+def warm_docx_templates() -> None:
+    """Builds the base documents for the presets and readability bounds ahead of the first render."""
+    for params in (RESUME_NORMAL, RESUME_COMPACT, RESUME_DENSEST):
+        new_base_document("resume", params)
+    for params in (COVER_LETTER_NORMAL, COVER_LETTER_COMPACT, COVER_LETTER_DENSEST):
+        new_base_document("cover_letter", params)
+
+
+def resume_pdf_basename(contact_info: Dict[str, str], target_company_name: Optional[str] = None,
+                        years_of_experience: Optional[int] = None, filename_keyword: str = "Resume") -> str:
+    """'<keyword>_<Company>_<LastName>_<N>YOE', sanitized; the resume PDF name without extension."""
+    candidate_last_name = contact_info.get("name", "Candidate").split()[-1] if contact_info.get("name") else "Resume"
+    yoe_str = str(years_of_experience) if years_of_experience is not None else "X"
+    company_str = re.sub(r'\W+', '', target_company_name) if target_company_name else "TargetCompany"
+    base_pdf_filename = f"{filename_keyword}_{company_str}_{candidate_last_name}_{yoe_str}YOE"
+    return re.sub(r'[^\w\.\-_]', '_', base_pdf_filename) # Sanitize
+
+
+def generate_styled_resume_pdf_bytes(
+    tailored_data: Dict[str, Any],
+    contact_info: Dict[str, str],
+    education_info: List[Dict[str, str]],
+    base_filename: str = "Resume", # Names the document inside the render backend (Drive file, logs)
+    compact: bool = False,
+    layout: Optional[LayoutParams] = None # Overrides the normal/compact preset
+) -> Optional[bytes]:
+    """
+    Builds and renders the resume entirely in memory. Returns the PDF bytes or None on failure.
+    Identical content and layout are served from the render cache (see render_cache).
+    """
+    logger.info(f"Starting styled RESUME PDF generation for '{base_filename}'.")
+    params = layout or resume_preset(compact)
+    key = render_cache_key("resume", params, tailored_data, contact_info, education_info)
+    return cached_render(key, lambda: optimize_rendered_pdf(
+        _build_and_render_resume(tailored_data, contact_info, education_info, base_filename, params), base_filename))
+
+
+def _build_and_render_resume(tailored_data: Dict[str, Any], contact_info: Dict[str, str],
+                             education_info: List[Dict[str, str]], base_filename: str,
+                             params: LayoutParams) -> Optional[bytes]:
+    if getattr(app_config, 'PDF_RENDERER', 'docx') == 'vector':
+        return render_resume_pdf_bytes(tailored_data, contact_info, education_info, params=params)
+    document = build_resume_document(tailored_data, contact_info, education_info, params)
+    return render_document_to_pdf_bytes(document, base_filename)
+
+
+def build_resume_document(tailored_data: Dict[str, Any], contact_info: Dict[str, str],
+                          education_info: List[Dict[str, str]], params: LayoutParams = RESUME_NORMAL) -> Document:
+    """The styled resume as a python-docx Document, before any rendering."""
+    document = new_base_document("resume", params)
+
+    # Add content to the DOCX document in enforced order
+    parsed = parse_tailored_resume(tailored_data)  # Cached by section text across normal/compact renders
+    add_contact_info_docx(document, contact_info, params)
+    if parsed.summary: add_summary_docx(document, parsed.summary, tailored_data.get("ats_keywords"), params)
+    if tailored_data.get("technical_skills"): add_technical_skills_docx(document, parsed.technical_skills, tailored_data.get("ats_keywords"), params)
+    if tailored_data.get("work_experience"): add_work_experience_docx(document, parsed.work_experience, tailored_data.get("ats_keywords"), params)
+    add_education_docx(document, education_info, params)
+    if tailored_data.get("projects"): 
+        add_projects_docx(
+            document,
+            parsed.projects,
+            contact_info,
+            tailored_data.get("ats_keywords"),
+            tailored_data.get("project_links"),
+            tailored_data.get("source_resume_filename"),
+            params
+        )
+    return document
+
+
+def generate_styled_resume_pdf(
+    tailored_data: Dict[str, Any],
+    contact_info: Dict[str, str],
+    education_info: List[Dict[str, str]],
+    output_pdf_directory: str,
+    target_company_name: Optional[str] = None, # Used in filename
+    years_of_experience: Optional[int] = None, # Used in filename
+    filename_keyword: str = "Resume", # Base keyword for the filename
+    compact: bool = False,
+    layout: Optional[LayoutParams] = None # Overrides the normal/compact preset
+) -> Optional[str]:
+    """generate_styled_resume_pdf_bytes() written to '<output_pdf_directory>/<name>.pdf'. Returns the path."""
+    base_pdf_filename = resume_pdf_basename(contact_info, target_company_name, years_of_experience, filename_keyword)
+    pdf_bytes = generate_styled_resume_pdf_bytes(tailored_data, contact_info, education_info, base_pdf_filename, compact, layout)
+    return _write_pdf_file(pdf_bytes, output_pdf_directory, base_pdf_filename)
+
+# In Resume_Tailoring/src/docx_to_pdf_generator.py
+# Make sure all necessary imports like re, os, logging, Document, Pt, Inches, WD_ALIGN_PARAGRAPH, qn,
+# add_styled_paragraph, add_hyperlink, generate_pdf_via_google_drive are present at the top of your file.
+
+logger = logging.getLogger(__name__) # Ensure logger is defined
+
+def cover_letter_pdf_basename(contact_info: Dict[str, str], company_name: Optional[str] = None,
+                              filename_keyword: str = "CoverLetter") -> str:
+    """'<keyword>_<Company>_<LastName>', sanitized; the cover letter PDF name without extension."""
+    candidate_last_name = contact_info.get("name", "Candidate").split()[-1] if contact_info.get("name") else "CL"
+    company_str = re.sub(r'\W+', '', company_name) if company_name else "TargetCompany"
+    base_pdf_filename = f"{filename_keyword}_{company_str}_{candidate_last_name}"
+    return re.sub(r'[^\w\.\-_]', '_', base_pdf_filename)
+
+
+def generate_cover_letter_pdf_bytes(
+    cover_letter_body_text: str,
+    contact_info: Dict[str, str],
+    base_filename: str = "CoverLetter", # Names the document inside the render backend (Drive file, logs)
+    compact: bool = False,
+    layout: Optional[LayoutParams] = None # Overrides the normal/compact preset
+) -> Optional[bytes]:
+    """Builds and renders the cover letter entirely in memory, through the render cache. Returns the PDF bytes or None."""
+    logger.info(f"Starting styled COVER LETTER PDF generation for '{base_filename}'.")
+    params = layout or cover_letter_preset(compact)
+    key = render_cache_key("cover_letter", params, cover_letter_body_text, contact_info)
+    return cached_render(key, lambda: optimize_rendered_pdf(
+        _build_and_render_cover_letter(cover_letter_body_text, contact_info, base_filename, params), base_filename))
+
+
+def _build_and_render_cover_letter(cover_letter_body_text: str, contact_info: Dict[str, str], base_filename: str,
+                                   params: LayoutParams) -> Optional[bytes]:
+    if getattr(app_config, 'PDF_RENDERER', 'docx') == 'vector':
+        return render_cover_letter_pdf_bytes(cover_letter_body_text, contact_info, params=params)
+
+    document = new_base_document("cover_letter", params)
 
     # --- Create Traditional Letterhead Style Top Contact Block (Street Address Omitted) ---
     letterhead_font_name = 'Times New Roman'
-    letterhead_font_size = Pt(11) 
-    letterhead_name_font_size = Pt(14)
+    letterhead_font_size = Pt(params.font_size)
+    letterhead_name_font_size = Pt(params.name_font_size)
     letterhead_alignment = WD_ALIGN_PARAGRAPH.LEFT # Or .CENTER or .RIGHT as you prefer
 
     # Candidate Name
@@ -862,43 +1093,37 @@ def generate_cover_letter_pdf(
         p_linkedin_top = document.add_paragraph()
         p_linkedin_top.alignment = letterhead_alignment
         p_linkedin_top.paragraph_format.space_before = Pt(0)
-        p_linkedin_top.paragraph_format.space_after = Pt(18) # Space after letterhead before main content
+        p_linkedin_top.paragraph_format.space_after = Pt(params.contact_space_after) # Space after letterhead before main content
         p_linkedin_top.paragraph_format.widow_control = True
         add_hyperlink(p_linkedin_top, contact_info["linkedin_url"], contact_info["linkedin_text"],
                       font_name=letterhead_font_name, font_size=letterhead_font_size,
                       color_hex="0563C1", is_underline=True)
     else: 
         p_spacer = document.add_paragraph()
-        p_spacer.paragraph_format.space_after = Pt(18) # Ensure consistent spacing if LinkedIn is missing
+        p_spacer.paragraph_format.space_after = Pt(params.contact_space_after) # Ensure consistent spacing if LinkedIn is missing
 
     # --- Process the main body of the cover letter from LLM ---
     # (This part remains the same: stripping LLM signature, adding paragraphs)
     # ... (body_content_from_llm, closing_pattern, main_body_text, visual_paragraphs loop) ...
-    body_content_from_llm = cover_letter_body_text
     candidate_name_from_contact = contact_info.get('name', 'Venkatesh Shanmugam')
-    candidate_name_for_regex = re.escape(candidate_name_from_contact)
-    closing_pattern = re.compile(rf"(?i)\bSincerely,?\s*(\n\s*)*{candidate_name_for_regex}\s*$", re.MULTILINE)
-    main_body_text = closing_pattern.sub("", body_content_from_llm).strip()
-
-    if main_body_text:
-        visual_paragraphs = re.split(r'\n{2,}', main_body_text)
-        for para_text_segment in visual_paragraphs:
-            processed_para_text = para_text_segment.replace('\n', ' ').strip()
-            if processed_para_text:
-                add_styled_paragraph(document, processed_para_text,
-                                     font_name='Times New Roman', font_size=Pt(11),
-                                     alignment=WD_ALIGN_PARAGRAPH.JUSTIFY,
-            space_after=Pt(6 if compact else 8), line_spacing=(1.05 if compact else 1.15))
+    visual_paragraphs = cover_letter_paragraphs(cover_letter_body_text, candidate_name_from_contact)
+
+    if visual_paragraphs:
+        for processed_para_text in visual_paragraphs:
+            add_styled_paragraph(document, processed_para_text,
+                                 font_name='Times New Roman', font_size=Pt(params.font_size),
+                                 alignment=WD_ALIGN_PARAGRAPH.JUSTIFY,
+                                 space_after=Pt(params.paragraph_space_after), line_spacing=params.line_spacing)
     else:
         add_styled_paragraph(document, "[Cover letter body content was not generated or was stripped with the signature.]",
-                             font_name='Times New Roman', font_size=Pt(11))
+                             font_name='Times New Roman', font_size=Pt(params.font_size))
 
 
     # --- Add Controlled Closing, Signature, and Contact Details (as refined previously) ---
     # (This includes: Sincerely, blank line, Name, Phone, Email, GitHub, Portfolio)
     # ... (The detailed closing block code from the previous full function response) ...
     closing_font_name_sig = 'Times New Roman' 
-    closing_font_size_sig = Pt(11)
+    closing_font_size_sig = Pt(params.font_size)
 
     sincerely_p = document.add_paragraph("Sincerely,")
     sincerely_p.alignment = WD_ALIGN_PARAGRAPH.LEFT
@@ -969,11 +1194,21 @@ def generate_cover_letter_pdf(
         add_hyperlink(p_portfolio_cl_sig, contact_info["portfolio_url"], contact_info.get("portfolio_text", "Portfolio"),
                       font_name=closing_font_name_sig, font_size=closing_font_size_sig, color_hex="0563C1", is_underline=True)
 
-    # --- Construct the base filename for the PDF ---
-    candidate_last_name = contact_info.get("name", "Candidate").split()[-1] if contact_info.get("name") else "CL"
-    company_str = re.sub(r'\W+', '', company_name) if company_name else "TargetCompany"
-    base_pdf_filename = f"{filename_keyword}_{company_str}_{candidate_last_name}"
-    base_pdf_filename = re.sub(r'[^\w\.\-_]', '_', base_pdf_filename)
+    return render_document_to_pdf_bytes(document, base_filename)
+
 
-    pdf_path = generate_pdf_via_google_drive(document, output_pdf_directory, base_pdf_filename)
-    return pdf_path
\ No newline at end of file
+def generate_cover_letter_pdf(
+    cover_letter_body_text: str,
+    contact_info: Dict[str, str],
+    job_title: str,
+    company_name: str,
+    output_pdf_directory: str,
+    filename_keyword: str = "CoverLetter",
+    years_of_experience: Optional[int] = None,
+    compact: bool = False,
+    layout: Optional[LayoutParams] = None # Overrides the normal/compact preset
+) -> Optional[str]:
+    """generate_cover_letter_pdf_bytes() written to '<output_pdf_directory>/<name>.pdf'. Returns the path."""
+    base_pdf_filename = cover_letter_pdf_basename(contact_info, company_name, filename_keyword)
+    pdf_bytes = generate_cover_letter_pdf_bytes(cover_letter_body_text, contact_info, base_pdf_filename, compact, layout)
+    return _write_pdf_file(pdf_bytes, output_pdf_directory, base_pdf_filename)
@@ -0,0 +1,269 @@
+# Resume_Tailoring/src/exporter.py
+"""
+Exports a tailored resume to several formats from a single parse.
+
+The tailored sections are parsed once (resume_model.parse_tailored_resume) and every format is
+built from that ParsedResume: the styled DOCX is built once and serves both the .docx download
+and the PDF render; the ATS plain text, JSON Resume and Markdown versions are plain string
+builders over the same entries. Formats are produced concurrently, so an export takes about as
+long as the PDF render alone.
+"""
+import io
+import json
+import logging
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .docx_to_pdf_generator import (
+    build_resume_document, generate_styled_resume_pdf_bytes, render_docx_bytes_to_pdf,
+)
+from .layout_fit import choose_resume_layout
+from .layout_params import LayoutParams
+from .pdf_optimizer import optimize_rendered_pdf
+from .render_cache import cached_render, render_cache_key
+from .resume_model import ParsedResume, parse_tailored_resume, resolve_project_link
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("pdf", "docx", "txt", "json", "md")
+_MIME_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain",
+    "json": "application/json",
+    "md": "text/markdown",
+}
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+_DATE_RE = re.compile(r"(?:([A-Za-z]{3})[a-z]*\.?\s+)?(\d{4})")
+_RANGE_SPLIT_RE = re.compile(r"\s*(?:[–—\-]|\bto\b)\s*")
+
+
+@dataclass(frozen=True, slots=True)
+class ExportedFile:
+    format: str
+    filename: str            # Suggested name with extension
+    data: Optional[bytes]    # None when this format failed
+    mime_type: str
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+
+def _plain(text: str) -> str:
+    return (text or "").replace("**", "").strip()
+
+
+def _contact_line(contact_info: Mapping[str, str]) -> str:
+    return contact_info.get("line1_info") or " | ".join(
+        v for v in (contact_info.get("city_state_zip"), contact_info.get("email"), contact_info.get("phone")) if v)
+
+
+def _profile_links(contact_info: Mapping[str, str]) -> List[Tuple[str, str]]:
+    links = []
+    for key, default_label in (("linkedin", "LinkedIn"), ("github", "GitHub"), ("portfolio", "Portfolio")):
+        url = contact_info.get(f"{key}_url")
+        if url and url != "#":
+            links.append((contact_info.get(f"{key}_text") or default_label, url))
+    return links
+
+
+def _education_line(item: Mapping[str, str]) -> str:
+    return ", ".join(v for v in (item.get("degree_line"), item.get("university_line")) if v)
+
+
+def build_ats_text(parsed: ParsedResume, contact_info: Mapping[str, str], education_info: Sequence[Mapping[str, str]],
+                   tailored_data: Mapping[str, Any]) -> str:
+    """Single-column plain text with standard headings, no markup: what ATS parsers read most reliably."""
+    lines = [contact_info.get("name", ""), _contact_line(contact_info)]
+    lines += [f"{label}: {url}" for label, url in _profile_links(contact_info)]
+    if parsed.summary:
+        lines += ["", "SUMMARY", _plain(parsed.summary)]
+    if parsed.technical_skills:
+        lines += ["", "TECHNICAL SKILLS"]
+        lines += [f"{c.name}: {_plain(c.skills)}" if c.name else _plain(c.skills) for c in parsed.technical_skills]
+    if parsed.work_experience:
+        lines += ["", "WORK EXPERIENCE"]
+        for job in parsed.work_experience:
+            lines.append(" | ".join(_plain(v) for v in (job.title, job.company, job.location, job.dates) if v))
+            lines += [f"- {_plain(b)}" for b in job.bullets]
+    if education_info:
+        lines += ["", "EDUCATION"]
+        lines += [" | ".join(v for v in (_education_line(item), item.get("dates_line")) if v) for item in education_info]
+    if parsed.projects:
+        lines += ["", "PROJECTS"]
+        for project in parsed.projects:
+            url = resolve_project_link(project.title, tailored_data.get("project_links"), contact_info,
+                                       tailored_data.get("source_resume_filename"))
+            lines.append(" | ".join(_plain(v) for v in (project.title, project.tagline, url) if v))
+            lines += [f"- {_plain(b)}" for b in project.bullets]
+    return "\n".join(lines).strip() + "\n"
+
+
+def build_markdown(parsed: ParsedResume, contact_info: Mapping[str, str], education_info: Sequence[Mapping[str, str]],
+                   tailored_data: Mapping[str, Any]) -> str:
+    """Markdown with the tailored **bold** emphasis kept."""
+    lines = [f"# {contact_info.get('name', '')}", "", _contact_line(contact_info)]
+    links = _profile_links(contact_info)
+    if links:
+        lines += ["", " | ".join(f"[{label}]({url})" for label, url in links)]
+    if parsed.summary:
+        lines += ["", "## Summary", "", parsed.summary]
+    if parsed.technical_skills:
+        lines += ["", "## Technical Skills", ""]
+        lines += [f"- **{c.name}:** {c.skills}" if c.name else f"- {c.skills}" for c in parsed.technical_skills]
+    if parsed.work_experience:
+        lines += ["", "## Work Experience"]
+        for job in parsed.work_experience:
+            details = " | ".join(v for v in (job.company, job.location, job.dates) if v)
+            lines += ["", f"### {_plain(job.title)}" + (f" | {details}" if details else ""), ""]
+            lines += [f"- {b}" for b in job.bullets]
+    if education_info:
+        lines += ["", "## Education", ""]
+        lines += [f"- **{_education_line(item)}**" + (f" ({item['dates_line']})" if item.get("dates_line") else "")
+                  for item in education_info]
+    if parsed.projects:
+        lines += ["", "## Projects"]
+        for project in parsed.projects:
+            url = resolve_project_link(project.title, tailored_data.get("project_links"), contact_info,
+                                       tailored_data.get("source_resume_filename"))
+            title = f"[{_plain(project.title)}]({url})" if url else _plain(project.title)
+            lines += ["", f"### {title}" + (f" | {project.tagline}" if project.tagline else ""), ""]
+            lines += [f"- {b}" for b in project.bullets]
+    return "\n".join(lines).strip() + "\n"
+
+
+def _iso_date(text: Optional[str]) -> Optional[str]:
+    """'Aug 2023' -> '2023-08', '2020' -> '2020'; None for 'Present' or anything unparseable."""
+    match = _DATE_RE.search(text or "")
+    if not match:
+        return None
+    month = _MONTHS.get((match.group(1) or "").lower()[:3])
+    return f"{match.group(2)}-{month:02d}" if month else match.group(2)
+
+
+def _date_range(text: Optional[str]) -> Dict[str, str]:
+    parts = _RANGE_SPLIT_RE.split(text or "", maxsplit=1)
+    dates = {"startDate": _iso_date(parts[0]), "endDate": _iso_date(parts[1]) if len(parts) > 1 else None}
+    return {k: v for k, v in dates.items() if v}
+
+
+def build_json_resume(parsed: ParsedResume, contact_info: Mapping[str, str],
+                      education_info: Sequence[Mapping[str, str]], tailored_data: Mapping[str, Any]) -> Dict[str, Any]:
+    """The resume in the JSON Resume schema (https://jsonresume.org/schema)."""
+    basics = {
+        "name": contact_info.get("name", ""),
+        "email": contact_info.get("email", ""),
+        "phone": contact_info.get("phone", ""),
+        "summary": _plain(parsed.summary),
+        "profiles": [{"network": label, "url": url} for label, url in _profile_links(contact_info)],
+    }
+    if contact_info.get("portfolio_url"):
+        basics["url"] = contact_info["portfolio_url"]
+    if contact_info.get("city_state_zip"):
+        basics["location"] = {"address": contact_info["city_state_zip"]}
+    work = [dict({"name": _plain(job.company or ""), "position": _plain(job.title), "location": _plain(job.location or ""),
+                  "highlights": [_plain(b) for b in job.bullets]}, **_date_range(job.dates))
+            for job in parsed.work_experience]
+    education = [dict({"institution": item.get("university_line", ""), "studyType": item.get("degree_line", "")},
+                      **_date_range(item.get("dates_line"))) for item in education_info]
+    skills = [{"name": c.name or "Skills", "keywords": [s.strip() for s in _plain(c.skills).split(",") if s.strip()]}
+              for c in parsed.technical_skills]
+    projects = []
+    for project in parsed.projects:
+        entry = {"name": _plain(project.title), "description": _plain(project.tagline or ""),
+                 "highlights": [_plain(b) for b in project.bullets]}
+        url = resolve_project_link(project.title, tailored_data.get("project_links"), contact_info,
+                                   tailored_data.get("source_resume_filename"))
+        if url:
+            entry["url"] = url
+        projects.append(entry)
+    return {"basics": basics, "work": work, "education": education, "skills": skills, "projects": projects}
+
+
+def _docx_bytes(tailored_data: Dict[str, Any], contact_info: Dict[str, str], education_info: List[Dict[str, str]],
+                params: LayoutParams) -> bytes:
+    buffer = io.BytesIO()
+    build_resume_document(tailored_data, contact_info, education_info, params).save(buffer)
+    return buffer.getvalue()
+
+
+def export_resume(
+    tailored_data: Dict[str, Any],
+    contact_info: Dict[str, str],
+    education_info: List[Dict[str, str]],
+    formats: Sequence[str] = EXPORT_FORMATS,
+    base_filename: str = "Resume",
+    layout: Optional[LayoutParams] = None,  # Defaults to the loosest layout estimated to fit one page
+) -> Dict[str, ExportedFile]:
+    """
+    Builds every requested format from one parse of the tailored resume, concurrently. Returns
+    {format: ExportedFile}; a failed format has data None and an error, the others are unaffected.
+    """
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {unknown}; expected some of {EXPORT_FORMATS}")
+    formats = list(dict.fromkeys(formats))
+    parsed = parse_tailored_resume(tailored_data)
+    params = layout
+    if params is None and ("pdf" in formats or "docx" in formats):
+        params, _ = choose_resume_layout(tailored_data, contact_info, education_info)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(formats)), thread_name_prefix="export") as executor:
+        docx_future: Optional[Future] = None
+        vector = getattr(app_config, 'PDF_RENDERER', 'docx') == 'vector'
+        if "docx" in formats or ("pdf" in formats and not vector):
+            docx_future = executor.submit(_docx_bytes, tailored_data, contact_info, education_info, params)
+
+        def pdf() -> Optional[bytes]:
+            if vector or docx_future is None:
+                return generate_styled_resume_pdf_bytes(tailored_data, contact_info, education_info,
+                                                        base_filename, layout=params)
+            # Same key as generate_styled_resume_pdf_bytes, so exports and the app share cached renders
+            key = render_cache_key("resume", params, tailored_data, contact_info, education_info)
+            return cached_render(key, lambda: optimize_rendered_pdf(
+                render_docx_bytes_to_pdf(docx_future.result(), base_filename), base_filename))
+
+        builders: Dict[str, Callable[[], Optional[bytes]]] = {
+            "pdf": pdf,
+            "docx": lambda: docx_future.result(),
+            "txt": lambda: build_ats_text(parsed, contact_info, education_info, tailored_data).encode("utf-8"),
+            "md": lambda: build_markdown(parsed, contact_info, education_info, tailored_data).encode("utf-8"),
+            "json": lambda: json.dumps(build_json_resume(parsed, contact_info, education_info, tailored_data),
+                                       indent=2, ensure_ascii=False).encode("utf-8"),
+        }
+        futures = {fmt: executor.submit(builders[fmt]) for fmt in formats}
+        exports = {}
+        for fmt, future in futures.items():
+            filename = f"{base_filename}.{fmt}"
+            try:
+                data = future.result() or None
+                exports[fmt] = ExportedFile(fmt, filename, data, _MIME_TYPES[fmt],
+                                            None if data else "renderer returned nothing")
+            except Exception as e:
+                logger.error(f"Export to {fmt} failed: {e}", exc_info=True)
+                exports[fmt] = ExportedFile(fmt, filename, None, _MIME_TYPES[fmt], str(e))
+    return exports
+
+
+def write_exports(exports: Mapping[str, ExportedFile], output_dir: str) -> Dict[str, str]:
+    """Writes the successful exports into output_dir. Returns {format: path}."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for fmt, exported in exports.items():
+        if exported.ok:
+            path = os.path.join(output_dir, exported.filename)
+            with open(path, "wb") as f:
+                f.write(exported.data)
+            paths[fmt] = path
+    return paths
@@ -0,0 +1,127 @@
+# Resume_Tailoring/src/font_metrics.py
+"""
+Glyph-width tables for the PDF base-14 Times faces (metric-compatible with Times New Roman).
+
+Widths come from reportlab's AFM data once per face and are kept in a per-character dict, so
+measuring a string is one dict lookup per character with no font files or external process.
+Used by the vector renderer and the one-page fit estimator.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from reportlab.pdfbase import pdfmetrics
+
+# python-docx family name -> (regular, bold, italic, bold italic) base-14 faces
+FONT_FAMILIES = {
+    "Times New Roman": ("Times-Roman", "Times-Bold", "Times-Italic", "Times-BoldItalic"),
+}
+DEFAULT_FAMILY = "Times New Roman"
+
+# Word's "single" line height for Times New Roman is ascent + descent + line gap of the TrueType
+# font, about 1.15 em; "multiple" line spacing (1.15, 1.05, ...) scales that.
+SINGLE_LINE_HEIGHT_EM = 1.15
+ASCENT_EM = 0.891
+
+
+def font_name(bold: bool = False, italic: bool = False, family: str = DEFAULT_FAMILY) -> str:
+    faces = FONT_FAMILIES.get(family, FONT_FAMILIES[DEFAULT_FAMILY])
+    return faces[(2 if italic else 0) + (1 if bold else 0)]
+
+
+def line_height(font_size: float, line_spacing: float = 1.0) -> float:
+    return font_size * SINGLE_LINE_HEIGHT_EM * line_spacing
+
+
+class _WidthTable(dict):
+    """char -> advance width at 1pt; unseen characters are measured once and remembered."""
+    __slots__ = ("font",)
+
+    def __init__(self, font: str):
+        super().__init__()
+        self.font = font
+
+    def __missing__(self, ch: str) -> float:
+        width = pdfmetrics.stringWidth(ch, self.font, 1.0)
+        self[ch] = width
+        return width
+
+
+@lru_cache(maxsize=None)
+def _width_table(font: str) -> _WidthTable:
+    table = _WidthTable(font)
+    for code in range(32, 256):
+        table[chr(code)]  # Prime Latin-1 so the common path never leaves the dict
+    return table
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    """Advance width of `text` in points. O(len(text)) dict lookups."""
+    if not text:
+        return 0.0
+    return sum(map(_width_table(font).__getitem__, text)) * size
+
+
+@dataclass(frozen=True, slots=True)
+class TextSegment:
+    """A run of text with uniform styling; `url` makes it a hyperlink."""
+    text: str
+    font: str
+    size: float
+    url: Optional[str] = None
+    color: Optional[str] = None  # Hex like "0563C1"; None is black
+
+
+@dataclass(slots=True)
+class Word:
+    """Non-breaking group of pieces (may span segments, e.g. '**Python**,') plus the space after it."""
+    pieces: List[Tuple[TextSegment, str, float]]
+    width: float
+    space_width: float
+
+
+_TOKEN_RE = re.compile(r'\s+|\S+')
+
+
+def split_words(segments: List[TextSegment]) -> List[Word]:
+    words: List[Word] = []
+    pieces: List[Tuple[TextSegment, str, float]] = []
+    width = 0.0
+    for seg in segments:
+        for token in _TOKEN_RE.findall(seg.text):
+            if token.isspace():
+                if pieces:
+                    words.append(Word(pieces, width, text_width(" ", seg.font, seg.size)))
+                    pieces, width = [], 0.0
+                continue
+            w = text_width(token, seg.font, seg.size)
+            pieces.append((seg, token, w))
+            width += w
+    if pieces:
+        words.append(Word(pieces, width, 0.0))
+    return words
+
+
+def wrap_words(words: List[Word], first_line_width: float, line_width: Optional[float] = None) -> List[List[Word]]:
+    """Greedy line breaking, as Word and Google Docs do. An over-long word gets a line of its own."""
+    line_width = first_line_width if line_width is None else line_width
+    lines: List[List[Word]] = []
+    current: List[Word] = []
+    used = 0.0
+    available = first_line_width
+    for word in words:
+        needed = word.width if not current else used + current[-1].space_width + word.width
+        if current and needed > available + 1e-6:
+            lines.append(current)
+            current, used, available = [word], word.width, line_width
+        else:
+            current.append(word)
+            used = needed
+    if current:
+        lines.append(current)
+    return lines
+
+
+def line_content_width(line: List[Word]) -> float:
+    return sum(w.width for w in line) + sum(w.space_width for w in line[:-1])
@@ -0,0 +1,130 @@
+# Resume_Tailoring/src/layout_fit.py
+"""
+One-page fit estimation from the parsed content, before anything is rendered.
+
+The estimate runs the vector renderer's layout pass (font-metric line wrapping at the configured
+margins and spacing) without drawing, so choosing a layout costs milliseconds instead of a
+render, a PyPDF2 page count and a second render. search_layout() uses it to pick the loosest
+layout between the normal preset and the readability bounds that still fits one page.
+"""
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from .layout_params import (
+    COVER_LETTER_DENSEST, COVER_LETTER_NORMAL, DENSITY_STAGES, RESUME_DENSEST, RESUME_NORMAL,
+    LayoutParams, interpolate_layout,
+)
+from .vector_pdf_renderer import PageLayout, layout_cover_letter, layout_resume
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class FitEstimate:
+    pages: int
+    used_height: float       # Points of content from the top margin down
+    available_height: float  # Usable height of one page in points
+    safety: float            # Points held back for renderer differences (Docs/LibreOffice vs. our metrics)
+
+    @property
+    def slack(self) -> float:
+        """Free points left on a single page; negative when the content overflows."""
+        return self.available_height - self.safety - self.used_height
+
+    @property
+    def fits(self) -> bool:
+        return self.pages == 1 and self.slack >= 0
+
+
+def _safety_pt() -> float:
+    return float(getattr(app_config, 'LAYOUT_FIT_SAFETY_PT', 4))
+
+
+def _estimate(layout: PageLayout, params: LayoutParams) -> FitEstimate:
+    return FitEstimate(layout.page_count, layout.used_height, params.text_height_pt, _safety_pt())
+
+
+# Measurements keyed by (document kind, content hash, LayoutParams). The search re-visits
+# candidates across reruns and the Streamlit flow estimates the same content more than once.
+_MEASURE_CACHE: Dict[Tuple[str, str, LayoutParams], FitEstimate] = {}
+_MEASURE_CACHE_MAX_ENTRIES = 512
+
+
+def _content_hash(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _cached_measure(kind: str, content_hash: str, params: LayoutParams,
+                    measure: Callable[[LayoutParams], PageLayout]) -> FitEstimate:
+    key = (kind, content_hash, params)
+    cached = _MEASURE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    estimate = _estimate(measure(params), params)
+    if len(_MEASURE_CACHE) >= _MEASURE_CACHE_MAX_ENTRIES:
+        _MEASURE_CACHE.pop(next(iter(_MEASURE_CACHE), None), None)  # Tolerates a concurrent eviction
+    _MEASURE_CACHE[key] = estimate
+    return estimate
+
+
+def estimate_resume_fit(tailored_data: Dict[str, Any], contact_info: Dict[str, str],
+                        education_info: List[Dict[str, str]], params: LayoutParams = RESUME_NORMAL) -> FitEstimate:
+    content_hash = _content_hash(tailored_data, contact_info, education_info)
+    return _cached_measure("resume", content_hash, params,
+                           lambda p: layout_resume(tailored_data, contact_info, education_info, p))
+
+
+def estimate_cover_letter_fit(cover_letter_body_text: str, contact_info: Dict[str, str],
+                              params: LayoutParams = COVER_LETTER_NORMAL) -> FitEstimate:
+    content_hash = _content_hash(cover_letter_body_text, contact_info)
+    return _cached_measure("cover_letter", content_hash, params,
+                           lambda p: layout_cover_letter(cover_letter_body_text, contact_info, p))
+
+
+def search_layout(estimate: Callable[[LayoutParams], FitEstimate], loosest: LayoutParams,
+                  densest: LayoutParams, max_evaluations: int = 8) -> Tuple[LayoutParams, FitEstimate]:
+    """
+    Loosest layout on the loosest-to-densest path (see layout_params.interpolate_layout) that is
+    estimated to fit one page. Bisects the density, so it needs 2 + log2(precision) measurements.
+    Returns the densest layout, flagged by FitEstimate.fits == False, when nothing fits.
+    """
+    result = (loosest, estimate(loosest))
+    if result[1].fits:
+        return result
+    densest_result = (densest, estimate(densest))
+    if not densest_result[1].fits:
+        logger.warning(f"Content overflows even the densest layout by {-densest_result[1].slack:.0f}pt.")
+        return densest_result
+    low, high = 0.0, float(len(DENSITY_STAGES))
+    best = densest_result
+    for _ in range(max(0, max_evaluations - 2)):
+        mid = (low + high) / 2
+        params = interpolate_layout(loosest, densest, mid)
+        fit = estimate(params)
+        if fit.fits:
+            high, best = mid, (params, fit)
+        else:
+            low = mid
+    return best
+
+
+def choose_resume_layout(tailored_data: Dict[str, Any], contact_info: Dict[str, str],
+                         education_info: List[Dict[str, str]]) -> Tuple[LayoutParams, FitEstimate]:
+    """The loosest resume layout predicted to fit one page, so the first render is the only render."""
+    return search_layout(lambda p: estimate_resume_fit(tailored_data, contact_info, education_info, p),
+                         RESUME_NORMAL, RESUME_DENSEST)
+
+
+def choose_cover_letter_layout(cover_letter_body_text: str,
+                               contact_info: Dict[str, str]) -> Tuple[LayoutParams, FitEstimate]:
+    return search_layout(lambda p: estimate_cover_letter_fit(cover_letter_body_text, contact_info, p),
+                         COVER_LETTER_NORMAL, COVER_LETTER_DENSEST)
@@ -0,0 +1,111 @@
+# Resume_Tailoring/src/layout_params.py
+"""
+Page geometry and spacing for the resume and cover letter, shared by the DOCX and vector renderers.
+
+The presets reproduce the values generate_styled_resume_pdf / generate_cover_letter_pdf used for
+their normal and compact modes. Sizes are points, margins are inches.
+"""
+from dataclasses import dataclass, replace
+from typing import Sequence, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class LayoutParams:
+    font_size: float                 # Body text
+    line_spacing: float              # Word "multiple" line spacing
+    paragraph_space_after: float     # After body lines and bullets
+    entry_space_after: float         # After the last bullet of a job/project, and after education lines
+    margin_left: float
+    margin_right: float
+    margin_top: float
+    margin_bottom: float
+    name_font_size: float = 16
+    section_space_before: float = 6
+    section_space_after: float = 4
+    contact_space_after: float = 18  # Gap between the contact block and the first section
+    bullet_indent: float = 0.25      # Hanging indent of bulleted paragraphs
+    date_tab_stop: float = 7.2       # Right-aligned tab stop for dates, from the left margin
+    page_width: float = 8.5
+    page_height: float = 11.0
+
+    @property
+    def text_width_pt(self) -> float:
+        return (self.page_width - self.margin_left - self.margin_right) * 72
+
+    @property
+    def text_height_pt(self) -> float:
+        return (self.page_height - self.margin_top - self.margin_bottom) * 72
+
+    def with_changes(self, **changes) -> "LayoutParams":
+        return replace(self, **changes)
+
+
+RESUME_NORMAL = LayoutParams(
+    font_size=10, line_spacing=1.15, paragraph_space_after=2, entry_space_after=6,
+    margin_left=0.51, margin_right=0.51, margin_top=0.13, margin_bottom=0.06,
+)
+RESUME_COMPACT = LayoutParams(
+    font_size=9, line_spacing=1.05, paragraph_space_after=1, entry_space_after=4,
+    margin_left=0.45, margin_right=0.45, margin_top=0.1, margin_bottom=0.05,
+)
+
+COVER_LETTER_NORMAL = LayoutParams(
+    font_size=11, line_spacing=1.15, paragraph_space_after=8, entry_space_after=8,
+    margin_left=1.0, margin_right=1.0, margin_top=0.75, margin_bottom=0.75,
+    name_font_size=14,
+)
+COVER_LETTER_COMPACT = LayoutParams(
+    font_size=10, line_spacing=1.05, paragraph_space_after=6, entry_space_after=6,
+    margin_left=0.6, margin_right=0.6, margin_top=0.5, margin_bottom=0.5,
+    name_font_size=14,
+)
+
+
+# Readability bounds for the continuous layout search: the loosest end is the normal preset, the
+# tightest is the densest layout still comfortable to read (nothing below 9pt body text).
+RESUME_DENSEST = LayoutParams(
+    font_size=9, line_spacing=1.0, paragraph_space_after=0.5, entry_space_after=2,
+    margin_left=0.4, margin_right=0.4, margin_top=0.1, margin_bottom=0.05,
+    name_font_size=14, section_space_before=3, section_space_after=2, contact_space_after=8,
+)
+COVER_LETTER_DENSEST = LayoutParams(
+    font_size=10, line_spacing=1.0, paragraph_space_after=4, entry_space_after=4,
+    margin_left=0.6, margin_right=0.6, margin_top=0.5, margin_bottom=0.5,
+    name_font_size=13, contact_space_after=10,
+)
+
+# Parameters are tightened in stages, least visible first: whitespace, then margins, then type size.
+DENSITY_STAGES: Tuple[Tuple[str, ...], ...] = (
+    ("line_spacing", "paragraph_space_after", "entry_space_after", "section_space_before",
+     "section_space_after", "contact_space_after"),
+    ("margin_left", "margin_right", "margin_top", "margin_bottom"),
+    ("font_size", "name_font_size"),
+)
+_HALF_POINT_FIELDS = {"font_size", "name_font_size"}  # DOCX stores type size in half points
+
+
+def interpolate_layout(loosest: LayoutParams, densest: LayoutParams, density: float,
+                       stages: Sequence[Sequence[str]] = DENSITY_STAGES) -> LayoutParams:
+    """
+    Layout at `density` in [0, len(stages)]: stage i is interpolated by the fractional part of
+    density once stages before it are fully tightened, so content height shrinks as density grows.
+    """
+    density = min(max(density, 0.0), float(len(stages)))
+    changes = {}
+    for index, stage in enumerate(stages):
+        frac = min(max(density - index, 0.0), 1.0)
+        for name in stage:
+            loose, dense = getattr(loosest, name), getattr(densest, name)
+            value = loose + (dense - loose) * frac
+            if name in _HALF_POINT_FIELDS:
+                value = round(value * 2) / 2
+            changes[name] = round(value, 3)
+    return replace(loosest, **changes)
+
+
+def resume_preset(compact: bool = False) -> LayoutParams:
+    return RESUME_COMPACT if compact else RESUME_NORMAL
+
+
+def cover_letter_preset(compact: bool = False) -> LayoutParams:
+    return COVER_LETTER_COMPACT if compact else COVER_LETTER_NORMAL
@@ -1,17 +1,117 @@
-# 
-
 # Resume_Tailoring/src/pdf_generator.py
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from xhtml2pdf import pisa
-from io import BytesIO, StringIO # StringIO can also be useful
+"""
+HTML resume rendering through Jinja2 and xhtml2pdf, a fully local alternative to the DOCX pipeline.
 
+The Jinja2 environment is built once per template directory and keeps its compiled templates;
+a bytecode cache on disk lets new processes skip template compilation too. The stylesheet is read
+once and re-read only when its mtime changes. The pisa conversion runs on a small worker pool, so
+callers can submit a document and keep working (submit_html_to_pdf) while it converts.
+"""
+import functools
 import json
-import os
 import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO, StringIO
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from xhtml2pdf import pisa
+
 from .data_parser_for_pdf import preprocess_tailored_data_for_pdf
 
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
 logger = logging.getLogger(__name__)
 
+_css_cache: Dict[str, Tuple[float, Optional[str]]] = {}  # path -> (mtime, content)
+_pisa_executor: Optional[ThreadPoolExecutor] = None
+_pisa_executor_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def get_template_environment(template_dir: str) -> Environment:
+    """Process-wide Jinja2 environment for a template directory, with an on-disk bytecode cache."""
+    bytecode_dir = getattr(app_config, 'JINJA_BYTECODE_CACHE_DIR', None) \
+        or os.path.join(tempfile.gettempdir(), "resume_jinja_bytecode")
+    os.makedirs(bytecode_dir, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(['html', 'xml']),
+        bytecode_cache=FileSystemBytecodeCache(bytecode_dir),
+        auto_reload=True,  # A stat per render keeps edited templates live; compiled code is reused otherwise
+    )
+
+
+def load_css(css_file_path: str) -> Optional[str]:
+    """Stylesheet content, cached until the file's mtime changes. None when missing or unreadable."""
+    try:
+        mtime = os.path.getmtime(css_file_path)
+    except OSError:
+        logger.warning(f"CSS file '{css_file_path}' not found. PDF might not be styled correctly.")
+        return None
+    cached = _css_cache.get(css_file_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(css_file_path, 'r', encoding='utf-8') as cf:
+            css_string = cf.read()
+        logger.info(f"Loaded CSS from '{css_file_path}'.")
+    except Exception as e_css:
+        logger.warning(f"Could not read CSS file '{css_file_path}': {e_css}. PDF might not be styled correctly.")
+        css_string = None
+    _css_cache[css_file_path] = (mtime, css_string)
+    return css_string
+
+
+def render_resume_html(resume_data: Dict[str, Any], template_dir: str,
+                       template_name: str = "resume_template.html") -> str:
+    template = get_template_environment(template_dir).get_template(template_name)
+    return template.render(resume_data=resume_data)
+
+
+def html_to_pdf_bytes(html: str, css_string: Optional[str], template_dir: str,
+                      template_name: str = "resume_template.html") -> Optional[bytes]:
+    """Converts rendered HTML with xhtml2pdf. Returns the PDF bytes or None on failure."""
+    result = BytesIO()
+    try:
+        # link_callback resolves resources linked relative to the template directory
+        pdf_status = pisa.CreatePDF(
+            StringIO(html),
+            dest=result,
+            default_css=css_string,
+            link_callback=lambda uri, rel: os.path.join(
+                template_dir, uri.replace(os.path.basename(template_name), "").strip("/"), rel),
+        )
+    except Exception as e:
+        logger.error(f"Critical Error generating PDF with xhtml2pdf: {e}", exc_info=True)
+        return None
+    if pdf_status.err:
+        logger.error(f"xhtml2pdf PDF generation error count: {pdf_status.err}. Errors: {pdf_status.log}")
+        return None
+    return result.getvalue()
+
+
+def _get_pisa_executor() -> ThreadPoolExecutor:
+    global _pisa_executor
+    with _pisa_executor_lock:
+        if _pisa_executor is None:
+            workers = max(1, int(getattr(app_config, 'XHTML2PDF_MAX_WORKERS', 2)))
+            _pisa_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="xhtml2pdf")
+        return _pisa_executor
+
+
+def submit_html_to_pdf(html: str, css_string: Optional[str], template_dir: str,
+                       template_name: str = "resume_template.html") -> "Future[Optional[bytes]]":
+    """html_to_pdf_bytes() on the conversion pool; the caller collects the bytes from the future."""
+    return _get_pisa_executor().submit(html_to_pdf_bytes, html, css_string, template_dir, template_name)
+
+
 def generate_pdf_from_json_xhtml2pdf(
     tailored_json_path: str,
     original_resume_pdf_text: str,
@@ -41,74 +141,35 @@ def generate_pdf_from_json_xhtml2pdf(
         logger.error(f"Critical Error during data preprocessing for PDF template: {e}", exc_info=True)
         return False
 
-    html_output_string = ""
+    if not os.path.isdir(template_dir):
+        logger.error(f"Jinja2 template directory not found: '{template_dir}'.")
+        return False
     try:
-        if not os.path.isdir(template_dir):
-            logger.error(f"Jinja2 template directory not found: '{template_dir}'.")
-            return False
-        
-        env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
-        template = env.get_template(template_name)
-        logger.info(f"Jinja2 template '{template_name}' loaded successfully from '{template_dir}'.")
-        html_output_string = template.render(resume_data=resume_data_for_template)
+        html_output_string = render_resume_html(resume_data_for_template, template_dir, template_name)
         logger.info("HTML template rendered successfully.")
-
-        intermediate_html_path = os.path.splitext(output_pdf_path)[0] + "_debug.html"
-        try:
-            with open(intermediate_html_path, "w", encoding="utf-8") as f:
-                f.write(html_output_string)
-            logger.info(f"Intermediate HTML saved to: {intermediate_html_path}")
-        except Exception as e_html_save:
-            logger.warning(f"Could not save intermediate HTML debug file: {e_html_save}")
-
     except Exception as e:
         logger.error(f"Critical Error rendering HTML template: {e}", exc_info=True)
         return False
 
-    # Read CSS content to pass it directly or ensure path is resolvable
-    css_file_path = os.path.join(template_dir, css_name)
-    css_string = None
-    if os.path.exists(css_file_path):
-        try:
-            with open(css_file_path, 'r', encoding='utf-8') as cf:
-                css_string = cf.read()
-            logger.info(f"Successfully loaded CSS from '{css_file_path}'.")
-        except Exception as e_css:
-            logger.warning(f"Could not read CSS file '{css_file_path}': {e_css}. PDF might not be styled correctly.")
-    else:
-        logger.warning(f"CSS file '{css_file_path}' not found. PDF might not be styled correctly.")
+    # Conversion starts on the pool while the debug HTML is written
+    pdf_future = submit_html_to_pdf(html_output_string, load_css(os.path.join(template_dir, css_name)),
+                                    template_dir, template_name)
+    intermediate_html_path = os.path.splitext(output_pdf_path)[0] + "_debug.html"
+    try:
+        with open(intermediate_html_path, "w", encoding="utf-8") as f:
+            f.write(html_output_string)
+        logger.info(f"Intermediate HTML saved to: {intermediate_html_path}")
+    except Exception as e_html_save:
+        logger.warning(f"Could not save intermediate HTML debug file: {e_html_save}")
 
+    pdf_bytes = pdf_future.result()
+    if not pdf_bytes:
+        return False
     try:
-        logger.info(f"Initiating PDF conversion with xhtml2pdf. Output to: '{output_pdf_path}'")
-        with open(output_pdf_path, "w+b") as result_file:
-            # Using StringIO for HTML source if pisa prefers it, BytesIO is also common.
-            # The key is that html_output_string is a string.
-            source_html = StringIO(html_output_string)
-            
-            # CreatePDF can take default_css argument with CSS string
-            # The link_callback helps resolve relative paths for images if any are in your HTML/CSS later
-            # and can also help find CSS if linked in HTML and paths are relative to template_dir
-            pdf_status = pisa.CreatePDF(
-                source_html,                # file-like object of HTML
-                dest=result_file,           # file-like object of PDF
-                default_css=css_string,     # Pass CSS content directly
-                link_callback=lambda uri, rel: os.path.join(template_dir, uri.replace(os.path.basename(template_name), "" ).strip("/"), rel)
-                                             # A more robust link_callback for finding relative resources
-                                             # This specific callback might need tuning based on how CSS/images are linked.
-                                             # A simpler one if CSS is directly provided via default_css:
-                                             # link_callback=lambda uri, rel: os.path.join(template_dir, rel)
-            )
-
-        if pdf_status.err:
-            logger.error(f"xhtml2pdf PDF generation error count: {pdf_status.err}. Errors: {pdf_status.log}")
-            # Check pdf_status.log for more details on what went wrong (e.g., CSS errors, missing images)
-            return False
-        
-        logger.info(f"PDF resume successfully generated and saved to: '{output_pdf_path}'")
-        return True
+        with open(output_pdf_path, "wb") as result_file:
+            result_file.write(pdf_bytes)
     except Exception as e:
-        logger.error(f"Critical Error generating PDF with xhtml2pdf: {e}", exc_info=True)
-        return False
\ No newline at end of file
+        logger.error(f"Could not write PDF '{output_pdf_path}': {e}", exc_info=True)
+        return False
+    logger.info(f"PDF resume successfully generated and saved to: '{output_pdf_path}'")
+    return True
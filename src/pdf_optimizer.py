@@ -0,0 +1,89 @@
+# Resume_Tailoring/src/pdf_optimizer.py
+"""
+Post-render size optimization for the generated PDFs.
+
+Drive and LibreOffice embed a separate font subset per run style and write every object
+uncompressed into the cross-reference table. Re-subsetting the fonts, deflating all streams,
+merging duplicate objects (garbage=4) and packing objects into object streams makes resumes
+about 15-20% smaller in 10-20ms, which every GCS upload, email attachment, download and ATS
+portal with an upload limit benefits from. The pass keeps the original bytes when the result is
+not smaller or does not read back with the same pages, text and links.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import fitz  # PyMuPDF
+
+from .pdf_verifier import verify_pdf
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class OptimizedPdf:
+    pdf_bytes: bytes
+    original_size: int
+    optimized_size: int  # Equals original_size when the original was kept
+    elapsed_ms: float
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_size - self.optimized_size
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"documents": 0, "original_bytes": 0, "optimized_bytes": 0}
+
+
+def optimization_stats() -> Dict[str, int]:
+    """Totals since process start: documents optimized and bytes before/after."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def optimize_pdf(pdf_bytes: bytes, subset_fonts: bool = True) -> OptimizedPdf:
+    """Rewrites the PDF smaller; never raises, returning the input unchanged on any failure."""
+    start = time.perf_counter()
+    original = bytes(pdf_bytes)
+    optimized = original
+    try:
+        doc = fitz.open(stream=original, filetype="pdf")
+        try:
+            if subset_fonts:
+                doc.subset_fonts()
+            candidate = doc.tobytes(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True,
+                                    use_objstms=1)
+        finally:
+            doc.close()
+        if len(candidate) < len(original):
+            before, after = verify_pdf(original), verify_pdf(candidate)
+            if (before.pages, before.text, before.links) == (after.pages, after.text, after.links):
+                optimized = candidate
+            else:
+                logger.warning("Optimized PDF does not read back like the original; keeping the original.")
+    except Exception as e:
+        logger.warning(f"PDF optimization failed; keeping the original: {e}")
+    result = OptimizedPdf(optimized, len(original), len(optimized), (time.perf_counter() - start) * 1000)
+    with _stats_lock:
+        _stats["documents"] += 1
+        _stats["original_bytes"] += result.original_size
+        _stats["optimized_bytes"] += result.optimized_size
+    return result
+
+
+def optimize_rendered_pdf(pdf_bytes: Optional[bytes], label: str = "PDF") -> Optional[bytes]:
+    """optimize_pdf() on a render result when PDF_OPTIMIZE is on; passes None and disabled runs through."""
+    if not pdf_bytes or not getattr(app_config, 'PDF_OPTIMIZE', True):
+        return pdf_bytes
+    result = optimize_pdf(pdf_bytes, subset_fonts=getattr(app_config, 'PDF_OPTIMIZE_SUBSET_FONTS', True))
+    logger.info(f"Optimized {label}: {result.original_size} -> {result.optimized_size} bytes "
+                f"(-{result.saved_bytes * 100 / max(1, result.original_size):.1f}%) in {result.elapsed_ms:.1f}ms")
+    return result.pdf_bytes
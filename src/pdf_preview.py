@@ -0,0 +1,81 @@
+# Resume_Tailoring/src/pdf_preview.py
+"""
+PNG thumbnails of page 1 of the generated PDFs, for the inline preview in the results view.
+
+request_preview() starts rasterizing on a background thread as soon as the PDF exists, so the
+preview overlaps the uploads and never delays the downloads; preview_png() collects it when the
+page is drawn. Thumbnails are cached by (PDF content hash, DPI), so Streamlit reruns and
+re-downloads of the same PDF never rasterize it again.
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from utils.file_utils import pdf_content_hash
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+_PREVIEW_CACHE: Dict[Tuple[str, int], "Future[Optional[bytes]]"] = {}
+_PREVIEW_CACHE_MAX_ENTRIES = 32
+_preview_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def preview_dpi() -> int:
+    """Configured PDF_PREVIEW_DPI; 0 disables previews."""
+    return max(0, int(getattr(app_config, 'PDF_PREVIEW_DPI', 80)))
+
+
+def rasterize_first_page(pdf_bytes: bytes, dpi: int) -> Optional[bytes]:
+    """PNG of page 1 at `dpi`, or None when the PDF cannot be read."""
+    try:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            if doc.page_count == 0:
+                return None
+            return doc[0].get_pixmap(dpi=dpi, alpha=False).tobytes("png")
+        finally:
+            doc.close()
+    except Exception as e:
+        logger.warning(f"Could not render PDF preview: {e}")
+        return None
+
+
+def request_preview(pdf_bytes: Optional[bytes], dpi: Optional[int] = None) -> Optional["Future[Optional[bytes]]"]:
+    """Starts (or reuses) the thumbnail for this PDF in the background. None when disabled or no PDF."""
+    global _executor
+    dpi = preview_dpi() if dpi is None else dpi
+    if not pdf_bytes or dpi <= 0:
+        return None
+    key = (pdf_content_hash(pdf_bytes), dpi)
+    with _preview_lock:
+        future = _PREVIEW_CACHE.get(key)
+        if future is not None:
+            return future
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf_preview")
+        future = _executor.submit(rasterize_first_page, bytes(pdf_bytes), dpi)
+        if len(_PREVIEW_CACHE) >= _PREVIEW_CACHE_MAX_ENTRIES:
+            _PREVIEW_CACHE.pop(next(iter(_PREVIEW_CACHE)))
+        _PREVIEW_CACHE[key] = future
+        return future
+
+
+def preview_png(pdf_bytes: Optional[bytes], dpi: Optional[int] = None, timeout: float = 10) -> Optional[bytes]:
+    """The page-1 PNG for this PDF, waiting up to `timeout` seconds for a background render."""
+    future = request_preview(pdf_bytes, dpi)
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=timeout)
+    except Exception as e:
+        logger.warning(f"PDF preview not ready: {e}")
+        return None
@@ -0,0 +1,181 @@
+# Resume_Tailoring/src/pdf_verifier.py
+"""
+Post-render checks on a finished PDF, from a single PyMuPDF open of the in-memory bytes.
+
+One pass collects the page count, how far text reaches down each page (so the fit optimizer gets
+the measured slack in points rather than a one-page yes/no), text drawn outside the page, link
+targets with the text under them, the fonts and whether they are embedded, and the extracted text.
+A one-page resume verifies in a few milliseconds.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# Fonts every PDF viewer must supply; these are fine to reference without embedding.
+_BASE14_FONTS = frozenset({
+    "Courier", "Courier-Bold", "Courier-Oblique", "Courier-BoldOblique", "Helvetica", "Helvetica-Bold",
+    "Helvetica-Oblique", "Helvetica-BoldOblique", "Times-Roman", "Times-Bold", "Times-Italic",
+    "Times-BoldItalic", "Symbol", "ZapfDingbats",
+})
+_SUBSET_PREFIX_RE = re.compile(r"^[A-Z]{6}\+")
+_CLIP_TOLERANCE_PT = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class PageExtent:
+    width: float
+    height: float
+    text_top: float     # Top of the highest text line, points from the top edge (0 on a blank page)
+    text_bottom: float  # Bottom of the lowest text line
+
+
+@dataclass(frozen=True, slots=True)
+class VerifiedLink:
+    uri: str
+    page: int
+    anchor_text: str
+    problem: Optional[str] = None  # Why the link looks broken; None when it looks fine
+
+
+@dataclass(frozen=True, slots=True)
+class PdfFont:
+    name: str       # Base font name without the subset prefix
+    font_type: str  # "Type0", "TrueType", "Type1", ...
+    embedded: bool
+
+    @property
+    def available(self) -> bool:
+        """Embedded, or a base-14 font every viewer has."""
+        return self.embedded or self.name in _BASE14_FONTS
+
+
+@dataclass(frozen=True, slots=True)
+class PdfVerification:
+    pages: Tuple[PageExtent, ...]
+    links: Tuple[VerifiedLink, ...]
+    fonts: Tuple[PdfFont, ...]
+    clipped_lines: Tuple[str, ...]  # Text lines extending past the page edges
+    text: str
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def broken_links(self) -> Tuple[VerifiedLink, ...]:
+        return tuple(link for link in self.links if link.problem)
+
+    @property
+    def missing_fonts(self) -> Tuple[PdfFont, ...]:
+        return tuple(font for font in self.fonts if not font.available)
+
+    def slack(self, margin_bottom_pt: float) -> float:
+        """
+        Points of free space above the bottom margin on a one-page PDF. On longer PDFs, minus the
+        text height that spilled onto the extra pages, which is how much has to be saved to fit.
+        """
+        if not self.pages:
+            return 0.0
+        if len(self.pages) == 1:
+            page = self.pages[0]
+            return page.height - margin_bottom_pt - page.text_bottom
+        return -sum(max(0.0, page.text_bottom - page.text_top) for page in self.pages[1:])
+
+    def problems(self) -> List[str]:
+        found = [f"{len(self.pages)} pages" if len(self.pages) != 1 else ""]
+        found += [f"clipped text: {line[:60]!r}" for line in self.clipped_lines]
+        found += [f"link {link.uri!r}: {link.problem}" for link in self.broken_links]
+        found += [f"font not embedded: {font.name}" for font in self.missing_fonts]
+        return [problem for problem in found if problem]
+
+
+def _link_problem(uri: str, anchor_text: str, rect: fitz.Rect, page_rect: fitz.Rect) -> Optional[str]:
+    if not uri or not uri.strip():
+        return "empty target"
+    parsed = urlparse(uri.strip())
+    if parsed.scheme in ("http", "https"):
+        if not parsed.netloc or "." not in parsed.netloc:
+            return "no host"
+    elif parsed.scheme == "mailto":
+        if "@" not in parsed.path:
+            return "no address"
+    elif parsed.scheme != "tel":
+        return f"unsupported scheme {parsed.scheme or '(none)'!r}"
+    if not rect.intersects(page_rect):
+        return "off page"
+    if not anchor_text:
+        return "no text under the link"
+    return None
+
+
+def _rect_contains_center(rect, bbox) -> bool:
+    cx, cy = (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+    return rect[0] <= cx <= rect[2] and rect[1] <= cy <= rect[3]
+
+
+def verify_pdf(pdf: Union[str, bytes, bytearray, memoryview]) -> PdfVerification:
+    """Verifies a PDF given as a path or bytes. Raises ValueError when it cannot be opened."""
+    try:
+        doc = fitz.open(pdf) if isinstance(pdf, str) else fitz.open(stream=bytes(pdf), filetype="pdf")
+    except Exception as e:
+        raise ValueError(f"Unreadable PDF: {e}") from e
+    pages: List[PageExtent] = []
+    links: List[VerifiedLink] = []
+    fonts: Dict[str, PdfFont] = {}
+    clipped: List[str] = []
+    text_parts: List[str] = []
+    try:
+        for page_num, page in enumerate(doc):
+            page_rect = page.rect
+            tolerant_rect = fitz.Rect(page_rect.x0 - _CLIP_TOLERANCE_PT, page_rect.y0 - _CLIP_TOLERANCE_PT,
+                                      page_rect.x1 + _CLIP_TOLERANCE_PT, page_rect.y1 + _CLIP_TOLERANCE_PT)
+            top, bottom = None, 0.0
+            spans = []  # (text, bbox) for anchor lookup
+            for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT).get("blocks", []):
+                for line in block.get("lines", []):
+                    line_text = "".join(span["text"] for span in line.get("spans", []))
+                    text_parts.append(line_text)
+                    text_parts.append("\n")
+                    if not line_text.strip():
+                        continue
+                    bbox = line["bbox"]
+                    top = bbox[1] if top is None else min(top, bbox[1])
+                    bottom = max(bottom, bbox[3])
+                    if not tolerant_rect.contains(fitz.Rect(bbox)):
+                        clipped.append(line_text.strip())
+                    spans.extend((span["text"], span["bbox"]) for span in line["spans"] if span["text"].strip())
+            pages.append(PageExtent(page_rect.width, page_rect.height, top or 0.0, bottom))
+
+            for link in page.get_links():
+                if link.get("kind") != fitz.LINK_URI:
+                    continue
+                rect = link["from"]
+                anchor = "".join(text for text, bbox in spans if _rect_contains_center(rect, bbox)).strip()
+                uri = link.get("uri") or ""
+                links.append(VerifiedLink(uri, page_num, anchor, _link_problem(uri, anchor, rect, page_rect)))
+
+            for _xref, ext, font_type, basefont, _name, _encoding, *_ in page.get_fonts():
+                name = _SUBSET_PREFIX_RE.sub("", basefont or "")
+                if name and name not in fonts:
+                    fonts[name] = PdfFont(name, font_type, ext != "n/a")
+    finally:
+        doc.close()
+    return PdfVerification(tuple(pages), tuple(links), tuple(fonts.values()), tuple(clipped), "".join(text_parts))
+
+
+def pdf_page_count(pdf: Union[str, bytes, bytearray, memoryview]) -> int:
+    """Page count alone, without extracting anything. Raises ValueError for unreadable input."""
+    try:
+        doc = fitz.open(pdf) if isinstance(pdf, str) else fitz.open(stream=bytes(pdf), filetype="pdf")
+    except Exception as e:
+        raise ValueError(f"Unreadable PDF: {e}") from e
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
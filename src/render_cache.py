@@ -0,0 +1,176 @@
+# Resume_Tailoring/src/render_cache.py
+"""
+On-disk cache of rendered resume and cover letter PDFs.
+
+A render is a pure function of the tailored content, contact and education info, the layout
+parameters and the renderer that draws it, so the PDF bytes and page count are stored under a
+SHA-256 of the canonical JSON of exactly those inputs. Re-downloads and reruns that change nothing
+in the content skip the DOCX build and conversion entirely. Entries are evicted least recently
+used first once the directory grows past RENDER_CACHE_MAX_MB; 0 disables the cache.
+"""
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .layout_params import LayoutParams
+from .pdf_verifier import pdf_page_count
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever document styling or content layout changes, so stale renders stop matching.
+RENDER_TEMPLATE_VERSION = "2025.1"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedRender:
+    pdf_bytes: bytes
+    page_count: int
+
+
+def render_cache_key(kind: str, params: LayoutParams, *content: Any) -> str:
+    """Hex SHA-256 over the document kind, template version, renderer and optimizer settings, layout and content."""
+    renderer = (getattr(app_config, 'PDF_RENDERER', 'docx'), getattr(app_config, 'PDF_RENDER_BACKEND', 'auto'),
+                getattr(app_config, 'PDF_OPTIMIZE', True), getattr(app_config, 'PDF_OPTIMIZE_SUBSET_FONTS', True))
+    payload = json.dumps([kind, RENDER_TEMPLATE_VERSION, renderer, dataclasses.asdict(params), content],
+                         sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """PDFs stored as <key>.pdf with the page count in <key>.json, bounded by total size on disk."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: Optional[Dict[str, int]] = None  # key -> bytes on disk, loaded on first use
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return f"{base}.pdf", f"{base}.json"
+
+    def _load_index(self) -> Dict[str, int]:
+        if self._sizes is None:
+            self._sizes = {}
+            os.makedirs(self.directory, exist_ok=True)
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".pdf"):
+                    self._sizes[entry.name[:-4]] = entry.stat().st_size
+            self._total_bytes = sum(self._sizes.values())
+        return self._sizes
+
+    def get(self, key: str) -> Optional[CachedRender]:
+        pdf_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                page_count = int(json.load(f)["page_count"])
+            with open(pdf_path, "rb") as f:
+                pdf_bytes = f.read()
+            os.utime(pdf_path)  # Recency for eviction
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return CachedRender(pdf_bytes, page_count)
+
+    def put(self, key: str, pdf_bytes: bytes, page_count: int) -> None:
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        pdf_path, meta_path = self._paths(key)
+        try:
+            with self._lock:
+                sizes = self._load_index()
+            for path, data in ((meta_path, json.dumps({"page_count": page_count}).encode('utf-8')),
+                               (pdf_path, pdf_bytes)):  # PDF last: get() needs both files
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            with self._lock:
+                self._total_bytes += len(pdf_bytes) - sizes.get(key, 0)
+                sizes[key] = len(pdf_bytes)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(sizes)
+        except OSError as e:
+            logger.warning(f"Could not write render cache entry {key[:12]}: {e}")
+
+    def _evict(self, sizes: Dict[str, int]) -> None:
+        def last_used(key: str) -> float:
+            try:
+                return os.stat(self._paths(key)[0]).st_mtime
+            except OSError:
+                return 0.0
+        for key in sorted(sizes, key=last_used):
+            if self._total_bytes <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes -= sizes.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            self._sizes.clear()
+            self._total_bytes = 0
+
+
+_render_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> Optional[RenderCache]:
+    """The process-wide cache, or None when RENDER_CACHE_MAX_MB is 0."""
+    global _render_cache
+    max_mb = float(getattr(app_config, 'RENDER_CACHE_MAX_MB', 256))
+    if max_mb <= 0:
+        return None
+    with _render_cache_lock:
+        if _render_cache is None:
+            directory = getattr(app_config, 'RENDER_CACHE_DIR', None) \
+                or os.path.join(tempfile.gettempdir(), "resume_render_cache")
+            _render_cache = RenderCache(directory, int(max_mb * 1024 * 1024))
+        return _render_cache
+
+
+def cached_render(key: str, render: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+    """PDF bytes for `key` from the cache, or from render() (stored on success)."""
+    cache = get_render_cache()
+    if cache is None:
+        return render()
+    hit = cache.get(key)
+    if hit is not None:
+        logger.info(f"Render cache hit {key[:12]} ({hit.page_count} page(s), {len(hit.pdf_bytes)} bytes).")
+        return hit.pdf_bytes
+    pdf_bytes = render()
+    if pdf_bytes:
+        try:
+            page_count = pdf_page_count(pdf_bytes)
+        except ValueError as e:
+            logger.warning(f"Not caching render {key[:12]}: unreadable PDF ({e}).")
+            return pdf_bytes
+        cache.put(key, pdf_bytes, page_count)
+    return pdf_bytes
@@ -0,0 +1,168 @@
+# Resume_Tailoring/src/render_coordinator.py
+"""
+Renders the resume and cover letter PDFs concurrently.
+
+Once their text is final the two documents share nothing, so each becomes one job on a small
+process-wide thread pool: choose the layout from the fit estimate, render through whichever
+backend is configured (vector, LibreOffice pool or Drive), verify the PDF (pdf_verifier) and, only
+if it overflowed, re-render at a layout re-searched with the estimate corrected by the measured
+overflow. The document stage then takes as long as the slower render instead of the sum of both. Everything stays in memory: callers get the PDF bytes
+to hand to downloads and uploads. Jobs only log; callers report to the UI themselves.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .docx_to_pdf_generator import (
+    cover_letter_pdf_basename, generate_cover_letter_pdf_bytes, generate_styled_resume_pdf_bytes, resume_pdf_basename,
+    warm_docx_templates,
+)
+from .layout_fit import (
+    FitEstimate, choose_cover_letter_layout, choose_resume_layout, estimate_cover_letter_fit, estimate_resume_fit,
+    search_layout,
+)
+from .layout_params import COVER_LETTER_DENSEST, RESUME_DENSEST, LayoutParams
+from .pdf_verifier import PdfVerification, verify_pdf
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _warm_docx_templates() -> None:
+    try:
+        warm_docx_templates()
+    except Exception as e:  # Renders build any missing base document themselves
+        logger.warning(f"Could not warm the DOCX base documents: {e}", exc_info=True)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, int(getattr(app_config, 'RENDER_MAX_WORKERS', 2)))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf_render")
+            if getattr(app_config, 'PDF_RENDERER', 'docx') != 'vector':
+                # Its own thread, so building the preset base documents never holds a render worker
+                threading.Thread(target=_warm_docx_templates, name="docx_template_warmup", daemon=True).start()
+        return _executor
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedDocument:
+    kind: str                   # "resume" or "cover_letter"
+    filename: str               # Suggested download/upload name, with the .pdf extension
+    pdf_bytes: Optional[bytes]  # None when rendering failed
+    layout: LayoutParams        # Layout the PDF was rendered with
+    estimate: FitEstimate       # Fit estimate for the layout chosen before rendering
+    rerendered: bool = False    # The first render overflowed and a denser layout was used
+    error: Optional[str] = None
+    verification: Optional[PdfVerification] = None  # Checks on the returned PDF
+
+    @property
+    def ok(self) -> bool:
+        return self.pdf_bytes is not None
+
+
+def _verify(kind: str, pdf_bytes: bytes) -> Optional[PdfVerification]:
+    try:
+        verification = verify_pdf(pdf_bytes)
+    except ValueError as e:
+        logger.warning(f"Could not verify the {kind} PDF: {e}")
+        return None
+    for problem in verification.problems():
+        logger.warning(f"{kind} PDF check: {problem}")
+    return verification
+
+
+def _render_with_fit_check(kind: str, filename: str, layout: LayoutParams, estimate: FitEstimate,
+                           densest: LayoutParams, render: Callable[[LayoutParams], Optional[bytes]],
+                           estimate_fit: Callable[[LayoutParams], FitEstimate]) -> RenderedDocument:
+    try:
+        pdf_bytes = render(layout)
+        if not pdf_bytes:
+            return RenderedDocument(kind, filename, None, layout, estimate, error="renderer returned no PDF")
+        verification = _verify(kind, pdf_bytes)
+        if layout == densest or verification is None or verification.page_count == 1:
+            return RenderedDocument(kind, filename, pdf_bytes, layout, estimate, verification=verification)
+
+        # The estimate missed by (predicted - measured) points. Hold that much back and search again
+        # from the rendered layout, so the retry is the loosest layout that should really fit.
+        shortfall = estimate.slack - verification.slack(layout.margin_bottom * 72)
+        logger.warning(f"{kind} overflowed onto {verification.page_count} pages, {shortfall:.0f}pt beyond the "
+                       f"estimate; re-rendering denser.")
+        def corrected(params: LayoutParams) -> FitEstimate:
+            fit = estimate_fit(params)
+            return replace(fit, safety=fit.safety + shortfall)
+
+        candidates = [search_layout(corrected, layout, densest)[0]]
+        if candidates[0] != densest:
+            candidates.append(densest)
+        for params in candidates:
+            dense_bytes = render(params)
+            if not dense_bytes:
+                continue
+            dense_verification = _verify(kind, dense_bytes)
+            if params == densest or dense_verification is None or dense_verification.page_count == 1:
+                return RenderedDocument(kind, filename, dense_bytes, params, estimate, rerendered=True,
+                                        verification=dense_verification)
+        logger.error(f"Denser {kind} re-render failed; keeping the first render.")
+        return RenderedDocument(kind, filename, pdf_bytes, layout, estimate, verification=verification)
+    except Exception as e:
+        logger.error(f"Error rendering {kind} PDF: {e}", exc_info=True)
+        return RenderedDocument(kind, filename, None, layout, estimate, error=str(e))
+
+
+def _render_resume(tailored_data: Dict[str, Any], contact_info: Dict[str, str], education_info: List[Dict[str, str]],
+                   base_filename: str) -> RenderedDocument:
+    layout, estimate = choose_resume_layout(tailored_data, contact_info, education_info)
+    logger.info(f"Resume fit estimate: {estimate.pages} page(s), slack {estimate.slack:.0f}pt, font {layout.font_size}pt")
+    return _render_with_fit_check(
+        "resume", f"{base_filename}.pdf", layout, estimate, RESUME_DENSEST,
+        lambda params: generate_styled_resume_pdf_bytes(tailored_data, contact_info, education_info,
+                                                        base_filename, layout=params),
+        lambda params: estimate_resume_fit(tailored_data, contact_info, education_info, params))
+
+
+def _render_cover_letter(cover_letter_text: str, contact_info: Dict[str, str], base_filename: str) -> RenderedDocument:
+    layout, estimate = choose_cover_letter_layout(cover_letter_text, contact_info)
+    return _render_with_fit_check(
+        "cover_letter", f"{base_filename}.pdf", layout, estimate, COVER_LETTER_DENSEST,
+        lambda params: generate_cover_letter_pdf_bytes(cover_letter_text, contact_info, base_filename, layout=params),
+        lambda params: estimate_cover_letter_fit(cover_letter_text, contact_info, params))
+
+
+def render_application_pdfs(
+    tailored_data: Dict[str, Any],
+    contact_info: Dict[str, str],
+    education_info: List[Dict[str, str]],
+    cover_letter_text: Optional[str],
+    target_company_name: Optional[str] = None,
+    years_of_experience: Optional[int] = None,
+    resume_keyword: str = "TailoredResume",
+    cover_letter_keyword: str = "CoverLetter",
+) -> Tuple[RenderedDocument, Optional[RenderedDocument]]:
+    """
+    Renders the resume and (if there is text) the cover letter at the same time, each with its own
+    one-page check. Returns (resume, cover_letter); cover_letter is None when there was no text.
+    """
+    executor = _get_executor()
+    resume_future = executor.submit(
+        _render_resume, tailored_data, contact_info, education_info,
+        resume_pdf_basename(contact_info, target_company_name, years_of_experience, resume_keyword),
+    )
+    cover_letter_future = None
+    if cover_letter_text:
+        cover_letter_future = executor.submit(
+            _render_cover_letter, cover_letter_text, contact_info,
+            cover_letter_pdf_basename(contact_info, target_company_name or "Company", cover_letter_keyword),
+        )
+    return resume_future.result(), cover_letter_future.result() if cover_letter_future else None
@@ -0,0 +1,234 @@
+# Resume_Tailoring/src/resume_model.py
+"""
+Typed model of the LLM-tailored resume sections.
+
+The tailoring agent returns work experience, skills and projects as markdown-ish text. This
+module parses that text once into small immutable dataclasses; the DOCX renderer, the HTML
+template preprocessing and the cover letter agent all consume the same parsed entries.
+"""
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MONTH = (r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|'
+          r'Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?')
+_DATE = rf'(?:{_MONTH}\s+)?\d{{4}}'
+_DATE_RANGE = rf'{_DATE}\s*(?:[–—\-]|to)\s*(?:{_DATE}|Present|Current|Now)'
+
+_DATE_LINE_RE = re.compile(rf'^[*_\s]*({_DATE_RANGE})[*_\s]*$', re.IGNORECASE)
+_TRAILING_DATE_RE = re.compile(rf'^(.*?)[\s,|]*\b({_DATE_RANGE})[*_\s]*$', re.IGNORECASE)
+_BULLET_RE = re.compile(r'^(?:[-•●]|\*(?!\*))\s*')
+_SECTION_HEADING_RE = re.compile(
+    r'^\s*#{1,3}\s*(?:rewritten\s+|tailored\s+)?(?:work\s+|professional\s+)?'
+    r'(?:experience|technical\s+skills|skills|projects?)(?:\s+section)?\s*:?\s*\n+',
+    re.IGNORECASE,
+)
+_SKILL_LINE_RE = re.compile(r'^\*{0,2}\s*(.+?)\s*\*{0,2}\s*:\s*\*{0,2}\s*(.+?)\s*$')
+
+
+def _strip_markup(text: str) -> str:
+    """Drop heading hashes and bold/italic markers around a header field."""
+    return re.sub(r'^#+\s*', '', text).replace('**', '').strip(' _*\t')
+
+
+@dataclass(frozen=True, slots=True)
+class ExperienceEntry:
+    title: str
+    company: Optional[str]
+    location: Optional[str]
+    dates: Optional[str]
+    bullets: Tuple[str, ...]  # Bullet text with the marker removed; inline **bold** is kept
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectEntry:
+    title: str
+    tagline: Optional[str]
+    bullets: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SkillCategory:
+    name: Optional[str]  # None for a line without a "Category:" prefix
+    skills: str
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedResume:
+    summary: str
+    work_experience: Tuple[ExperienceEntry, ...]
+    technical_skills: Tuple[SkillCategory, ...]
+    projects: Tuple[ProjectEntry, ...]
+
+
+def _entries(text: str):
+    """
+    Yields (header_line, detail_lines) blocks. A non-bullet line that is not a bare date range
+    starts a new entry, so entries are found whether or not the LLM left blank lines between them.
+    """
+    text = _SECTION_HEADING_RE.sub('', text.strip(), count=1)
+    header, details = None, []
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+        if _BULLET_RE.match(line) or _DATE_LINE_RE.match(line):
+            if header is None:
+                logger.warning(f"Dropping line found before the first entry header: '{line[:80]}'")
+            else:
+                details.append(line)
+            continue
+        if header is not None:
+            yield header, details
+        header, details = line, []
+    if header is not None:
+        yield header, details
+
+
+def _split_details(details) -> Tuple[Optional[str], Tuple[str, ...]]:
+    dates, bullets = None, []
+    for line in details:
+        date_match = _DATE_LINE_RE.match(line)
+        if date_match:
+            dates = dates or date_match.group(1).strip()
+        else:
+            bullets.append(_BULLET_RE.sub('', line, count=1).strip())
+    return dates, tuple(b for b in bullets if b)
+
+
+def _parse_work_experience(text: str) -> Tuple[ExperienceEntry, ...]:
+    jobs = []
+    for header, details in _entries(text):
+        parts = [_strip_markup(p) for p in header.split('|')]
+        title = parts[0]
+        company = parts[1] if len(parts) > 1 and parts[1] else None
+        location = parts[2] if len(parts) > 2 and parts[2] else None
+        dates, bullets = _split_details(details)
+        if len(parts) > 3 and not dates:
+            dates = parts[3] or None
+        if location and not dates:
+            trailing = _TRAILING_DATE_RE.match(location)
+            if trailing:
+                location, dates = trailing.group(1).strip() or None, trailing.group(2).strip()
+        if not title:
+            logger.warning(f"Skipping work experience entry without a title: '{header[:80]}'")
+            continue
+        jobs.append(ExperienceEntry(title, company, location, dates, bullets))
+    logger.info(f"Parsed {len(jobs)} work experience entries from LLM output.")
+    return tuple(jobs)
+
+
+def _parse_projects(text: str) -> Tuple[ProjectEntry, ...]:
+    projects = []
+    for header, details in _entries(text):
+        title_part, _, tagline_part = header.partition('|')
+        title = _strip_markup(title_part)
+        if not title:
+            continue
+        _, bullets = _split_details(details)
+        projects.append(ProjectEntry(title, _strip_markup(tagline_part) or None, bullets))
+    logger.info(f"Parsed {len(projects)} project entries from LLM output.")
+    return tuple(projects)
+
+
+def _parse_technical_skills(text: str) -> Tuple[SkillCategory, ...]:
+    categories = []
+    for raw_line in _SECTION_HEADING_RE.sub('', text.strip(), count=1).split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+        match = _SKILL_LINE_RE.match(line)
+        if match:
+            categories.append(SkillCategory(match.group(1), match.group(2)))
+        else:
+            categories.append(SkillCategory(None, _BULLET_RE.sub('', line, count=1)))
+    logger.info(f"Parsed {len(categories)} technical skill categories from LLM output.")
+    return tuple(categories)
+
+
+def resolve_project_link(project_title: str, project_links: Optional[Mapping[str, str]],
+                         contact_data: Mapping[str, str], source_resume_filename: Optional[str] = None) -> Optional[str]:
+    """
+    URL for a project title: links extracted from the source resume first, then conservative
+    fallbacks that only apply to the owner's own resume (filename contains their name).
+    """
+    project_url = (project_links or {}).get(project_title)
+    if project_url:
+        return project_url
+    lower_name = (source_resume_filename or "").lower()
+    if not (("shanmugam" in lower_name) or ("venkatesh" in lower_name)):
+        return None
+    github_base_url = (contact_data.get("github_url") or "https://github.com/DefaultUser").rstrip('/')
+    if project_title == "AI-Text Discriminator":
+        return f"{github_base_url}/AI-Content-Filter"
+    if project_title == "Agentic Graph RAG for Building Codes":
+        return "https://vabuildingcode.netlify.app/"
+    return None
+
+
+# Parsed sections keyed by (section kind, sha256 of the text). The DOCX renderer runs more than once
+# per tailored resume (normal and compact), and the cover letter reuses the projects text.
+_PARSE_CACHE: Dict[Tuple[str, str], Tuple[Any, ...]] = {}
+_PARSE_CACHE_MAX_ENTRIES = 256
+
+
+def _cached_parse(kind: str, text: Optional[str], parser: Callable[[str], Tuple[Any, ...]]) -> Tuple[Any, ...]:
+    if not text or not text.strip():
+        return ()
+    key = (kind, hashlib.sha256(text.encode('utf-8')).hexdigest())
+    cached = _PARSE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    parsed = parser(text)
+    if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX_ENTRIES:
+        _PARSE_CACHE.pop(next(iter(_PARSE_CACHE), None), None)  # Tolerates a concurrent eviction
+    _PARSE_CACHE[key] = parsed
+    return parsed
+
+
+def parse_work_experience(text: Optional[str]) -> Tuple[ExperienceEntry, ...]:
+    return _cached_parse('work_experience', text, _parse_work_experience)
+
+
+def parse_projects(text: Optional[str]) -> Tuple[ProjectEntry, ...]:
+    return _cached_parse('projects', text, _parse_projects)
+
+
+def parse_technical_skills(text: Optional[str]) -> Tuple[SkillCategory, ...]:
+    return _cached_parse('technical_skills', text, _parse_technical_skills)
+
+
+def parse_tailored_resume(tailored_data: Mapping[str, Any]) -> ParsedResume:
+    """Parses the string sections of a tailored resume dict (as produced by TailoringAgent)."""
+    return ParsedResume(
+        summary=(tailored_data.get("summary") or "").strip(),
+        work_experience=parse_work_experience(tailored_data.get("work_experience")),
+        technical_skills=parse_technical_skills(tailored_data.get("technical_skills")),
+        projects=parse_projects(tailored_data.get("projects")),
+    )
+
+
+def format_work_experience(entries) -> str:
+    """Inverse of parse_work_experience: one "**title** | company | location | dates" header per job."""
+    blocks = []
+    for job in entries:
+        parts = [f"**{job.title}**", job.company or "", job.location or ""]
+        if job.dates:
+            parts.append(job.dates)
+        while len(parts) > 1 and not parts[-1]:
+            parts.pop()
+        blocks.append("\n".join([" | ".join(parts)] + [f"* {bullet}" for bullet in job.bullets]))
+    return "\n\n".join(blocks)
+
+
+def format_projects(entries) -> str:
+    """Inverse of parse_projects."""
+    blocks = []
+    for project in entries:
+        header = f"**{project.title}**" + (f" | {project.tagline}" if project.tagline else "")
+        blocks.append("\n".join([header] + [f"* {bullet}" for bullet in project.bullets]))
+    return "\n\n".join(blocks)
@@ -0,0 +1,103 @@
+# Resume_Tailoring/src/text_markup.py
+"""Inline markup shared by the DOCX and vector renderers: **bold** spans and ATS keyword bolding."""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    """
+    Regex matching any of `words`, shaped as a trie so each position costs one keyword length rather
+    than one attempt per keyword. Optional tails are greedy, so the longest keyword is tried first.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}  # End-of-keyword marker
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordHighlighter:
+    """
+    Bolds ATS keywords and existing **bold** markup in one left-to-right pass. The keyword set is
+    compiled once (see get_keyword_highlighter) into a single case-insensitive trie regex; matches
+    are the longest keyword at each position, never overlap, and need a loose word boundary on both
+    sides so C++, ML/DL and CI/CD still match.
+    """
+    __slots__ = ("keywords", "_pattern")
+
+    def __init__(self, keywords: Iterable[str]):
+        unique: Dict[str, str] = {}
+        for keyword in keywords:
+            keyword = (keyword or '').strip()
+            if keyword:
+                unique.setdefault(keyword.lower(), keyword)
+        self.keywords: Tuple[str, ...] = tuple(unique.values())
+        alternatives = [r'\*\*(?P<bold>[^*]+)\*\*']
+        if unique:
+            alternatives.append(rf'(?<![A-Za-z0-9*])(?P<keyword>{_trie_pattern(list(unique))})(?![A-Za-z0-9*])')
+        self._pattern = re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def spans(self, text: str, base_bold: bool = False) -> List[Tuple[str, bool]]:
+        """(text, bold) run segments; stray ** markers outside bold spans are dropped."""
+        spans = []
+        position = 0
+        for match in self._pattern.finditer(text or ''):
+            if match.start() > position:
+                spans.append((text[position:match.start()].replace('**', ''), base_bold))
+            spans.append((match.group('bold') or match.group('keyword'), True))
+            position = match.end()
+        if text and position < len(text):
+            spans.append((text[position:].replace('**', ''), base_bold))
+        return [span for span in spans if span[0]]
+
+    def markdown(self, text: str) -> str:
+        """The text with every keyword and bold span wrapped in **."""
+        return ''.join(f'**{span}**' if bold else span for span, bold in self.spans(text))
+
+
+@lru_cache(maxsize=64)
+def _cached_highlighter(keywords: Tuple[str, ...]) -> KeywordHighlighter:
+    return KeywordHighlighter(keywords)
+
+
+def get_keyword_highlighter(ats_keywords: Optional[Iterable[str]]) -> KeywordHighlighter:
+    """The compiled highlighter for a JD's keyword list, shared by every paragraph and render."""
+    return _cached_highlighter(tuple(ats_keywords or ()))
+
+
+def keyword_bold_spans(text: str, ats_keywords: Optional[Iterable[str]], base_bold: bool = False) -> List[Tuple[str, bool]]:
+    """(text, bold) runs with **bold** markup and ATS keywords bolded, in a single pass."""
+    return get_keyword_highlighter(ats_keywords).spans(text, base_bold)
+
+
+def apply_keyword_bolding(text: str, ats_keywords: Optional[List[str]]) -> str:
+    """Wrap ATS keywords in ** for programmatic bolding. Case-insensitive, avoids double-wrapping."""
+    if not text or not ats_keywords:
+        return text
+    return get_keyword_highlighter(ats_keywords).markdown(text)
+
+
+def markdown_bold_spans(text_with_markdown: str, base_bold: bool = False) -> List[Tuple[str, bool]]:
+    """(text, bold) spans for a string with **bold** markers; stray asterisks are dropped."""
+    return keyword_bold_spans(text_with_markdown, None, base_bold)
+
+
+def cover_letter_paragraphs(cover_letter_body_text: str, candidate_name: str) -> List[str]:
+    """Body paragraphs with the LLM's own "Sincerely, <name>" closing removed; the renderers add their own."""
+    closing_pattern = re.compile(rf"(?i)\bSincerely,?\s*(\n\s*)*{re.escape(candidate_name)}\s*$", re.MULTILINE)
+    main_body_text = closing_pattern.sub("", cover_letter_body_text or "").strip()
+    if not main_body_text:
+        return []
+    paragraphs = (segment.replace('\n', ' ').strip() for segment in re.split(r'\n{2,}', main_body_text))
+    return [paragraph for paragraph in paragraphs if paragraph]
@@ -0,0 +1,318 @@
+# Resume_Tailoring/src/vector_pdf_renderer.py
+"""
+Direct-to-PDF renderer for the resume and cover letter (reportlab, base-14 Times faces).
+
+Reproduces the DOCX layout of generate_styled_resume_pdf / generate_cover_letter_pdf: centered
+contact block, ruled section headers, justified text, hanging-indent bullets, right-aligned date
+tab stops, blue underlined hyperlinks and **bold** ATS keywords. Layout and drawing are separate
+steps: layout_resume()/layout_cover_letter() only measure with the cached width tables in
+src.font_metrics, so the same pass serves as a page-fit estimate without touching a canvas.
+"""
+import io
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from reportlab.lib.colors import HexColor, black
+from reportlab.pdfgen import canvas as pdf_canvas
+
+from .font_metrics import (
+    ASCENT_EM, TextSegment, font_name, line_content_width, line_height, split_words, text_width, wrap_words,
+)
+from .layout_params import LayoutParams, cover_letter_preset, resume_preset
+from .resume_model import parse_tailored_resume, resolve_project_link
+from .text_markup import cover_letter_paragraphs, keyword_bold_spans
+
+logger = logging.getLogger(__name__)
+
+LINK_COLOR = "0563C1"
+RULE_COLOR = "444444"
+BULLET_GLYPH = "•"
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+
+class PageLayout:
+    """
+    Lays paragraphs out top-down and records draw operations per page. Coordinates are points
+    from the top-left of the page; draw() flips them for PDF space.
+    """
+
+    def __init__(self, params: LayoutParams):
+        self.params = params
+        self.page_height = params.page_height * 72
+        self.left = params.margin_left * 72
+        self.width = params.text_width_pt
+        self.top = params.margin_top * 72
+        self.bottom = self.page_height - params.margin_bottom * 72
+        self.pages: List[List[Tuple[Any, ...]]] = [[]]
+        self.y = self.top
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def used_height(self) -> float:
+        """Total content height in points, counting full usable height for every page but the last."""
+        return (self.page_count - 1) * (self.bottom - self.top) + (self.y - self.top)
+
+    @property
+    def remaining_height(self) -> float:
+        """Free space left on the last page (negative never happens; overflow starts a new page)."""
+        return self.bottom - self.y
+
+    def _new_page(self) -> None:
+        self.pages.append([])
+        self.y = self.top
+
+    def paragraph(self, segments: Sequence[TextSegment], *, align: str = "left",
+                  space_before: float = 0.0, space_after: float = 0.0,
+                  line_spacing: Optional[float] = None, indent: float = 0.0,
+                  bullet: bool = False, right: Optional[TextSegment] = None,
+                  rule_below: bool = False) -> None:
+        params = self.params
+        spacing = params.line_spacing if line_spacing is None else line_spacing
+        size = max((seg.size for seg in segments), default=params.font_size)
+        if right is not None:
+            size = max(size, right.size)
+        lh = line_height(size, spacing)
+        self.y += space_before
+
+        full_width = self.width - indent
+        first_width = full_width
+        right_x = None
+        if right is not None:
+            right_x = self.left + min(params.date_tab_stop * 72, self.width)
+            first_width = min(full_width, right_x - self.left - indent - text_width(right.text, right.font, right.size) - 6)
+        lines = wrap_words(split_words(list(segments)), first_width, full_width) or [[]]
+
+        for i, line in enumerate(lines):
+            if self.y + lh > self.bottom and self.y > self.top:
+                self._new_page()
+            ops = self.pages[-1]
+            baseline = self.y + size * ASCENT_EM
+            available = first_width if i == 0 else full_width
+            content = line_content_width(line) if line else 0.0
+            x = self.left + indent
+            extra = 0.0
+            if align == "center":
+                x = self.left + (self.width - content) / 2
+            elif align == "justify" and i < len(lines) - 1 and len(line) > 1:
+                extra = (available - content) / (len(line) - 1)
+            if i == 0 and bullet:
+                ops.append(("text", self.left, baseline, TextSegment(BULLET_GLYPH, font_name(), size), BULLET_GLYPH))
+            if i == 0 and right is not None:
+                ops.append(("text", right_x - text_width(right.text, right.font, right.size), baseline, right, right.text))
+            for word in line:
+                for seg, piece, piece_width in word.pieces:
+                    ops.append(("text", x, baseline, seg, piece))
+                    if seg.url:
+                        ops.append(("link", x, baseline, piece_width, seg))
+                    x += piece_width
+                x += word.space_width + extra
+            self.y += lh
+
+        if rule_below:
+            self.y += 1
+            self.pages[-1].append(("rule", self.left, self.y, self.left + self.width))
+            self.y += 0.5
+        self.y += space_after
+
+    def draw(self) -> bytes:
+        buffer = io.BytesIO()
+        page_width = self.params.page_width * 72
+        c = pdf_canvas.Canvas(buffer, pagesize=(page_width, self.page_height), pageCompression=1)
+        for page_ops in self.pages:
+            for op in page_ops:
+                kind = op[0]
+                if kind == "text":
+                    _, x, baseline, seg, text = op
+                    c.setFillColor(HexColor("#" + seg.color) if seg.color else black)
+                    c.setFont(seg.font, seg.size)
+                    c.drawString(x, self.page_height - baseline, text)
+                elif kind == "link":
+                    _, x, baseline, width, seg = op
+                    y_pdf = self.page_height - baseline
+                    c.setStrokeColor(HexColor("#" + (seg.color or LINK_COLOR)))
+                    c.setLineWidth(0.5)
+                    c.line(x, y_pdf - 1.2, x + width, y_pdf - 1.2)
+                    c.linkURL(seg.url, (x, y_pdf - 0.25 * seg.size, x + width, y_pdf + 0.8 * seg.size),
+                              relative=0, thickness=0)
+                elif kind == "rule":
+                    _, x1, y, x2 = op
+                    c.setStrokeColor(HexColor("#" + RULE_COLOR))
+                    c.setLineWidth(0.5)
+                    c.line(x1, self.page_height - y, x2, self.page_height - y)
+            c.showPage()
+        c.save()
+        return buffer.getvalue()
+
+
+def _spans(text: str, size: float, base_bold: bool = False, italic: bool = False,
+           ats_keywords: Optional[Sequence[str]] = None) -> List[TextSegment]:
+    return [TextSegment(t, font_name(bold, italic), size) for t, bold in keyword_bold_spans(text, ats_keywords, base_bold)]
+
+
+def _link(text: str, url: str, size: float, bold: bool = False) -> TextSegment:
+    return TextSegment(text, font_name(bold), size, url=url, color=LINK_COLOR)
+
+
+def _section_header(layout: PageLayout, title: str) -> None:
+    p = layout.params
+    layout.paragraph([TextSegment(title.upper(), font_name(True), p.font_size)],
+                     space_before=p.section_space_before, space_after=p.section_space_after, rule_below=True)
+
+
+def _bullets(layout: PageLayout, bullets: Sequence[str], ats_keywords: Optional[List[str]]) -> None:
+    p = layout.params
+    for index, bullet in enumerate(bullets):
+        last = index == len(bullets) - 1
+        layout.paragraph(_spans(bullet, p.font_size, ats_keywords=ats_keywords), align="justify",
+                         indent=p.bullet_indent * 72, bullet=True,
+                         space_after=p.entry_space_after if last else p.paragraph_space_after)
+
+
+def bullet_height(bullet: str, ats_keywords: Optional[List[str]], params: LayoutParams) -> float:
+    """
+    Points one bullet adds to the resume under `params`: its wrapped lines plus the paragraph gap.
+    Dropping a bullet that is not an entry's only one frees exactly this much.
+    """
+    segments = _spans(bullet, params.font_size, ats_keywords=ats_keywords)
+    width = params.text_width_pt - params.bullet_indent * 72
+    lines = wrap_words(split_words(segments), width) or [[]]
+    return len(lines) * line_height(params.font_size, params.line_spacing) + params.paragraph_space_after
+
+
+def _contact_block(layout: PageLayout, contact: Dict[str, str]) -> None:
+    p = layout.params
+    size = p.font_size
+    layout.paragraph([TextSegment(contact.get("name", "Candidate Name"), font_name(True), p.name_font_size)],
+                     align="center", space_after=3)
+
+    line1 = contact.get("line1_info", "")
+    email_match = _EMAIL_RE.search(line1)
+    if email_match:
+        email = email_match.group(0)
+        before, after = line1.split(email, 1)
+        segments = [TextSegment(before, font_name(), size), _link(email, f"mailto:{email}", size),
+                    TextSegment(after, font_name(), size)]
+    else:
+        segments = [TextSegment(line1, font_name(), size)]
+    layout.paragraph([s for s in segments if s.text], align="center", space_after=1)
+
+    links = []
+    for url_key, text_key, default_text in (("linkedin_url", "linkedin_text", "linkedin.com"),
+                                            ("github_url", "github_text", "GitHub"),
+                                            ("portfolio_url", "portfolio_text", "Portfolio")):
+        if links:
+            links.append(TextSegment(" | ", font_name(), size))
+        links.append(_link(contact.get(text_key, default_text), contact.get(url_key, "#"), size))
+    layout.paragraph(links, align="center", space_after=p.contact_space_after)
+
+
+def layout_resume(tailored_data: Dict[str, Any], contact_info: Dict[str, str],
+                  education_info: List[Dict[str, str]], params: Optional[LayoutParams] = None) -> PageLayout:
+    """Lays the resume out without drawing; see PageLayout.page_count / used_height."""
+    params = params or resume_preset()
+    layout = PageLayout(params)
+    size = params.font_size
+    ats_keywords = tailored_data.get("ats_keywords")
+    parsed = parse_tailored_resume(tailored_data)
+
+    _contact_block(layout, contact_info)
+
+    if parsed.summary:
+        _section_header(layout, "SUMMARY")
+        layout.paragraph(_spans(parsed.summary, size, ats_keywords=ats_keywords), align="justify",
+                         space_after=params.entry_space_after)
+
+    if parsed.technical_skills:
+        _section_header(layout, "TECHNICAL SKILLS")
+        for category in parsed.technical_skills:
+            segments = [TextSegment(category.name + ": ", font_name(True), size)] if category.name else []
+            segments += _spans(category.skills, size, ats_keywords=ats_keywords)
+            layout.paragraph(segments, align="justify", space_after=params.paragraph_space_after)
+
+    if parsed.work_experience:
+        _section_header(layout, "WORK EXPERIENCE")
+        for job in parsed.work_experience:
+            header = " | ".join(part for part in (job.title, job.company, job.location) if part)
+            dates = TextSegment(job.dates, font_name(italic=True), size) if job.dates else None
+            layout.paragraph(_spans(header, size, base_bold=True), right=dates,
+                             space_after=params.paragraph_space_after)
+            _bullets(layout, job.bullets, ats_keywords)
+
+    _section_header(layout, "EDUCATION")
+    for edu_item in education_info or []:
+        segments = _spans(edu_item.get('degree_line', 'Degree N/A'), size, base_bold=True)
+        segments.append(TextSegment(", ", font_name(), size))
+        segments += _spans(edu_item.get('university_line', 'University N/A'), size)
+        dates = TextSegment(edu_item.get("dates_line", "Dates N/A"), font_name(italic=True), size)
+        layout.paragraph(segments, right=dates, space_after=params.entry_space_after)
+
+    if parsed.projects:
+        _section_header(layout, "PROJECTS")
+        for project in parsed.projects:
+            url = resolve_project_link(project.title, tailored_data.get("project_links"), contact_info,
+                                       tailored_data.get("source_resume_filename"))
+            title = _link(project.title, url, size, bold=True) if url else TextSegment(project.title, font_name(True), size)
+            layout.paragraph([title], space_after=params.paragraph_space_after)
+            _bullets(layout, project.bullets, ats_keywords)
+    return layout
+
+
+def layout_cover_letter(cover_letter_body_text: str, contact_info: Dict[str, str],
+                        params: Optional[LayoutParams] = None) -> PageLayout:
+    params = params or cover_letter_preset()
+    layout = PageLayout(params)
+    size = params.font_size
+    regular = font_name()
+
+    if contact_info.get("name"):
+        layout.paragraph([TextSegment(contact_info["name"], font_name(True), params.name_font_size)], space_after=1)
+    for key in ("city_state_zip", "phone"):
+        if contact_info.get(key):
+            layout.paragraph([TextSegment(contact_info[key], regular, size)], space_after=1)
+    if contact_info.get("email"):
+        layout.paragraph([_link(contact_info["email"], f"mailto:{contact_info['email']}", size)], space_after=1)
+    if contact_info.get("linkedin_url") and contact_info.get("linkedin_text"):
+        layout.paragraph([_link(contact_info["linkedin_text"], contact_info["linkedin_url"], size)],
+                         space_after=params.contact_space_after)
+    else:
+        layout.paragraph([], space_after=params.contact_space_after)
+
+    candidate_name = contact_info.get('name', 'Venkatesh Shanmugam')
+    paragraphs = cover_letter_paragraphs(cover_letter_body_text, candidate_name)
+    if not paragraphs:
+        paragraphs = ["[Cover letter body content was not generated or was stripped with the signature.]"]
+    for paragraph_text in paragraphs:
+        layout.paragraph(_spans(paragraph_text, size), align="justify", space_after=params.paragraph_space_after)
+
+    layout.paragraph([TextSegment("Sincerely,", regular, size)], space_before=12)
+    layout.paragraph([])
+    layout.paragraph([TextSegment(candidate_name, regular, size)], space_before=2)
+    if contact_info.get("phone"):
+        layout.paragraph([TextSegment(contact_info["phone"], regular, size)], space_before=2)
+    if contact_info.get("email"):
+        layout.paragraph([_link(contact_info["email"], f"mailto:{contact_info['email']}", size)], space_before=2)
+    space_before_profile_links = 2 if (contact_info.get("phone") or contact_info.get("email")) else 6
+    for url_key, text_key in (("github_url", "github_text"), ("portfolio_url", "portfolio_text")):
+        if contact_info.get(url_key) and contact_info.get(text_key):
+            layout.paragraph([_link(contact_info[text_key], contact_info[url_key], size)],
+                             space_before=space_before_profile_links)
+            space_before_profile_links = 2
+    return layout
+
+
+def render_resume_pdf_bytes(tailored_data: Dict[str, Any], contact_info: Dict[str, str],
+                            education_info: List[Dict[str, str]], params: Optional[LayoutParams] = None,
+                            compact: bool = False) -> bytes:
+    layout = layout_resume(tailored_data, contact_info, education_info, params or resume_preset(compact))
+    if layout.page_count > 1:
+        logger.warning(f"Vector resume layout spans {layout.page_count} pages.")
+    return layout.draw()
+
+
+def render_cover_letter_pdf_bytes(cover_letter_body_text: str, contact_info: Dict[str, str],
+                                  params: Optional[LayoutParams] = None, compact: bool = False) -> bytes:
+    return layout_cover_letter(cover_letter_body_text, contact_info, params or cover_letter_preset(compact)).draw()
@@ -1,12 +1,12 @@
 import streamlit as st
 import os
 import json
-import re
 from typing import Dict, Optional
 import tempfile
 import base64
 from pathlib import Path
 import sys # For debugging prints
+import time
 from datetime import datetime
 
 # --- Initial Imports and Configuration Setup ---
@@ -62,9 +62,13 @@ if CONFIG_MODE != 'error':
         from agents.tailoring import TailoringAgent # CORRECTED from ResumeTailoringAgent
         from agents.cover_letter_agent import CoverLetterAgent
         from src.pdf_generator import generate_pdf_from_json_xhtml2pdf # CORRECTED: Import function
-        from src.docx_to_pdf_generator import generate_styled_resume_pdf, generate_pdf_via_google_drive, generate_cover_letter_pdf as generate_styled_cover_letter_pdf # Import actual functions including sophisticated cover letter function
+        from src.content_budget import fit_resume_content
+        from src.render_coordinator import render_application_pdfs
+        from src.pdf_preview import preview_dpi, preview_png, request_preview
         from utils.llm_gemini import GeminiClient, LLMRouter
-        from utils.gcs_utils import get_gcs_client, upload_file_to_gcs # CORRECTED: Import functions
+        from utils.storage import get_storage_backend
+        from utils.artifact_publisher import publisher_status
+        from utils.artifact_store import get_artifact_index, make_application_id, record_application
         from models import ResumeSections, JobDescription # CORRECTED: Removed Resume
         print("Successfully imported other project modules (agents, src, utils, models).")
     except ImportError as e:
@@ -192,51 +196,12 @@ def load_master_profile():
     except Exception as e:
         return None
 
-def extract_job_keywords(job_description_text: str, max_words: int = 2) -> str:
-    """Extract meaningful keywords from job description for naming"""
-    if not job_description_text:
-        return "UnknownPosition"
-    
-    # Common words to skip
-    stop_words = {
-        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an',
-        'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-        'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
-        'we', 'you', 'they', 'our', 'your', 'their', 'job', 'position', 'role', 'opportunity', 'candidate',
-        'experience', 'work', 'company', 'team', 'looking', 'seeking', 'hiring', 'join', 'responsibilities'
-    }
-    
-    # Take first few lines which usually contain the job title
-    first_lines = job_description_text.split('\n')[:3]
-    text_to_analyze = ' '.join(first_lines)
-    
-    # Split into words and clean
-    words = []
-    for word in text_to_analyze.split():
-        clean_word = ''.join(c for c in word if c.isalnum())
-        if (len(clean_word) > 2 and 
-            clean_word.lower() not in stop_words and
-            not clean_word.isdigit()):
-            words.append(clean_word.title())
-        
-        if len(words) >= max_words:
-            break
-    
-    return ''.join(words) if words else "Position"
-
-def generate_gcs_folder_name(job_description_text: str, uploaded_resume_name: str, candidate_name: str = None) -> str:
-    """Generate a unique folder name for GCS storage using Option B (Resume-Based Naming)"""
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    
+def generate_gcs_folder_name(job_description: Optional[JobDescription], uploaded_resume_name: str, candidate_name: str = None) -> str:
+    """Generate a unique folder name for GCS storage using Option B (Resume-Based Naming).
+    The company suffix comes from the structured fields JDAnalysisAgent already extracted."""
     # Use provided candidate name or extract from resume filename
-    if candidate_name:
-        folder_candidate_name = ''.join(c for c in candidate_name if c.isalnum() or c in '-_')
-    else:
-        # Extract from resume filename
-        resume_base = Path(uploaded_resume_name).stem
-        folder_candidate_name = ''.join(c for c in resume_base if c.isalnum() or c in '-_')[:20]
-    
-    return f"{timestamp}_{folder_candidate_name}"
+    folder_candidate_name = candidate_name or Path(uploaded_resume_name).stem[:20]
+    return make_application_id(folder_candidate_name, job_description.company_name if job_description else None)
 
 def get_default_filename_base() -> str:
     """Get default filename base from config"""
@@ -318,9 +283,12 @@ def run_tailoring_process(job_description_text: str, resume_input, professional_
                 return None, None, None, None
 
             # --- Agent Processing ---
+            stage_timings: Dict[str, float] = {}  # Seconds per stage, recorded in the application manifest
+            stage_start = time.perf_counter()
             st.info("Analyzing Job Description...")
             jd_analyzer = JDAnalysisAgent(None)
             jd_analysis_result = jd_analyzer.run(jd_txt_path=temp_jd_path) 
+            stage_timings["jd_analysis"], stage_start = time.perf_counter() - stage_start, time.perf_counter()
             if not isinstance(jd_analysis_result, JobDescription) or not jd_analysis_result.job_title: 
                 st.error(f"Failed to analyze job description or got unexpected result type: {type(jd_analysis_result)}")
                 return None, None, None, None
@@ -329,6 +297,7 @@ def run_tailoring_process(job_description_text: str, resume_input, professional_
             st.info("Parsing Uploaded Resume...")
             resume_parser = ResumeParserAgent() 
             parsed_uploaded_resume_sections = resume_parser.run(resume_pdf_path=temp_resume_path) 
+            stage_timings["resume_parse"], stage_start = time.perf_counter() - stage_start, time.perf_counter()
             if not isinstance(parsed_uploaded_resume_sections, ResumeSections) or not any(vars(parsed_uploaded_resume_sections).values()): 
                 st.error(f"Failed to parse uploaded resume or got empty sections. Result type: {type(parsed_uploaded_resume_sections)}")
                 return None, None, None, None
@@ -345,6 +314,7 @@ def run_tailoring_process(job_description_text: str, resume_input, professional_
                 st.error("Failed to tailor resume or got unexpected result type.")
                 return None, None, None, None
             st.success("Resume Tailored.")
+            stage_timings["tailoring"], stage_start = time.perf_counter() - stage_start, time.perf_counter()
 
             tailored_resume_json_data = tailored_resume_sections.dict()
             # Attach ATS keywords to pass into DOCX generator for programmatic bolding
@@ -356,31 +326,35 @@ def run_tailoring_process(job_description_text: str, resume_input, professional_
             # Attach project links from the original resume if any, and the source resume filename
             try:
                 from utils import file_utils
+                from src.data_parser_for_pdf import parse_project_links_from_layout
                 project_links: Dict[str, str] = {}
                 if temp_resume_path and temp_resume_path.lower().endswith('.pdf'):
-                    raw_resume_text = file_utils.read_pdf_text(temp_resume_path)
-                    # Simple heuristic: lines that look like project titles followed by a URL on the same or next line
-                    last_title: Optional[str] = None
-                    for line in raw_resume_text.splitlines():
-                        stripped = line.strip()
-                        if not stripped:
-                            continue
-                        if stripped and not stripped.startswith('http') and len(stripped) <= 80 and stripped[0].isupper() and ' ' in stripped:
-                            # consider as potential title
-                            last_title = stripped.replace('**','').split('|',1)[0].strip()
-                        url_match = re.search(r'(https?://\S+)', stripped)
-                        if url_match and last_title:
-                            project_links[last_title] = url_match.group(1)
-                            last_title = None
+                    # Cached layout from the parser pass: link annotations and in-text URLs, no re-parse
+                    project_links = parse_project_links_from_layout(file_utils.read_pdf_layout(temp_resume_path))
                 tailored_resume_json_data['project_links'] = project_links
                 tailored_resume_json_data['source_resume_filename'] = resume_file_name
             except Exception:
                 pass
 
+            # Drop the least relevant bullets only if even the densest readable layout overflows one page
+            try:
+                budget = fit_resume_content(
+                    tailored_resume_json_data,
+                    getattr(CONFIG, 'PREDEFINED_CONTACT_INFO', {}),
+                    getattr(CONFIG, 'PREDEFINED_EDUCATION_INFO', []),
+                    requirements=getattr(jd_analysis_result, 'requirements', None),
+                )
+                if budget.dropped:
+                    st.info(f"Dropped {len(budget.dropped)} lower-relevance bullet(s) so the resume fits one page.")
+                tailored_resume_json_data = budget.tailored_data
+            except Exception as e_budget:
+                print(f"Content budget skipped: {e_budget}")
+
             temp_tailored_resume_json_path = os.path.join(temp_dir, "tailored_resume.json")
             with open(temp_tailored_resume_json_path, "w", encoding="utf-8") as f_json:
                 json.dump(tailored_resume_json_data, f_json, indent=4)
 
+            stage_start = time.perf_counter()
             st.info("Generating Cover Letter...")
             cover_letter_agent = CoverLetterAgent(llm_client=router)
             contact_info_for_cl = getattr(CONFIG, 'PREDEFINED_CONTACT_INFO', {})
@@ -393,14 +367,13 @@ def run_tailoring_process(job_description_text: str, resume_input, professional_
                 contact_info=contact_info_for_cl,
                 master_profile_text=professional_background_content  # Can be None
             )
+            stage_timings["cover_letter"] = time.perf_counter() - stage_start
             if not cover_letter_text:
                 st.warning("Cover letter generation resulted in empty or no text. Skipping CL PDF.")
             else:
                 st.success("Cover Letter Generated.")
 
-            # --- Resume DOCX and PDF Generation via Google Drive ---
-            st.info("Generating Resume PDF via Google Drive...")
-            
+            # --- Resume and Cover Letter PDF Generation ---
             # Get required configuration
             contact_info_for_pdf = getattr(CONFIG, 'PREDEFINED_CONTACT_INFO', {})
             education_info_for_pdf = getattr(CONFIG, 'PREDEFINED_EDUCATION_INFO', [])
@@ -413,185 +386,85 @@ def run_tailoring_process(job_description_text: str, resume_input, professional_
                 st.error("PREDEFINED_EDUCATION_INFO not found in config. Cannot generate resume PDF.")
                 return None, None, None, None
 
-            try:
-                # Use the actual function instead of class
-                final_resume_pdf_path_temp = generate_styled_resume_pdf(
-                    tailored_data=tailored_resume_json_data,
-                    contact_info=contact_info_for_pdf,
-                    education_info=education_info_for_pdf,
-                    output_pdf_directory=temp_dir,
-                    target_company_name=jd_analysis_result.company_name if hasattr(jd_analysis_result, 'company_name') else None,
-                    years_of_experience=4,  # You can make this configurable
-                    filename_keyword="TailoredResume"
-                )
-                
-                if not final_resume_pdf_path_temp or not os.path.exists(final_resume_pdf_path_temp):
-                    st.error(f"Failed to generate resume PDF via Google Drive.")
-                    return None, None, None, None
-                # One-page enforcement for resume
-                try:
-                    from src.docx_to_pdf_generator import ensure_one_page_pdf
-                    if not ensure_one_page_pdf(final_resume_pdf_path_temp):
-                        st.warning("Resume exceeded one page. Regenerating in compact mode...")
-                        final_resume_pdf_path_temp = generate_styled_resume_pdf(
-                            tailored_data=tailored_resume_json_data,
-                            contact_info=contact_info_for_pdf,
-                            education_info=education_info_for_pdf,
-                            output_pdf_directory=temp_dir,
-                            target_company_name=jd_analysis_result.company_name if hasattr(jd_analysis_result, 'company_name') else None,
-                            years_of_experience=4,
-                            filename_keyword="TailoredResume",
-                            compact=True
-                        )
-                except Exception:
-                    pass
-                st.success(f"Resume PDF generated via Google Drive: {os.path.basename(final_resume_pdf_path_temp)}")
+            # Resume and cover letter render side by side, in memory, each with its own layout search and one-page check
+            st.info("Rendering Resume and Cover Letter PDFs...")
+            stage_start = time.perf_counter()
+            resume_render, cl_render = render_application_pdfs(
+                tailored_data=tailored_resume_json_data,
+                contact_info=contact_info_for_pdf,
+                education_info=education_info_for_pdf,
+                cover_letter_text=cover_letter_text,
+                target_company_name=jd_analysis_result.company_name,
+                years_of_experience=4,  # You can make this configurable
+            )
+            stage_timings["render"] = time.perf_counter() - stage_start
 
-            except Exception as e:
-                st.error(f"Error during resume PDF generation: {e}")
-                import traceback
-                st.error(traceback.format_exc())
+            if not resume_render.ok:
+                st.error(f"Failed to generate resume PDF: {resume_render.error or 'unknown error'}")
                 return None, None, None, None
+            resume_pdf_bytes = resume_render.pdf_bytes
+            if resume_render.rerendered:
+                st.warning("Resume exceeded one page and was regenerated with a denser layout.")
+            st.success(f"Resume PDF generated: {resume_render.filename} ({resume_render.layout.font_size}pt)")
 
-            # Generate Cover Letter PDF using sophisticated formatting
-            generated_cl_pdf_actual_path = None
-            if cover_letter_text: # Only generate if text exists
-                st.info("Generating PDF for Cover Letter with professional formatting...")
-                
-                # Extract job title and company name from analysis
-                job_title = getattr(jd_analysis_result, 'job_title', 'Position') or 'Position'
-                company_name = getattr(jd_analysis_result, 'company_name', 'Company') or 'Company'
-                
-                try:
-                    # Use the sophisticated cover letter PDF generator
-                    generated_cl_pdf_actual_path = generate_styled_cover_letter_pdf(
-                        cover_letter_body_text=cover_letter_text,
-                        contact_info=contact_info_for_pdf,
-                        job_title=job_title,
-                        company_name=company_name,
-                        output_pdf_directory=temp_dir,
-                        filename_keyword="CoverLetter",
-                        years_of_experience=4  # You can make this configurable
-                    )
-                    # One-page enforcement for CL
-                    if generated_cl_pdf_actual_path and os.path.exists(generated_cl_pdf_actual_path):
-                        try:
-                            from src.docx_to_pdf_generator import ensure_one_page_pdf
-                            if not ensure_one_page_pdf(generated_cl_pdf_actual_path):
-                                st.warning("Cover Letter exceeded one page. Regenerating in compact mode...")
-                                generated_cl_pdf_actual_path = generate_styled_cover_letter_pdf(
-                                    cover_letter_body_text=cover_letter_text,
-                                    contact_info=contact_info_for_pdf,
-                                    job_title=job_title,
-                                    company_name=company_name,
-                                    output_pdf_directory=temp_dir,
-                                    filename_keyword="CoverLetter",
-                                    years_of_experience=4,
-                                    compact=True
-                                )
-                        except Exception:
-                            pass
-                        if generated_cl_pdf_actual_path and os.path.exists(generated_cl_pdf_actual_path):
-                            st.success(f"Cover Letter PDF generated with professional formatting: {os.path.basename(generated_cl_pdf_actual_path)}")
-                        else:
-                            st.warning("Cover Letter PDF generation failed - file not created")
-                            generated_cl_pdf_actual_path = None
-                    else:
-                        st.warning("Cover Letter PDF generation failed - file not created")
-                        generated_cl_pdf_actual_path = None
-                except Exception as e:
-                    st.error(f"Error during cover letter PDF generation: {e}")
-                    import traceback
-                    st.error(traceback.format_exc())
-                    generated_cl_pdf_actual_path = None
-            else: 
+            cover_letter_pdf_bytes = None
+            if cl_render is None:
                 st.info("Skipping Cover Letter PDF generation as cover letter text was not generated or was empty.")
+            elif not cl_render.ok:
+                st.warning(f"Cover Letter PDF generation failed: {cl_render.error or 'file not created'}")
+            else:
+                cover_letter_pdf_bytes = cl_render.pdf_bytes
+                if cl_render.rerendered:
+                    st.warning("Cover Letter exceeded one page and was regenerated with a denser layout.")
+                st.success(f"Cover Letter PDF generated with professional formatting: {cl_render.filename}")
 
+            # Page-1 thumbnails rasterize in the background while the uploads run; the results view shows them
+            request_preview(resume_pdf_bytes)
+            request_preview(cover_letter_pdf_bytes)
 
-            # --- GCS Upload ---
+            # --- Artifact storage (GCS or local disk, see STORAGE_BACKEND) ---
             gcs_final_resume_path = None
             gcs_final_cl_path = None
-            
-            gcs_bucket_name_cfg = getattr(CONFIG, 'GCS_BUCKET_NAME', None)
-            gac_env_var_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-            
-            if gcs_bucket_name_cfg and gac_env_var_path:
-                if not os.path.exists(gac_env_var_path):
-                    st.warning(f"GCS Upload: GOOGLE_APPLICATION_CREDENTIALS file not found at '{gac_env_var_path}'. Skipping GCS upload.")
-                else:
-                    st.info("Attempting to upload documents to GCS...")
-                    gcs_client_instance = get_gcs_client() 
-                    if gcs_client_instance:
-                        try:
-                            # Generate unique folder name using Option B strategy
-                            contact_name = contact_info_for_cl.get('name', 'User')
-                            gcs_folder_name = generate_gcs_folder_name(job_description_text, resume_file_name, contact_name)
-                            
-                            # Use custom filenames if provided, otherwise use defaults
-                            resume_gcs_filename = custom_resume_filename or "TailoredResume.pdf"
-                            cl_gcs_filename = custom_cl_filename or "CoverLetter.pdf"
-                            
-                            if os.path.exists(final_resume_pdf_path_temp):
-                                resume_blob_name = f"applications/{gcs_folder_name}/{resume_gcs_filename}"
-                                upload_success_resume = upload_file_to_gcs( 
-                                    gcs_client_instance, 
-                                    final_resume_pdf_path_temp, 
-                                    resume_blob_name, 
-                                    bucket_name=gcs_bucket_name_cfg
-                                )
-                                if upload_success_resume:
-                                    gcs_final_resume_path = f"gs://{gcs_bucket_name_cfg}/{resume_blob_name}"
-                                    st.success(f"Tailored Resume uploaded to GCS: {gcs_final_resume_path}")
-                                else:
-                                    st.warning("Failed to upload Tailored Resume to GCS.")
-                            else:
-                                st.warning("Tailored Resume PDF does not exist. Skipping GCS upload for resume.")
-
-                            if generated_cl_pdf_actual_path and os.path.exists(generated_cl_pdf_actual_path):
-                                cl_blob_name = f"applications/{gcs_folder_name}/{cl_gcs_filename}"
-                                upload_success_cl = upload_file_to_gcs( 
-                                    gcs_client_instance, 
-                                    generated_cl_pdf_actual_path, 
-                                    cl_blob_name, 
-                                    bucket_name=gcs_bucket_name_cfg
-                                )
-                                if upload_success_cl:
-                                    gcs_final_cl_path = f"gs://{gcs_bucket_name_cfg}/{cl_blob_name}"
-                                    st.success(f"Cover Letter uploaded to GCS: {gcs_final_cl_path}")
-                                else:
-                                    st.warning("Failed to upload Cover Letter to GCS.")
-                                    
-                            # Show folder organization info
-                            if gcs_final_resume_path or gcs_final_cl_path:
-                                st.info(f"📁 Documents organized in folder: `applications/{gcs_folder_name}/`")
-                                st.info(f"📋 Folder naming: `Timestamp_CandidateName` (Option B)")
-                                
-                        except Exception as e:
-                            st.warning(f"Failed to upload to GCS: {e}. Ensure GCS is configured correctly.")
-                    else:
-                        st.warning("Failed to get GCS client. Skipping GCS upload.")
+
+            storage_backend = get_storage_backend()
+            if storage_backend.name == "gcs" and not getattr(CONFIG, 'GCS_BUCKET_NAME', None):
+                st.info("GCS settings not fully configured (GCS_BUCKET_NAME in config). Skipping upload.")
             else:
-                missing_gcs_configs = []
-                if not gcs_bucket_name_cfg: missing_gcs_configs.append("GCS_BUCKET_NAME in config")
-                if not gac_env_var_path: missing_gcs_configs.append("GOOGLE_APPLICATION_CREDENTIALS (env var not set)")
-                elif not os.path.exists(gac_env_var_path):  missing_gcs_configs.append(f"GOOGLE_APPLICATION_CREDENTIALS file not found at '{gac_env_var_path}'")
-                
-                if missing_gcs_configs:
-                    st.info(f"GCS settings not fully configured ({', '.join(missing_gcs_configs)}). Skipping GCS upload.")
-                else:
-                    st.info("GCS upload skipped due to missing configuration.")
+                try:
+                    # Application id using Option B strategy (Timestamp_CandidateName_Company)
+                    contact_name = contact_info_for_cl.get('name', 'User')
+                    application_id = generate_gcs_folder_name(jd_analysis_result, resume_file_name, contact_name)
+
+                    if not resume_pdf_bytes:
+                        st.warning("Tailored Resume PDF does not exist. Skipping upload for resume.")
+                    # Content-addressed: identical PDFs from earlier runs are referenced, not stored again.
+                    # Write-behind: the manifest and any new content go to the local outbox and a
+                    # background worker stores them (with retries), so the downloads never wait on storage I/O
+                    manifest = record_application(
+                        application_id,
+                        [("resume", custom_resume_filename or "TailoredResume.pdf", resume_pdf_bytes, "application/pdf"),
+                         ("cover_letter", custom_cl_filename or "CoverLetter.pdf", cover_letter_pdf_bytes, "application/pdf")],
+                        jd_text=job_description_text,
+                        candidate=contact_name,
+                        company=jd_analysis_result.company_name,
+                        job_title=jd_analysis_result.job_title,
+                        timings=stage_timings,
+                    )
+                    if manifest:
+                        if manifest.artifact("resume"):
+                            gcs_final_resume_path = storage_backend.uri(manifest.artifact("resume").object_name)
+                        if manifest.artifact("cover_letter"):
+                            gcs_final_cl_path = storage_backend.uri(manifest.artifact("cover_letter").object_name)
+                        st.info(f"📁 Application `{application_id}` recorded; documents queued for upload "
+                                f"({storage_backend.name} storage, progress in the sidebar)")
+                    elif resume_pdf_bytes or cover_letter_pdf_bytes:
+                        st.warning("Could not queue the documents for upload.")
 
-            
-            # Read PDF bytes for download
-            resume_pdf_bytes = None
-            if os.path.exists(final_resume_pdf_path_temp):
-                with open(final_resume_pdf_path_temp, "rb") as f:
-                    resume_pdf_bytes = f.read()
-            
-            cover_letter_pdf_bytes = None
-            if generated_cl_pdf_actual_path and os.path.exists(generated_cl_pdf_actual_path):
-                with open(generated_cl_pdf_actual_path, "rb") as f:
-                    cover_letter_pdf_bytes = f.read()
+                except Exception as e:
+                    st.warning(f"Failed to queue upload: {e}. Ensure storage is configured correctly.")
+
+
+            # The rendered bytes go straight to the download buttons; no PDF was written to disk
 
             return resume_pdf_bytes, cover_letter_pdf_bytes, gcs_final_resume_path, gcs_final_cl_path
 
@@ -664,16 +537,9 @@ else:
                 try:
                     master_pdf_path = os.path.join(CONFIG.PROJECT_ROOT, "Untitled Resume (2).pdf")
                     if os.path.exists(master_pdf_path):
-                        mtime = os.path.getmtime(master_pdf_path)
-                        cached_mtime = st.session_state.get('master_pdf_mtime')
-                        cached_text = st.session_state.get('master_pdf_text')
-                        if cached_text and cached_mtime == mtime:
-                            master_pdf_context_text = cached_text
-                        else:
-                            from utils import file_utils
-                            master_pdf_context_text = file_utils.read_pdf_text(master_pdf_path)
-                            st.session_state['master_pdf_text'] = master_pdf_context_text
-                            st.session_state['master_pdf_mtime'] = mtime
+                        # read_pdf_text memoizes by content hash, so reruns don't re-parse the PDF
+                        from utils import file_utils
+                        master_pdf_context_text = file_utils.read_pdf_text(master_pdf_path)
                         st.caption("Master resume context loaded for tailoring.")
                     else:
                         st.caption("Master resume context file not found. Proceeding without it.")
@@ -737,7 +603,27 @@ else:
         st.write("**Resume:**", "✅ Provided" if uploaded_resume or (resume_input_method == "Use default file" and default_resume_exists) else "❌ Missing")
         st.write("**Professional Background:**", 
                 "✅ Provided" if professional_background_content else "⚪ Optional (proceeding without)")
-        
+
+        # Write-behind uploads (also resumes jobs left in the outbox by an earlier session)
+        upload_status = publisher_status()
+        if upload_status.pending_jobs:
+            retry_note = f", {upload_status.retrying_jobs} retrying" if upload_status.retrying_jobs else ""
+            st.write("**Uploads:**", f"⏳ {upload_status.pending_artifacts} file(s) pending{retry_note}")
+            if upload_status.last_error:
+                st.caption(f"Last error: {upload_status.last_error}")
+        elif upload_status.published_artifacts:
+            st.write("**Uploads:**", f"✅ {upload_status.published_artifacts} file(s) published")
+        if upload_status.dead_jobs:
+            st.write("**Uploads:**", f"❌ {upload_status.dead_jobs} job(s) gave up; see the outbox 'dead' folder")
+
+        # Application history is one index query, not a bucket listing
+        recent_applications = get_artifact_index().history(limit=5)
+        if recent_applications:
+            with st.expander("🗂️ Recent Applications"):
+                for past in recent_applications:
+                    st.text(f"{datetime.fromtimestamp(past.created_at):%Y-%m-%d %H:%M} · "
+                            f"{past.company or 'Unknown company'} · {past.job_title or ''}")
+
         st.markdown("---")
         
         # File naming section
@@ -846,7 +732,7 @@ else:
                 key="download_resume_pdf"
             )
             if gcs_resume_path:
-                st.info(f"Resume also uploaded to GCS: {gcs_resume_path}")
+                st.info(f"Resume also published to storage (in the background): {gcs_resume_path}")
         
         if cl_pdf_bytes:
             with col2:
@@ -858,11 +744,25 @@ else:
                     key="download_cl_pdf"
                 )
                 if gcs_cl_path:
-                    st.info(f"Cover Letter also uploaded to GCS: {gcs_cl_path}")
+                    st.info(f"Cover Letter also published to storage (in the background): {gcs_cl_path}")
         else:
             with col2:
                  st.empty()
-        
+
+        # Drawn after the download buttons so a slow thumbnail never holds them back
+        if preview_dpi() > 0:
+            st.subheader("👀 Preview")
+            preview_col1, preview_col2 = st.columns([2,2])
+            with preview_col1:
+                resume_png = preview_png(resume_pdf_bytes)
+                if resume_png:
+                    st.image(resume_png, caption="Resume, page 1")
+            if cl_pdf_bytes:
+                with preview_col2:
+                    cl_png = preview_png(cl_pdf_bytes)
+                    if cl_png:
+                        st.image(cl_png, caption="Cover letter, page 1")
+
         # Add a clear button to reset generated files
         if st.button("🗑️ Clear Generated Files", key="clear_files"):
             st.session_state.generated_files = {
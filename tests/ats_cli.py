@@ -10,6 +10,9 @@ def main():
     res = agent.run(jd_text=jd_text)
 
     print("Job Title:", res.job_title)
+    print("Company:", res.company_name)
+    print("Location:", res.location)
+    print("Seniority:", res.seniority, "| Employment type:", res.employment_type)
     print("Requirements lines:", len(res.requirements))
     print("ATS keywords (top 25):", res.ats_keywords[:25])
 
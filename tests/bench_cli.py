@@ -0,0 +1,378 @@
+import argparse
+import glob
+import io
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import replace
+
+import fitz
+
+import config
+from src.layout_fit import choose_resume_layout, estimate_resume_fit
+from src.layout_params import (
+    COVER_LETTER_DENSEST, COVER_LETTER_NORMAL, RESUME_DENSEST, RESUME_NORMAL, cover_letter_preset, resume_preset,
+)
+from src.content_budget import fit_resume_content
+from src.pdf_optimizer import optimize_pdf
+from src.pdf_verifier import verify_pdf
+from src.text_markup import get_keyword_highlighter, keyword_bold_spans
+from src.resume_model import format_projects, format_work_experience, parse_tailored_resume
+from src.vector_pdf_renderer import render_resume_pdf_bytes
+from utils.file_utils import read_pdf_layout
+from utils.nlp_utils import RESUME_SECTION_KEYS, sectionize_resume, split_resume_sections
+
+
+def _timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def _legacy_split(pdf_text):
+    # The original fixed four-header scan, kept here only as the comparison baseline.
+    headers = {"SUMMARY": "summary", "WORK EXPERIENCE": "work_experience",
+               "TECHNICAL SKILLS": "technical_skills", "PROJECTS": "projects"}
+    found = sorted((pdf_text.find(h), key) for h, key in headers.items() if pdf_text.find(h) != -1)
+    sections = {key: "" for key in headers.values()}
+    for i, (pos, key) in enumerate(found):
+        end = found[i + 1][0] if i + 1 < len(found) else len(pdf_text)
+        sections[key] = pdf_text[pos:end].split("\n", 1)[-1].strip()
+    return sections
+
+
+def bench_sectionize(args):
+    pdf_paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not pdf_paths:
+        raise SystemExit(f"No PDFs found in {args.corpus}")
+    print(f"{'file':45} {'legacy':>8} {'new':>8} {'ms(text)':>9} {'ms(layout)':>10}  sections")
+    for path in pdf_paths:
+        layout = read_pdf_layout(path)
+        text = layout.text
+        legacy = sum(1 for v in _legacy_split(text).values() if v)
+        found = sum(1 for v in split_resume_sections(text, layout=layout).values() if v)
+        ms_text = _timeit(lambda: sectionize_resume(text), args.repeat)
+        ms_layout = _timeit(lambda: sectionize_resume(text, layout), args.repeat)
+        keys = [span.key for span in sectionize_resume(text, layout)]
+        print(f"{os.path.basename(path)[:45]:45} {legacy:>5}/{len(RESUME_SECTION_KEYS)} "
+              f"{found:>5}/{len(RESUME_SECTION_KEYS)} {ms_text:>9.3f} {ms_layout:>10.3f}  {keys}")
+
+
+def _bullet_variants(tailored_data, steps):
+    """Copies of the tailored resume with each entry's bullets cut to k, k-1, ... or repeated, to sweep length."""
+    parsed = parse_tailored_resume(tailored_data)
+    for delta in steps:
+        def keep(bullets):
+            if delta >= 0:
+                return list(bullets) + list(bullets[:delta])
+            return list(bullets[:max(1, len(bullets) + delta)])
+        work = format_work_experience(replace(job, bullets=tuple(keep(job.bullets))) for job in parsed.work_experience)
+        projects = format_projects(replace(proj, bullets=tuple(keep(proj.bullets))) for proj in parsed.projects)
+        yield delta, dict(tailored_data, work_experience=work, projects=projects)
+
+
+def _rendered_bottom(pdf_bytes):
+    """(pages, bottom edge of the lowest text block on the last page, in points from the top)."""
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    blocks = doc[-1].get_text("blocks")
+    return doc.page_count, max((b[3] for b in blocks), default=0.0)
+
+
+def bench_fit(args):
+    with open(args.tailored_json, "r", encoding="utf-8") as f:
+        tailored = json.load(f)
+    contact = getattr(config, "PREDEFINED_CONTACT_INFO", {})
+    education = getattr(config, "PREDEFINED_EDUCATION_INFO", [])
+    if args.docx:
+        from src.docx_to_pdf_generator import generate_styled_resume_pdf
+    out_dir = tempfile.mkdtemp(prefix="fit_bench_")
+    print(f"{'bullets':>7} {'preset':>7} {'est.pg':>6} {'est.bottom':>10} {'ms':>6} | "
+          f"{'vec.pg':>6} {'vec.bottom':>10} {'ms':>6}" + (" | docx.pg docx.bottom      ms" if args.docx else ""))
+    for delta, data in _bullet_variants(tailored, range(-3, 3)):
+        for compact in (False, True):
+            params = resume_preset(compact)
+            start = time.perf_counter()
+            est = estimate_resume_fit(data, contact, education, params)
+            est_ms = (time.perf_counter() - start) * 1000
+            est_bottom = params.margin_top * 72 + est.used_height - (est.pages - 1) * est.available_height
+            start = time.perf_counter()
+            vec_pages, vec_bottom = _rendered_bottom(render_resume_pdf_bytes(data, contact, education, params=params))
+            vec_ms = (time.perf_counter() - start) * 1000
+            row = (f"{delta:>+7} {'compact' if compact else 'normal':>7} {est.pages:>6} {est_bottom:>10.1f} {est_ms:>6.1f} | "
+                   f"{vec_pages:>6} {vec_bottom:>10.1f} {vec_ms:>6.1f}")
+            if args.docx:
+                start = time.perf_counter()
+                path = generate_styled_resume_pdf(data, contact, education, out_dir, "Bench", 4, f"fit{delta}", layout=params)
+                docx_ms = (time.perf_counter() - start) * 1000
+                if path:
+                    with open(path, "rb") as f:
+                        docx_pages, docx_bottom = _rendered_bottom(f.read())
+                    row += f" | {docx_pages:>7} {docx_bottom:>11.1f} {docx_ms:>7.0f}"
+                else:
+                    row += " | render failed"
+            print(row)
+        start = time.perf_counter()
+        chosen, fit = choose_resume_layout(data, contact, education)
+        print(f"{delta:>+7} {'search':>7} {fit.pages:>6} slack {fit.slack:>6.1f}pt {(time.perf_counter() - start) * 1000:>6.1f}ms  "
+              f"font {chosen.font_size} spacing {chosen.line_spacing} margins {chosen.margin_left}in")
+
+
+def bench_budget(args):
+    with open(args.tailored_json, "r", encoding="utf-8") as f:
+        tailored = json.load(f)
+    contact = getattr(config, "PREDEFINED_CONTACT_INFO", {})
+    education = getattr(config, "PREDEFINED_EDUCATION_INFO", [])
+    requirements = []
+    if args.jd and os.path.exists(args.jd):
+        with open(args.jd, "r", encoding="utf-8") as f:
+            requirements = [line.strip(" -•*\t") for line in f if len(line.strip()) > 20]
+    print(f"{'jobs':>4} {'bullets':>7} {'dropped':>7} {'fits':>5} {'slack':>7} {'ms':>6} {'pdf.pg':>6} {'pdf.bottom':>10}")
+    for copies in range(1, args.max_copies + 1):
+        repeated = dict(tailored, work_experience="\n\n".join([tailored.get("work_experience", "")] * copies))
+        for delta, data in _bullet_variants(repeated, range(0, 3)):
+            start = time.perf_counter()
+            result = fit_resume_content(data, contact, education, requirements=requirements)
+            ms = (time.perf_counter() - start) * 1000
+            layout, _ = choose_resume_layout(result.tailored_data, contact, education)
+            pages, bottom = _rendered_bottom(render_resume_pdf_bytes(result.tailored_data, contact, education, params=layout))
+            print(f"{copies:>4} {delta:>+7} {len(result.dropped):>7} {str(result.estimate.fits):>5} "
+                  f"{result.estimate.slack:>7.1f} {ms:>6.1f} {pages:>6} {bottom:>10.1f}")
+
+
+def _legacy_bold_spans(text, keywords):
+    # The original per-keyword sub passes followed by a markdown split, kept as the comparison baseline.
+    for kw in sorted({k for k in keywords if k}, key=len, reverse=True):
+        pattern = re.compile(rf'(?i)(?<!\*)(?<![A-Za-z0-9])({re.escape(kw)})(?![A-Za-z0-9])(?!\*)')
+        text = pattern.sub(r'**\1**', text)
+    spans = []
+    for part in re.split(r'(\*\*[^*]+\*\*)', text):
+        if part.startswith('**') and part.endswith('**'):
+            spans.append((part[2:-2], True))
+        elif part:
+            spans.append((part.replace('**', ''), False))
+    return [span for span in spans if span[0]]
+
+
+def bench_highlight(args):
+    with open(args.tailored_json, "r", encoding="utf-8") as f:
+        tailored = json.load(f)
+    parsed = parse_tailored_resume(tailored)
+    paragraphs = [parsed.summary] + [b for job in parsed.work_experience for b in job.bullets] \
+        + [b for proj in parsed.projects for b in proj.bullets] + [c.skills for c in parsed.technical_skills]
+    vocabulary = sorted({w.strip(".,;:()") for p in paragraphs for w in p.replace("**", "").split() if len(w) > 3})
+    base = list(tailored.get("ats_keywords") or [])
+    print(f"{len(paragraphs)} paragraphs; ms per resume (all paragraphs)")
+    print(f"{'keywords':>8} {'legacy':>9} {'compiled':>9} {'first':>9}  same")
+    for count in args.counts:
+        keywords = (base + vocabulary)[:count]
+        same = all(_legacy_bold_spans(p, keywords) == keyword_bold_spans(p, keywords) for p in paragraphs)
+        legacy_ms = _timeit(lambda: [_legacy_bold_spans(p, keywords) for p in paragraphs], args.repeat)
+        start = time.perf_counter()
+        highlighter = get_keyword_highlighter(keywords + ["__cold__"])
+        [highlighter.spans(p) for p in paragraphs]
+        first_ms = (time.perf_counter() - start) * 1000
+        compiled_ms = _timeit(lambda: [keyword_bold_spans(p, keywords) for p in paragraphs], args.repeat)
+        print(f"{len(keywords):>8} {legacy_ms:>9.3f} {compiled_ms:>9.3f} {first_ms:>9.3f}  {same}")
+
+
+def _save_ms(document):
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return (time.perf_counter() - start) * 1000, len(buffer.getvalue())
+
+
+def bench_docx_base(args):
+    from docx import Document
+    from src import docx_to_pdf_generator as gen
+    styles = {"resume": gen._style_resume_base, "cover_letter": gen._style_cover_letter_base}
+    cases = [("resume", "normal", RESUME_NORMAL), ("resume", "compact", resume_preset(True)),
+             ("resume", "densest", RESUME_DENSEST), ("cover_letter", "normal", COVER_LETTER_NORMAL),
+             ("cover_letter", "compact", cover_letter_preset(True)), ("cover_letter", "densest", COVER_LETTER_DENSEST)]
+    print("ms per document: empty styled base plus the save every render does; content cost is unchanged")
+    print(f"{'kind':>12} {'preset':>7} {'legacy':>8} {'save':>7} {'docx.kb':>7} | {'build':>7} {'clone':>7} {'save':>7} {'docx.kb':>7} {'saved':>7}")
+    for kind, label, params in cases:
+        def legacy():
+            document = Document()
+            styles[kind](document, params)
+            return document
+        legacy_ms = _timeit(legacy, args.repeat)
+        legacy_save_ms, legacy_size = _save_ms(legacy())
+        gen._DOCX_BASE_TEMPLATES.pop((kind, params), None)
+        start = time.perf_counter()
+        gen.new_base_document(kind, params)
+        build_ms = (time.perf_counter() - start) * 1000
+        clone_ms = _timeit(lambda: gen.new_base_document(kind, params), args.repeat)
+        save_ms, size = _save_ms(gen.new_base_document(kind, params))
+        print(f"{kind:>12} {label:>7} {legacy_ms:>8.2f} {legacy_save_ms:>7.2f} {legacy_size / 1024:>7.1f} | "
+              f"{build_ms:>7.2f} {clone_ms:>7.2f} {save_ms:>7.2f} {size / 1024:>7.1f} "
+              f"{legacy_ms + legacy_save_ms - clone_ms - save_ms:>7.2f}")
+
+
+def bench_verify(args):
+    from PyPDF2 import PdfReader
+    paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not paths:
+        raise SystemExit(f"No PDFs found in {args.corpus}")
+    print(f"{'file':45} {'pages':>5} {'pypdf2':>8} {'verify':>8} {'slack':>7} {'links':>5} {'fonts':>5}  problems")
+    for path in paths:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        pypdf2_ms = _timeit(lambda: len(PdfReader(io.BytesIO(pdf_bytes)).pages), args.repeat)
+        verify_ms = _timeit(lambda: verify_pdf(pdf_bytes), args.repeat)
+        result = verify_pdf(pdf_bytes)
+        print(f"{os.path.basename(path)[:45]:45} {result.page_count:>5} {pypdf2_ms:>8.2f} {verify_ms:>8.2f} "
+              f"{result.slack(0):>7.1f} {len(result.links):>5} {len(result.fonts):>5}  {result.problems()}")
+
+
+def bench_optimize(args):
+    paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not paths:
+        raise SystemExit(f"No PDFs found in {args.corpus}")
+    print(f"{'file':45} {'bytes':>8} {'no-subset':>9} {'optimized':>9} {'saved':>6} {'ms':>6}")
+    for path in paths:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        plain = optimize_pdf(pdf_bytes, subset_fonts=False)
+        result = optimize_pdf(pdf_bytes)
+        print(f"{os.path.basename(path)[:45]:45} {result.original_size:>8} {plain.optimized_size:>9} "
+              f"{result.optimized_size:>9} {result.saved_bytes * 100 / result.original_size:>5.1f}% {result.elapsed_ms:>6.1f}")
+
+
+def bench_upload(args):
+    from utils.storage import GcsStorageBackend, LocalStorageBackend, StorageArtifact, get_storage_backend
+    paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not paths:
+        raise SystemExit(f"No PDFs found in {args.corpus}")
+    if args.backend == "local":
+        backend = LocalStorageBackend(args.local_dir or tempfile.mkdtemp(prefix="bench_storage_"))
+    elif args.backend == "gcs" or args.bucket:
+        backend = GcsStorageBackend(args.bucket or config.GCS_BUCKET_NAME)
+    else:
+        backend = get_storage_backend()
+    if not backend.is_available():
+        raise SystemExit(f"Storage backend '{backend.name}' is not available; for GCS set STORAGE_EMULATOR_HOST "
+                         f"(local fake-GCS server) or GCS credentials.")
+    print(f"backend: {backend.name} ({backend.uri(args.prefix)})")
+    artifacts = [StorageArtifact(f"{args.prefix}/{os.path.basename(path)}", local_path=path) for path in paths]
+    start = time.perf_counter()
+    for artifact in artifacts:
+        backend.put(replace(artifact, name=f"{args.prefix}/sequential/{os.path.basename(artifact.name)}"))
+    sequential_ms = (time.perf_counter() - start) * 1000
+    for label in ("put_many", "re-put"):
+        start = time.perf_counter()
+        results = backend.put_many(artifacts)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:10} {elapsed_ms:8.1f}ms  stored {sum(r.ok and not r.skipped for r in results)}, "
+              f"skipped {sum(r.skipped for r in results)}, failed {sum(not r.ok for r in results)}")
+    print(f"{'sequential':10} {sequential_ms:8.1f}ms  ({len(artifacts)} files)")
+    start = time.perf_counter()
+    listed = list(backend.list(f"{args.prefix}/"))
+    read_bytes = sum(len(backend.get(obj.name) or b"") for obj in listed)
+    print(f"{'list+get':10} {(time.perf_counter() - start) * 1000:8.1f}ms  ({len(listed)} objects, {read_bytes} bytes)")
+
+
+def bench_manifests(args):
+    paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not paths:
+        raise SystemExit(f"No PDFs found in {args.corpus}")
+    work_dir = tempfile.mkdtemp(prefix="bench_manifests_")
+    config.STORAGE_BACKEND = "local"
+    config.LOCAL_STORAGE_DIR = os.path.join(work_dir, "storage")
+    config.ARTIFACT_OUTBOX_DIR = os.path.join(work_dir, "outbox")
+    config.ARTIFACT_INDEX_PATH = os.path.join(work_dir, "index.sqlite")
+    from utils.artifact_publisher import get_artifact_publisher
+    from utils.artifact_store import MANIFEST_PREFIX, ApplicationManifest, get_artifact_index, record_application
+    from utils.storage import StorageArtifact, get_storage_backend
+
+    backend, publisher = get_storage_backend(), get_artifact_publisher()
+    pdfs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pdfs.append(f.read())
+    # Reruns regenerate the same PDFs; every application reuses one of the corpus files
+    legacy_bytes = 0
+    for i in range(args.applications):
+        resume, cover_letter = pdfs[i % len(pdfs)], pdfs[(i + 1) % len(pdfs)]
+        backend.put_many([StorageArtifact(f"applications/run{i:04d}/TailoredResume.pdf", data=resume),
+                          StorageArtifact(f"applications/run{i:04d}/CoverLetter.pdf", data=cover_letter)])
+        legacy_bytes += len(resume) + len(cover_letter)
+        record_application(f"run{i:04d}", [("resume", "TailoredResume.pdf", resume, "application/pdf"),
+                                           ("cover_letter", "CoverLetter.pdf", cover_letter, "application/pdf")],
+                           jd_text=f"jd {i % 7}", company=f"Company{i % 7}", timings={"render": 0.1})
+        publisher.drain_once()
+    stats = get_artifact_index().stats()
+    print(f"{args.applications} applications: per-run folders {legacy_bytes} bytes, "
+          f"content-addressed {stats['stored_bytes']} bytes in {stats['unique_artifacts']} objects")
+
+    start = time.perf_counter()
+    listed = [ApplicationManifest.from_json(backend.get(obj.name).decode("utf-8"))
+              for obj in backend.list(MANIFEST_PREFIX)]
+    latest_listed = sorted(listed, key=lambda m: m.created_at, reverse=True)[:10]
+    list_ms = (time.perf_counter() - start) * 1000
+    index_ms = _timeit(lambda: get_artifact_index().history(limit=10), 20)
+    assert [m.application_id for m in latest_listed] == [m.application_id for m in get_artifact_index().history(limit=10)]
+    print(f"latest 10: list+read manifests {list_ms:.1f}ms, index query {index_ms:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the resume pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("sectionize", help="Section coverage and latency over a directory of resume PDFs.")
+    p.add_argument("--corpus", default=".", help="Directory containing resume PDFs")
+    p.add_argument("--repeat", type=int, default=200)
+    p.set_defaults(func=bench_sectionize)
+
+    p = sub.add_parser("fit", help="One-page fit estimate versus real renders over bullet-count variants.")
+    p.add_argument("--tailored-json", default="tailored_resume.json")
+    p.add_argument("--docx", action="store_true", help="Also render through the DOCX pipeline (LibreOffice/Drive)")
+    p.set_defaults(func=bench_fit)
+
+    p = sub.add_parser("budget", help="Bullet knapsack over overflowing variants (repeated jobs, extra bullets).")
+    p.add_argument("--tailored-json", default="tailored_resume.json")
+    p.add_argument("--jd", default="jd.txt", help="Job description text; long lines are used as requirements")
+    p.add_argument("--max-copies", type=int, default=2)
+    p.set_defaults(func=bench_budget)
+
+    p = sub.add_parser("highlight", help="ATS keyword bolding: per-keyword regex passes versus the compiled highlighter.")
+    p.add_argument("--tailored-json", default="tailored_resume.json")
+    p.add_argument("--counts", type=int, nargs="+", default=[5, 25, 100, 400])
+    p.add_argument("--repeat", type=int, default=50)
+    p.set_defaults(func=bench_highlight)
+
+    p = sub.add_parser("verify", help="PyPDF2 page count versus the single-pass PyMuPDF verifier over a directory of PDFs.")
+    p.add_argument("--corpus", default=".", help="Directory containing PDFs")
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_verify)
+
+    p = sub.add_parser("optimize", help="PDF size before/after the post-render optimization pass.")
+    p.add_argument("--corpus", default=".", help="Directory containing PDFs")
+    p.set_defaults(func=bench_optimize)
+
+    p = sub.add_parser("docx-base", help="Per-render DOCX setup: fresh Document() and restyling versus a cached base clone.")
+    p.add_argument("--repeat", type=int, default=30)
+    p.set_defaults(func=bench_docx_base)
+
+    p = sub.add_parser("upload", help="Sequential puts versus put_many on a storage backend (re-put skips).")
+    p.add_argument("--corpus", default=".", help="Directory containing PDFs")
+    p.add_argument("--backend", choices=["auto", "gcs", "local"], default="auto", help="auto follows STORAGE_BACKEND")
+    p.add_argument("--bucket", default=None, help="GCS bucket; defaults to GCS_BUCKET_NAME")
+    p.add_argument("--local-dir", default=None, help="Local backend root; defaults to a temp directory")
+    p.add_argument("--prefix", default="bench")
+    p.set_defaults(func=bench_upload)
+
+    p = sub.add_parser("manifests", help="Per-run folders versus content-addressed storage, and history lookups.")
+    p.add_argument("--corpus", default=".", help="Directory containing PDFs")
+    p.add_argument("--applications", type=int, default=200)
+    p.set_defaults(func=bench_manifests)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,27 @@
+import argparse
 import os
 import json
+import time
 from utils.llm_gemini import LLMRouter
 from agents.orchestrator import OrchestratorAgent
 from src.docx_to_pdf_generator import (
-    generate_styled_resume_pdf,
     generate_cover_letter_pdf,
     ensure_one_page_pdf,
+    resume_pdf_basename,
 )
+from src.exporter import EXPORT_FORMATS, export_resume, write_exports
+from utils.artifact_publisher import get_artifact_publisher, publisher_status
+from utils.artifact_store import make_application_id, manifest_object_name, record_application
+from utils.storage import get_storage_backend
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Tailor the resume and export it in several formats.")
+    parser.add_argument("--formats", nargs="+", default=list(EXPORT_FORMATS), choices=EXPORT_FORMATS)
+    parser.add_argument("--publish", action="store_true",
+                        help="Also record the application and store the exports (STORAGE_BACKEND, content-addressed)")
+    args = parser.parse_args()
+
     resume_pdf_candidates = [
         "Shanmugam_ML_2025_4_YOE_M.pdf",
         "Shanmugam_AI_2025_4_YOE.pdf",
@@ -37,6 +49,7 @@ def main():
     }
 
     print("Running orchestrator...")
+    run_start = time.perf_counter()
     agent = OrchestratorAgent(llm_client=router)
     state = agent.run(
         resume_pdf_path=resume_pdf,
@@ -45,6 +58,7 @@ def main():
         master_profile_text=None,
         company_name_for_cl=None,
     )
+    timings = {"orchestrator": time.perf_counter() - run_start}
 
     # Extract tailored data for DOCX
     tailored = state.tailored_resume
@@ -73,33 +87,49 @@ def main():
     out_dir = os.path.join("data", "cli_outputs")
     os.makedirs(out_dir, exist_ok=True)
 
-    print("Generating Resume PDF via Google Drive...")
-    resume_pdf_out = generate_styled_resume_pdf(
+    print(f"Exporting resume as {', '.join(args.formats)}...")
+    export_start = time.perf_counter()
+    exports = export_resume(
         tailored_data=tailored_data,
         contact_info=contact_info,
         education_info=education_info,
-        output_pdf_directory=out_dir,
-        target_company_name=None,
-        years_of_experience=4,
-        filename_keyword="TailoredResume",
+        formats=args.formats,
+        base_filename=resume_pdf_basename(contact_info, state.job_description.company_name, 4, "TailoredResume"),
     )
-    if not resume_pdf_out or not os.path.exists(resume_pdf_out):
-        raise SystemExit("Failed to export Resume PDF via Drive.")
-    if not ensure_one_page_pdf(resume_pdf_out):
-        print("Resume exceeded one page. Regenerating compact...")
-        resume_pdf_out = generate_styled_resume_pdf(
-            tailored_data=tailored_data,
-            contact_info=contact_info,
-            education_info=education_info,
-            output_pdf_directory=out_dir,
-            target_company_name=None,
-            years_of_experience=4,
-            filename_keyword="TailoredResume",
-            compact=True,
+    for fmt, exported in exports.items():
+        if not exported.ok:
+            print(f"Failed to export resume {fmt}: {exported.error}")
+    timings["export"] = time.perf_counter() - export_start
+    for fmt, path in write_exports(exports, out_dir).items():
+        print(f"Resume {fmt.upper()}:", path)
+    if args.publish:
+        company = state.job_description.company_name
+        critique = state.resume_critique
+        manifest = record_application(
+            make_application_id(contact_info["name"], company),
+            [(f"resume_{fmt}", exported.filename, exported.data, exported.mime_type)
+             for fmt, exported in exports.items() if exported.ok],
+            jd_text=jd_text, candidate=contact_info["name"], company=company,
+            job_title=state.job_description.job_title, timings=timings,
+            critique_score=critique.ats_score if critique else None,
         )
-        if not ensure_one_page_pdf(resume_pdf_out):
-            print("Warning: Resume still exceeds one page.")
-    print("Resume PDF:", resume_pdf_out)
+        if manifest is None:
+            print("FAILED to queue the application for storage.")
+        else:
+            get_artifact_publisher().drain_once()  # Store now rather than on the next run
+            backend = get_storage_backend()
+            status = publisher_status()
+            objects = [(ref.role, ref.object_name) for ref in manifest.artifacts]
+            objects.append(("manifest", manifest_object_name(manifest.application_id)))
+            for role, object_name in objects:
+                if backend.exists(object_name):
+                    print(f"Stored {role} ({backend.name}):", backend.uri(object_name))
+                else:
+                    print(f"FAILED {role} ({backend.name}): {object_name}: {status.last_error or 'not stored'}")
+            if status.pending_jobs:
+                print(f"{status.pending_jobs} job(s) left in the outbox; they are retried on the next run.")
+    if exports.get("pdf") and exports["pdf"].ok and not ensure_one_page_pdf(exports["pdf"].data):
+        print("Warning: Resume exceeds one page.")
 
     if state.generated_cover_letter_text:
         print("Generating Cover Letter PDF via Google Drive...")
@@ -107,7 +137,7 @@ def main():
             cover_letter_body_text=state.generated_cover_letter_text,
             contact_info=contact_info,
             job_title=state.job_description.job_title or "Position",
-            company_name=getattr(state.job_description, 'company_name', 'Company') or 'Company',
+            company_name=state.job_description.company_name or 'Company',
             output_pdf_directory=out_dir,
             filename_keyword="CoverLetter",
             years_of_experience=4,
@@ -119,7 +149,7 @@ def main():
                     cover_letter_body_text=state.generated_cover_letter_text,
                     contact_info=contact_info,
                     job_title=state.job_description.job_title or "Position",
-                    company_name=getattr(state.job_description, 'company_name', 'Company') or 'Company',
+                    company_name=state.job_description.company_name or 'Company',
                     output_pdf_directory=out_dir,
                     filename_keyword="CoverLetter",
                     years_of_experience=4,
@@ -133,30 +163,6 @@ def main():
     else:
         print("No cover letter text; skipping CL PDF.")
 
-    # Also output a DOCX for the resume (for user convenience)
-    try:
-        from docx import Document
-        from src.docx_to_pdf_generator import (
-            add_contact_info_docx,
-            add_summary_docx,
-            add_work_experience_docx,
-            add_technical_skills_docx,
-            add_projects_docx,
-            add_education_docx,
-        )
-        docx_path = os.path.join(out_dir, "TailoredResume.docx")
-        document = Document()
-        add_contact_info_docx(document, contact_info)
-        if tailored_data.get("summary"): add_summary_docx(document, tailored_data["summary"])
-        if tailored_data.get("work_experience"): add_work_experience_docx(document, tailored_data["work_experience"])
-        if tailored_data.get("technical_skills"): add_technical_skills_docx(document, tailored_data["technical_skills"])
-        if tailored_data.get("projects"): add_projects_docx(document, tailored_data["projects"], contact_info)
-        add_education_docx(document, education_info)
-        document.save(docx_path)
-        print("Resume DOCX:", docx_path)
-    except Exception as e:
-        print("Failed to generate DOCX:", e)
-
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,5 @@
 import os
-from utils.file_utils import read_pdf_text
+from utils.file_utils import read_pdf_layout
 from utils.nlp_utils import split_resume_sections
 from src.docx_to_pdf_generator import ensure_one_page_pdf
 
@@ -13,11 +13,15 @@ def main():
     if not os.path.exists(pdf_path):
         raise SystemExit(f"Resume PDF not found: {pdf_path}")
 
-    text = read_pdf_text(pdf_path)
+    layout = read_pdf_layout(pdf_path)
+    text = layout.text
     print("PDF text length:", len(text))
     print("First 600 chars:\n", text[:600])
+    print("Body font size:", layout.body_font_size, "| Header-styled lines:",
+          [line.text.strip() for line in layout.lines if layout.is_header_line(line)][:12])
+    print("Links:", [(link.anchor_text, link.uri) for link in layout.links])
 
-    sections = split_resume_sections(text)
+    sections = split_resume_sections(text, layout=layout)
     print("\nDetected sections and lengths:")
     for k, v in sections.items():
         print(f"- {k}: {len(v)} chars")
@@ -0,0 +1,295 @@
+# Resume_Tailoring/utils/artifact_publisher.py
+"""
+Write-behind publishing of generated artifacts to the storage backend (GCS or local disk).
+
+enqueue_artifacts() writes the bytes into a job directory under ARTIFACT_OUTBOX_DIR and returns at
+once, so storage I/O is no longer part of the time before the user gets their downloads. One
+background worker drains the outbox through the backend's put_many. Artifacts that fail are
+retried with capped exponential backoff and jitter. Because the outbox is on disk, queued jobs
+survive restarts, and a job is deleted only when every one of its artifacts is stored.
+Jobs still failing after ARTIFACT_PUBLISH_MAX_ATTEMPTS move to <outbox>/dead for inspection.
+"""
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .storage import PutResult, StorageArtifact, StorageBackend, get_storage_backend
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+_JOB_FILE = "job.json"
+_INCOMING_DIR = ".incoming"
+_DEAD_DIR = "dead"
+_IDLE_POLL_SECONDS = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class PublisherStatus:
+    pending_jobs: int
+    pending_artifacts: int
+    pending_bytes: int
+    retrying_jobs: int  # Pending jobs that have failed at least once
+    dead_jobs: int
+    published_artifacts: int  # Since process start
+    failed_attempts: int  # Since process start
+    last_error: Optional[str]
+    last_published_at: Optional[float]
+    worker_alive: bool
+
+
+def _write_json_atomic(path: str, payload: Dict[str, Any]) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+class ArtifactPublisher:
+    """A persistent outbox directory plus the worker thread that drains it to the storage backend."""
+
+    def __init__(self, outbox_dir: str,
+                 backend_factory: Callable[[], Optional[StorageBackend]] = get_storage_backend,
+                 max_attempts: int = 20, backoff_seconds: float = 2.0, max_backoff_seconds: float = 600.0):
+        self.outbox_dir = outbox_dir
+        self.backend_factory = backend_factory
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()  # The worker and an explicit drain_once() never share a job
+        self._published_artifacts = 0
+        self._failed_attempts = 0
+        self._last_error: Optional[str] = None
+        self._last_published_at: Optional[float] = None
+        self._listeners: List[Callable[[StorageBackend, List[PutResult]], None]] = []
+        for directory in (outbox_dir, os.path.join(outbox_dir, _INCOMING_DIR), os.path.join(outbox_dir, _DEAD_DIR)):
+            os.makedirs(directory, exist_ok=True)
+
+    # --- Producer side ---
+
+    def enqueue(self, artifacts: Sequence[StorageArtifact]) -> Optional[str]:
+        """
+        Persists the artifacts as one job and wakes the worker. Returns the job id, or None when
+        nothing could be written (the caller's downloads are unaffected either way).
+        """
+        artifacts = [a for a in artifacts if a.data or a.local_path]
+        if not artifacts:
+            return None
+        job_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"  # Sorts in enqueue order
+        staging_dir = os.path.join(self.outbox_dir, _INCOMING_DIR, job_id)
+        try:
+            os.makedirs(staging_dir)
+            entries = []
+            for index, artifact in enumerate(artifacts):
+                payload_name = f"{index}.bin"
+                payload_path = os.path.join(staging_dir, payload_name)
+                if artifact.data is not None:
+                    with open(payload_path, "wb") as f:
+                        f.write(artifact.data)
+                else:
+                    shutil.copyfile(artifact.local_path, payload_path)
+                entries.append({"name": artifact.name, "file": payload_name,
+                                "content_type": artifact.content_type, "size": os.path.getsize(payload_path)})
+            _write_json_atomic(os.path.join(staging_dir, _JOB_FILE), {
+                "job_id": job_id, "created_at": time.time(),
+                "attempts": 0, "next_attempt_at": 0.0, "last_error": None, "artifacts": entries,
+            })
+            os.replace(staging_dir, os.path.join(self.outbox_dir, job_id))  # The worker only sees complete jobs
+        except OSError as e:
+            logger.error(f"Could not queue artifacts for publishing: {e}", exc_info=True)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return None
+        logger.info(f"Queued {len(entries)} artifact(s) for publishing as job {job_id}.")
+        self._wake.set()
+        return job_id
+
+    def add_listener(self, callback: Callable[[StorageBackend, List[PutResult]], None]) -> None:
+        """callback(backend, stored) runs on the worker after each attempt that stored at least one artifact."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    # --- Worker side ---
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="artifact_publisher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                wait = self.drain_once()
+            except Exception as e:  # The worker must outlive any single bad job
+                logger.error(f"Artifact publisher pass failed: {e}", exc_info=True)
+                wait = self.backoff_seconds
+            self._wake.wait(timeout=wait)
+            self._wake.clear()
+
+    def _job_dirs(self) -> List[str]:
+        try:
+            names = sorted(name for name in os.listdir(self.outbox_dir)
+                           if name not in (_INCOMING_DIR, _DEAD_DIR) and not name.startswith("."))
+        except OSError:
+            return []
+        return [os.path.join(self.outbox_dir, name) for name in names]
+
+    def _load_job(self, job_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(job_dir, _JOB_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable outbox job '{job_dir}': {e}")
+            return None
+
+    def drain_once(self) -> float:
+        """Publishes every due job once. Returns the seconds until the next job is due."""
+        next_due = _IDLE_POLL_SECONDS
+        with self._drain_lock:
+            for job_dir in self._job_dirs():
+                if self._stop.is_set():
+                    break
+                job = self._load_job(job_dir)
+                if job is None:
+                    continue
+                wait = job.get("next_attempt_at", 0.0) - time.time()
+                if wait <= 0:
+                    wait = self._publish_job(job_dir, job)
+                if wait is not None:
+                    next_due = min(next_due, max(0.0, wait))
+        return next_due
+
+    def _publish_job(self, job_dir: str, job: Dict[str, Any]) -> Optional[float]:
+        """One attempt at a job. Returns the seconds until its retry, or None when it is finished."""
+        artifacts = job["artifacts"]
+        backend = self.backend_factory()
+        if backend is None or not backend.is_available():
+            results = None
+            error = "storage backend unavailable"
+        else:
+            results = backend.put_many([
+                StorageArtifact(a["name"], local_path=os.path.join(job_dir, a["file"]), content_type=a["content_type"])
+                for a in artifacts
+            ])
+            error = next((r.error for r in results if not r.ok), None)
+
+        if results is not None:
+            published = [a for a, r in zip(artifacts, results) if r.ok]
+            for artifact in published:
+                try:
+                    os.remove(os.path.join(job_dir, artifact["file"]))
+                except OSError:
+                    pass
+            artifacts = [a for a, r in zip(artifacts, results) if not r.ok]
+            with self._lock:
+                self._published_artifacts += len(published)
+                if published:
+                    self._last_published_at = time.time()
+                listeners = list(self._listeners)
+            stored = [r for r in results if r.ok]
+            for callback in listeners if stored else ():
+                try:
+                    callback(backend, stored)
+                except Exception as e:
+                    logger.warning(f"Publish listener {callback} failed: {e}", exc_info=True)
+
+        if not artifacts:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            logger.info(f"Published job {job['job_id']}.")
+            return None
+
+        attempts = job.get("attempts", 0) + 1
+        with self._lock:
+            self._failed_attempts += 1
+            self._last_error = error
+        job.update(artifacts=artifacts, attempts=attempts, last_error=error)
+        if attempts >= self.max_attempts:
+            logger.error(f"Giving up on job {job['job_id']} after {attempts} attempts ({error}); "
+                         f"moved to '{os.path.join(self.outbox_dir, _DEAD_DIR)}'.")
+            _write_json_atomic(os.path.join(job_dir, _JOB_FILE), job)
+            os.replace(job_dir, os.path.join(self.outbox_dir, _DEAD_DIR, os.path.basename(job_dir)))
+            return None
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        delay *= 0.5 + random.random() / 2  # Jitter, so a recovering store is not hit by every job at once
+        job["next_attempt_at"] = time.time() + delay
+        _write_json_atomic(os.path.join(job_dir, _JOB_FILE), job)
+        logger.warning(f"Publishing job {job['job_id']} failed (attempt {attempts}): {error}. Retrying in {delay:.1f}s.")
+        return delay
+
+    # --- Status ---
+
+    def status(self) -> PublisherStatus:
+        pending_jobs = pending_artifacts = pending_bytes = retrying_jobs = 0
+        for job_dir in self._job_dirs():
+            job = self._load_job(job_dir)
+            if job is None:
+                continue
+            pending_jobs += 1
+            pending_artifacts += len(job["artifacts"])
+            pending_bytes += sum(a.get("size", 0) for a in job["artifacts"])
+            retrying_jobs += job.get("attempts", 0) > 0
+        try:
+            dead_jobs = len(os.listdir(os.path.join(self.outbox_dir, _DEAD_DIR)))
+        except OSError:
+            dead_jobs = 0
+        with self._lock:
+            return PublisherStatus(
+                pending_jobs, pending_artifacts, pending_bytes, retrying_jobs, dead_jobs,
+                self._published_artifacts, self._failed_attempts, self._last_error, self._last_published_at,
+                self._thread is not None and self._thread.is_alive(),
+            )
+
+
+_publisher: Optional[ArtifactPublisher] = None
+_publisher_lock = threading.Lock()
+
+
+def get_artifact_publisher() -> ArtifactPublisher:
+    """The process-wide publisher, with its worker started (jobs left from earlier runs resume)."""
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            outbox_dir = getattr(app_config, 'ARTIFACT_OUTBOX_DIR', None) \
+                or os.path.join(tempfile.gettempdir(), "resume_artifact_outbox")
+            _publisher = ArtifactPublisher(
+                outbox_dir,
+                max_attempts=int(getattr(app_config, 'ARTIFACT_PUBLISH_MAX_ATTEMPTS', 20)),
+                backoff_seconds=float(getattr(app_config, 'ARTIFACT_PUBLISH_BACKOFF_SECONDS', 2)),
+                max_backoff_seconds=float(getattr(app_config, 'ARTIFACT_PUBLISH_MAX_BACKOFF_SECONDS', 600)),
+            )
+        _publisher.start()
+        return _publisher
+
+
+def enqueue_artifacts(artifacts: Sequence[StorageArtifact]) -> Optional[str]:
+    return get_artifact_publisher().enqueue(artifacts)
+
+
+def publisher_status() -> PublisherStatus:
+    return get_artifact_publisher().status()
+
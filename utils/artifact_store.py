@@ -0,0 +1,317 @@
+# Resume_Tailoring/utils/artifact_store.py
+"""
+Content-addressed artifact storage with one manifest per application.
+
+Artifacts are stored once, under their SHA-256 (cas/sha256/<2 hex>/<hash>), however many
+applications produce the same bytes, whatever name they are downloaded under. Each application writes a small manifest
+(manifests/<application_id>.json) that records the JD hash, the hash and download filename of
+every artifact, stage timings and the critique score. Manifests are the source of truth in the
+bucket. A local SQLite index (ARTIFACT_INDEX_PATH) mirrors them, so finding past applications is
+one query instead of a bucket listing, and it records which hashes each backend already stores, so
+known content is never queued again for that backend. rebuild_index() restores the index from the manifests on a new box.
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .artifact_publisher import get_artifact_publisher
+from .storage import PutResult, StorageArtifact, StorageBackend, get_storage_backend
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PREFIX = "manifests/"
+CONTENT_PREFIX = "cas/sha256/"
+MANIFEST_SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class ArtifactRef:
+    role: str  # "resume", "cover_letter", ...
+    sha256: str
+    object_name: str
+    size: int
+    content_type: Optional[str]
+    filename: str  # Download name the user chose; the object itself is named by hash
+
+
+@dataclass(frozen=True, slots=True)
+class ApplicationManifest:
+    application_id: str
+    created_at: float
+    candidate: Optional[str]
+    company: Optional[str]
+    job_title: Optional[str]
+    jd_sha256: Optional[str]
+    artifacts: Tuple[ArtifactRef, ...]
+    timings: Dict[str, float] = field(default_factory=dict)  # Stage -> seconds
+    critique_score: Optional[float] = None
+    schema_version: int = MANIFEST_SCHEMA_VERSION
+
+    def artifact(self, role: str) -> Optional[ArtifactRef]:
+        return next((a for a in self.artifacts if a.role == role), None)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> "ApplicationManifest":
+        data = json.loads(text)
+        data["artifacts"] = tuple(ArtifactRef(**a) for a in data.get("artifacts", []))
+        return cls(**data)
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_object_name(sha256: str) -> str:
+    """Object name for content with this hash. It depends on the bytes only, so one hash is one object."""
+    return f"{CONTENT_PREFIX}{sha256[:2]}/{sha256}"
+
+
+def manifest_object_name(application_id: str) -> str:
+    return f"{MANIFEST_PREFIX}{application_id}.json"
+
+
+def _safe_name_part(text: str, max_length: int) -> str:
+    return ''.join(c for c in text if c.isalnum() or c in '-_')[:max_length]
+
+
+def make_application_id(candidate_name: str, company_name: Optional[str] = None) -> str:
+    """<timestamp>_<candidate>[_<company>], restricted to characters that are safe in an object name."""
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    candidate = _safe_name_part(candidate_name, 40)
+    company = _safe_name_part(company_name or "", 30)
+    return f"{timestamp}_{candidate}_{company}" if company else f"{timestamp}_{candidate}"
+
+
+def backend_id(backend: StorageBackend) -> str:
+    """Identifies where content lives (bucket or directory), so "stored" in one place says nothing of another."""
+    return backend.uri(CONTENT_PREFIX)
+
+
+class ArtifactIndex:
+    """SQLite mirror of the manifests plus, per backend, the content hashes known to be stored there."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS applications (
+                    application_id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    candidate TEXT,
+                    company TEXT,
+                    job_title TEXT,
+                    jd_sha256 TEXT,
+                    critique_score REAL,
+                    manifest TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS applications_created ON applications (created_at);
+                CREATE INDEX IF NOT EXISTS applications_jd ON applications (jd_sha256);
+            """)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(artifacts)")]
+            if columns and "backend" not in columns:
+                conn.execute("DROP TABLE artifacts")  # Stored flags not tied to a backend; re-learned as jobs publish
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    backend TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    object_name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (backend, sha256)
+                )
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """One connection per call: committed (or rolled back) and then closed."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, manifest: ApplicationManifest, backend: str, stored_objects: Sequence[str] = ()) -> None:
+        """Indexes the manifest; its content counts as stored on `backend` only for names in stored_objects."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO applications VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (manifest.application_id, manifest.created_at, manifest.candidate, manifest.company,
+                 manifest.job_title, manifest.jd_sha256, manifest.critique_score, manifest.to_json()))
+            for ref in manifest.artifacts:
+                conn.execute(
+                    "INSERT INTO artifacts (backend, sha256, object_name, size, stored) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (backend, sha256) DO UPDATE SET stored = MAX(stored, excluded.stored)",
+                    (backend, ref.sha256, ref.object_name, ref.size, int(ref.object_name in stored_objects)))
+
+    def forget(self, application_id: str) -> None:
+        """Drops an application whose objects could not be queued (its content rows stay, not stored)."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM applications WHERE application_id = ?", (application_id,))
+
+    def mark_stored(self, backend: str, stored: Sequence[PutResult]) -> None:
+        """Records content objects the publisher stored on `backend`, even ones recorded for another backend."""
+        rows = [(backend, r.name.rsplit('/', 1)[-1], r.name, r.size)
+                for r in stored if r.name.startswith(CONTENT_PREFIX)]
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO artifacts (backend, sha256, object_name, size, stored) VALUES (?, ?, ?, ?, 1) "
+                "ON CONFLICT (backend, sha256) DO UPDATE SET stored = 1", rows)
+
+    def is_stored(self, backend: str, sha256: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT stored FROM artifacts WHERE backend = ? AND sha256 = ?",
+                               (backend, sha256)).fetchone()
+        return bool(row and row[0])
+
+    def get(self, application_id: str) -> Optional[ApplicationManifest]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT manifest FROM applications WHERE application_id = ?",
+                               (application_id,)).fetchone()
+        return ApplicationManifest.from_json(row[0]) if row else None
+
+    def history(self, limit: int = 20, company: Optional[str] = None,
+                jd_sha256: Optional[str] = None) -> List[ApplicationManifest]:
+        """Most recent applications first, optionally for one company or one JD."""
+        clauses, params = [], []
+        if company:
+            clauses.append("company = ? COLLATE NOCASE")
+            params.append(company)
+        if jd_sha256:
+            clauses.append("jd_sha256 = ?")
+            params.append(jd_sha256)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT manifest FROM applications {where} ORDER BY created_at DESC LIMIT ?",
+                                (*params, limit)).fetchall()
+        return [ApplicationManifest.from_json(row[0]) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            applications = conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+            unique, unique_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM artifacts GROUP BY sha256)"
+            ).fetchone()
+            referenced_bytes = sum(
+                ref.size for (text,) in conn.execute("SELECT manifest FROM applications")
+                for ref in ApplicationManifest.from_json(text).artifacts)
+        return {"applications": applications, "unique_artifacts": unique,
+                "stored_bytes": unique_bytes, "referenced_bytes": referenced_bytes}
+
+
+_index: Optional[ArtifactIndex] = None
+_index_lock = threading.Lock()
+
+
+def _mark_published(backend: StorageBackend, stored: List[PutResult]) -> None:
+    get_artifact_index().mark_stored(backend_id(backend), stored)
+
+
+def get_artifact_index() -> ArtifactIndex:
+    """The process-wide index; it learns from the publisher which content objects have been stored."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = getattr(app_config, 'ARTIFACT_INDEX_PATH', None) \
+                or os.path.join(tempfile.gettempdir(), "resume_artifact_index.sqlite")
+            _index = ArtifactIndex(path)
+            get_artifact_publisher().add_listener(_mark_published)
+        return _index
+
+
+def record_application(application_id: str, artifacts: Sequence[Tuple[str, str, bytes, Optional[str]]],
+                       jd_text: Optional[str] = None, candidate: Optional[str] = None,
+                       company: Optional[str] = None, job_title: Optional[str] = None,
+                       timings: Optional[Dict[str, float]] = None,
+                       critique_score: Optional[float] = None) -> Optional[ApplicationManifest]:
+    """
+    Builds the manifest for one application from (role, filename, data, content_type) tuples, records
+    it in the index and queues the manifest plus any content not already stored for write-behind
+    publishing. Returns the manifest, or None when it could not be queued (downloads are unaffected).
+    """
+    index = get_artifact_index()
+    target = backend_id(get_storage_backend())
+    refs, uploads = [], []
+    for role, filename, data, content_type in artifacts:
+        if not data:
+            continue
+        digest = sha256_hex(data)
+        ref = ArtifactRef(role, digest, content_object_name(digest), len(data), content_type, filename)
+        refs.append(ref)
+        if not index.is_stored(target, digest) and all(u.name != ref.object_name for u in uploads):
+            uploads.append(StorageArtifact(ref.object_name, data=data, content_type=content_type))
+    manifest = ApplicationManifest(
+        application_id=application_id, created_at=time.time(), candidate=candidate, company=company,
+        job_title=job_title, jd_sha256=sha256_hex(jd_text.encode('utf-8')) if jd_text else None,
+        artifacts=tuple(refs), timings={k: round(v, 3) for k, v in (timings or {}).items()},
+        critique_score=critique_score)
+    # The manifest rides in the same outbox job as its content, so they are retried and stored together
+    uploads.append(StorageArtifact(manifest_object_name(application_id), data=manifest.to_json().encode('utf-8'),
+                                   content_type="application/json"))
+    # Rows exist before the job does, so the publisher's mark_stored() always has something to update
+    index.record(manifest, target)
+    if not get_artifact_publisher().enqueue(uploads):
+        index.forget(application_id)
+        return None
+    skipped = len(refs) - (len(uploads) - 1)
+    logger.info(f"Recorded application {application_id}: {len(refs)} artifact(s), "
+                f"{skipped} already stored, {len(uploads)} object(s) queued.")
+    return manifest
+
+
+def load_manifest(application_id: str, backend: Optional[StorageBackend] = None) -> Optional[ApplicationManifest]:
+    """The manifest from the index, falling back to the stored object."""
+    manifest = get_artifact_index().get(application_id)
+    if manifest is not None:
+        return manifest
+    data = (backend or get_storage_backend()).get(manifest_object_name(application_id))
+    return ApplicationManifest.from_json(data.decode('utf-8')) if data else None
+
+
+def rebuild_index(backend: Optional[StorageBackend] = None) -> int:
+    """
+    Re-reads every stored manifest into the index (e.g. on a new box). Returns the number indexed.
+    A manifest can be stored while its content is still retrying, so content only counts as stored
+    once the backend confirms it exists.
+    """
+    backend = backend or get_storage_backend()
+    index = get_artifact_index()
+    target = backend_id(backend)
+    exists: Dict[str, bool] = {}  # Applications share content; check each object once
+    count = 0
+    for obj in backend.list(MANIFEST_PREFIX):
+        data = backend.get(obj.name)
+        if not data:
+            continue
+        try:
+            manifest = ApplicationManifest.from_json(data.decode('utf-8'))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Skipping unreadable manifest '{obj.name}': {e}")
+            continue
+        for ref in manifest.artifacts:
+            if ref.object_name not in exists:
+                exists[ref.object_name] = backend.exists(ref.object_name)
+        index.record(manifest, target, [ref.object_name for ref in manifest.artifacts if exists[ref.object_name]])
+        count += 1
+    return count
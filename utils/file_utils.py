@@ -1,25 +1,224 @@
 import fitz  # PyMuPDF
+import hashlib
 import logging
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple, Union
 
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
 
-def read_pdf_text(pdf_path: str) -> str:
-    """Extract all text from a PDF file."""
-    logging.info(f"Attempting to open PDF: {pdf_path}") # Added for more verbose logging
+
+class _PdfExtractionCache:
+    """Process-wide LRU of PDF extraction results keyed by content hash, bounded by approximate size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[str, str], value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+
+@dataclass(slots=True)
+class PdfLine:
+    """One visual line of text with the font cues needed for header detection."""
+    text: str
+    page: int
+    block: int
+    bbox: Tuple[float, float, float, float]
+    size: float       # Dominant (character-weighted) font size on the line
+    bold: bool        # True when every non-blank span is bold
+    start: int        # Offset of this line in PdfLayout.text
+
+
+@dataclass(slots=True)
+class PdfLink:
+    """A hyperlink annotation together with the text drawn under it."""
+    uri: str
+    page: int
+    rect: Tuple[float, float, float, float]
+    anchor_text: str
+    line_index: Optional[int]  # Index into PdfLayout.lines of the line carrying the link
+
+
+@dataclass(slots=True)
+class PdfLayout:
+    """Compact structured view of a PDF produced by a single PyMuPDF pass."""
+    text: str
+    lines: List[PdfLine] = field(default_factory=list)
+    links: List[PdfLink] = field(default_factory=list)
+    page_count: int = 0
+    body_font_size: float = 0.0  # Most common font size, weighted by characters
+
+    def is_header_line(self, line: PdfLine) -> bool:
+        """Short line set bold or noticeably larger than body text."""
+        stripped = line.text.strip()
+        if not stripped or len(stripped) > 60:
+            return False
+        return line.bold or line.size >= self.body_font_size + 0.75
+
+    def line_at_offset(self, offset: int) -> Optional[PdfLine]:
+        """Line starting exactly at a text offset (None if the offset is mid-line)."""
+        lo, hi = 0, len(self.lines)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.lines[mid].start < offset:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.lines) and self.lines[lo].start == offset:
+            return self.lines[lo]
+        return None
+
+
+_PDF_EXTRACTION_CACHE = _PdfExtractionCache(
+    getattr(app_config, 'PDF_EXTRACTION_CACHE_MAX_MB', 32) * 1024 * 1024
+)
+
+
+def pdf_content_hash(pdf_bytes: bytes) -> str:
+    """SHA-256 hex digest of a PDF's bytes; the key for every extraction cache."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def read_pdf_bytes(pdf_source: Union[str, bytes]) -> bytes:
+    """Return the raw bytes of a PDF given a file path or the bytes themselves."""
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return bytes(pdf_source)
+    try:
+        with open(pdf_source, 'rb') as f:
+            return f.read()
+    except Exception as e:
+        logging.error(f"Failed to open PDF file: {pdf_source}. Error: {e}")
+        raise RuntimeError(f"Failed to open PDF file: {e}")
+
+
+def _open_pdf(pdf_bytes: bytes, source_label: str):
     try:
-        doc = fitz.open(pdf_path)
+        return fitz.open(stream=pdf_bytes, filetype="pdf")
     except Exception as e:
-        logging.error(f"Failed to open PDF file: {pdf_path}. Error: {e}") # Log error with path
+        logging.error(f"Failed to open PDF file: {source_label}. Error: {e}") # Log error with path
         raise RuntimeError(f"Failed to open PDF file: {e}")
-    text = ""
-    for page_num, page in enumerate(doc): # Added page_num for context
-        logging.info(f"Reading text from page {page_num + 1}")
-        text += page.get_text()
-    doc.close()
-    logging.info(f"Successfully read PDF {pdf_path}, total characters extracted: {len(text)}")
 
 
-    # ---- END TEMPORARY DEBUG BLOCK ----
-    return text
+def _rect_contains_center(rect, bbox) -> bool:
+    cx, cy = (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+    return rect[0] <= cx <= rect[2] and rect[1] <= cy <= rect[3]
+
+
+def _extract_layout(pdf_bytes: bytes, source_label: str) -> PdfLayout:
+    """Single pass over every page: text dict (blocks/lines/spans) plus link annotations."""
+    doc = _open_pdf(pdf_bytes, source_label)
+    text_parts: List[str] = []
+    lines: List[PdfLine] = []
+    links: List[PdfLink] = []
+    size_weights: Counter = Counter()
+    offset = 0
+    try:
+        for page_num, page in enumerate(doc):
+            logging.info(f"Reading text from page {page_num + 1}")
+            page_spans = []  # (line_index, text, bbox) for anchor-text lookup
+            page_dict = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+            for block_num, block in enumerate(page_dict.get("blocks", [])):
+                for line in block.get("lines", []):
+                    spans = line.get("spans", [])
+                    line_text = "".join(span["text"] for span in spans)
+                    visible = [span for span in spans if span["text"].strip()]
+                    line_index = len(lines)
+                    for span in visible:
+                        size_weights[round(span["size"], 1)] += len(span["text"])
+                        page_spans.append((line_index, span["text"], span["bbox"]))
+                    lines.append(PdfLine(
+                        text=line_text,
+                        page=page_num,
+                        block=block_num,
+                        bbox=tuple(line["bbox"]),
+                        size=max(visible, key=lambda span: len(span["text"]))["size"] if visible else 0.0,
+                        bold=bool(visible) and all(
+                            (span["flags"] & fitz.TEXT_FONT_BOLD) or "bold" in span["font"].lower()
+                            for span in visible
+                        ),
+                        start=offset,
+                    ))
+                    text_parts.append(line_text)
+                    text_parts.append("\n")
+                    offset += len(line_text) + 1
+            for link in page.get_links():
+                uri = link.get("uri")
+                if not uri:
+                    continue
+                rect = tuple(link["from"])
+                anchored = [(idx, text) for idx, text, bbox in page_spans if _rect_contains_center(rect, bbox)]
+                links.append(PdfLink(
+                    uri=uri,
+                    page=page_num,
+                    rect=rect,
+                    anchor_text="".join(text for _, text in anchored).strip(),
+                    line_index=anchored[0][0] if anchored else None,
+                ))
+        page_count = doc.page_count
+    finally:
+        doc.close()
+    body_font_size = size_weights.most_common(1)[0][0] if size_weights else 0.0
+    return PdfLayout(text="".join(text_parts), lines=lines, links=links,
+                     page_count=page_count, body_font_size=body_font_size)
+
+
+def read_pdf_layout(pdf_source: Union[str, bytes]) -> PdfLayout:
+    """Extract a PdfLayout (text, lines with font cues, hyperlinks) from a PDF path or bytes.
+    Results are memoized process-wide by SHA-256 of the file bytes, so the same resume
+    uploaded or read repeatedly is only parsed once."""
+    source_label = pdf_source if isinstance(pdf_source, str) else "<in-memory PDF>"
+    logging.info(f"Attempting to open PDF: {source_label}") # Added for more verbose logging
+    pdf_bytes = read_pdf_bytes(pdf_source)
+    cache_key = (pdf_content_hash(pdf_bytes), "layout")
+    layout = _PDF_EXTRACTION_CACHE.get(cache_key)
+    if layout is not None:
+        logging.info(f"PDF extraction cache hit for {source_label} ({len(layout.text)} characters).")
+        return layout
+
+    layout = _extract_layout(pdf_bytes, source_label)
+    logging.info(f"Successfully read PDF {source_label}, total characters extracted: {len(layout.text)}, "
+                 f"lines: {len(layout.lines)}, links: {len(layout.links)}")
+    _PDF_EXTRACTION_CACHE.put(cache_key, layout, len(layout.text) * 2 + 200 * (len(layout.lines) + len(layout.links)))
+    return layout
+
+
+def read_pdf_text(pdf_source: Union[str, bytes]) -> str:
+    """Extract all text from a PDF file (path or bytes). Shares the cached layout pass."""
+    return read_pdf_layout(pdf_source).text
 
 
 def read_text_file(txt_path: str) -> str:
@@ -30,4 +229,4 @@ def read_text_file(txt_path: str) -> str:
     except Exception as e:
         raise RuntimeError(f"Failed to open text file: {e}")
     logging.info(f"Read text file {txt_path}, characters: {len(text)}")
-    return text 
\ No newline at end of file
+    return text 
@@ -1,30 +1,25 @@
+import base64
+import io
+import mimetypes
 import os
 import logging
 import json # Make sure json is imported
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import google_crc32c
+from google.api_core.exceptions import PreconditionFailed
+from google.auth.credentials import AnonymousCredentials
 from google.cloud import storage
 from google.oauth2 import service_account # For explicit credential loading if needed
-from typing import Optional # Import Optional if you use it for type hinting
+from typing import BinaryIO, List, Optional, Sequence # Import Optional if you use it for type hinting
 
-# Your project's config
-# python_file.py
-import os
-import json
+# Credentials are read when the client is first requested, never at import time, so importing this
+# module (and everything that imports it) works on a box without GCS configured.
 try:
     import config as app_config
 except ImportError:
-    # ... fallback ...
-    class FallbackConfig:
-        SERVICE_ACCOUNT_JSON_CONTENT = "GOOGLE_CREDENTIALS_JSON_CONTENT"
-    app_config = FallbackConfig()
-
-env_var_name_to_look_for = app_config.SERVICE_ACCOUNT_JSON_CONTENT
-actual_json_string_content = os.environ.get(env_var_name_to_look_for)
-
-if actual_json_string_content:
-    credentials_info = json.loads(actual_json_string_content)
-    # ... etc.
-else:
-    logging.error(f"Environment variable '{env_var_name_to_look_for}' not set or empty.")
+    app_config = None
 
 _gcs_client = None
 
@@ -35,7 +30,16 @@ def get_gcs_client(force_refresh=False):
         return _gcs_client
 
     logging.info("GCS_UTILS: Initializing Google Cloud Storage client...")
-    
+
+    emulator_host = getattr(app_config, 'STORAGE_EMULATOR_HOST', None) or os.environ.get("STORAGE_EMULATOR_HOST")
+    if emulator_host:
+        # A fake-GCS stand-in accepts anonymous requests; no service account is needed
+        _gcs_client = storage.Client(project=getattr(app_config, 'GCP_PROJECT_ID', None) or "local-emulator",
+                                     credentials=AnonymousCredentials(),
+                                     client_options={"api_endpoint": emulator_host})
+        logging.info(f"GCS_UTILS: Client created against storage emulator at '{emulator_host}'.")
+        return _gcs_client
+
     env_var_name_for_json_content = getattr(app_config, 'GOOGLE_CREDENTIALS_ENV_VAR_NAME', 'GOOGLE_CREDENTIALS_JSON_CONTENT')
     creds_json_string = os.environ.get(env_var_name_for_json_content)
     
@@ -49,6 +53,10 @@ def get_gcs_client(force_refresh=False):
 
             _gcs_client = storage.Client(credentials=credentials, project=project_id_from_creds)
             logging.info(f"GCS_UTILS: Client created using credentials from env var '{env_var_name_for_json_content}'. Project: {project_id_from_creds or 'inferred'}")
+        elif os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
+            # Application Default Credentials from the key file the variable points at
+            _gcs_client = storage.Client(project=getattr(app_config, 'GCP_PROJECT_ID', None))
+            logging.info("GCS_UTILS: Client created using GOOGLE_APPLICATION_CREDENTIALS.")
         else:
             logging.error(f"GCS_UTILS: Env var '{env_var_name_for_json_content}' for GCS credentials not set. GCS client cannot be initialized with specific SA.")
             return None 
@@ -97,4 +105,155 @@ def upload_file_to_gcs(gcs_client: storage.Client, local_file_path: str, gcs_fil
         return True
     except Exception as e:
         logging.error(f"GCS_UTILS: Error uploading file '{local_file_path}' to '{gcs_file_path}' in bucket '{actual_bucket_name}': {e}", exc_info=True)
-        return False
\ No newline at end of file
+        return False
+def upload_bytes_to_gcs(gcs_client: storage.Client, data: bytes, gcs_file_path: str, bucket_name: Optional[str] = None,
+                        content_type: str = "application/pdf") -> bool:
+    """
+    Uploads in-memory content (e.g. rendered PDF bytes) to Google Cloud Storage without a local file.
+    The buffer wraps `data` without copying it; the size is passed so the client skips a seek/tell pass.
+    Returns True if upload was successful, False otherwise.
+    """
+    if not gcs_client:
+        logging.error(f"GCS_UTILS: GCS client not available (was None when passed). Cannot upload '{gcs_file_path}'.")
+        return False
+    if not data:
+        logging.error(f"GCS_UTILS: No content to upload for '{gcs_file_path}'.")
+        return False
+
+    actual_bucket_name = bucket_name if bucket_name else getattr(app_config, 'GCS_BUCKET_NAME', None)
+    if not actual_bucket_name:
+        logging.error("GCS_UTILS: Bucket name not provided and not found in app_config.")
+        return False
+
+    try:
+        blob = gcs_client.bucket(actual_bucket_name).blob(gcs_file_path)
+        logging.info(f"GCS_UTILS: Uploading {len(data)} bytes to bucket '{actual_bucket_name}' as '{gcs_file_path}'...")
+        blob.upload_from_file(io.BytesIO(data), size=len(data), content_type=content_type, rewind=True)
+        logging.info(f"GCS_UTILS: File '{gcs_file_path}' uploaded successfully to bucket '{actual_bucket_name}'.")
+        return True
+    except Exception as e:
+        logging.error(f"GCS_UTILS: Error uploading '{gcs_file_path}' to bucket '{actual_bucket_name}': {e}", exc_info=True)
+        return False
+
+
+# --- Concurrent, checksum-aware artifact uploads ---
+
+_RESUMABLE_CHUNK_ALIGNMENT = 256 * 1024  # GCS requires resumable chunks in multiples of 256 KiB
+_upload_executor: Optional[ThreadPoolExecutor] = None
+_upload_executor_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class GcsArtifact:
+    """One object to upload: in-memory `data` or a `local_path` streamed from disk."""
+    blob_name: str
+    data: Optional[bytes] = None
+    local_path: Optional[str] = None
+    content_type: Optional[str] = None  # Guessed from blob_name when None
+
+
+@dataclass(frozen=True, slots=True)
+class GcsUploadResult:
+    blob_name: str
+    gcs_uri: Optional[str]
+    size: int
+    crc32c: Optional[str]
+    skipped: bool = False  # The destination already held identical content
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def crc32c_base64(stream: BinaryIO, chunk_size: int = 1024 * 1024) -> str:
+    """CRC32C of the rest of `stream`, base64 big-endian as GCS reports it; the stream is rewound after."""
+    start = stream.tell()
+    checksum = google_crc32c.Checksum()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        checksum.update(chunk)
+    stream.seek(start)
+    return base64.b64encode(checksum.digest()).decode("ascii")
+
+
+def _get_upload_executor() -> ThreadPoolExecutor:
+    global _upload_executor
+    with _upload_executor_lock:
+        if _upload_executor is None:
+            workers = max(1, int(getattr(app_config, 'GCS_UPLOAD_MAX_WORKERS', 4)))
+            _upload_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gcs_upload")
+        return _upload_executor
+
+
+def _upload_chunk_size() -> int:
+    chunk_bytes = int(float(getattr(app_config, 'GCS_UPLOAD_CHUNK_MB', 8)) * 1024 * 1024)
+    return max(1, chunk_bytes // _RESUMABLE_CHUNK_ALIGNMENT) * _RESUMABLE_CHUNK_ALIGNMENT
+
+
+def _open_artifact(artifact: GcsArtifact) -> BinaryIO:
+    if artifact.data is not None:
+        return io.BytesIO(artifact.data)
+    return open(artifact.local_path, "rb")
+
+
+def _upload_artifact(bucket: storage.Bucket, artifact: GcsArtifact) -> GcsUploadResult:
+    name = artifact.blob_name
+    gcs_uri = f"gs://{bucket.name}/{name}"
+    crc32c = None
+    size = 0
+    try:
+        with _open_artifact(artifact) as stream:
+            size = stream.seek(0, io.SEEK_END)
+            stream.seek(0)
+            if not size:
+                return GcsUploadResult(name, None, 0, None, error="no content")
+            crc32c = crc32c_base64(stream)
+
+            existing = bucket.get_blob(name)
+            if existing is not None and existing.crc32c == crc32c:
+                logging.info(f"GCS_UTILS: '{name}' already holds identical content (crc32c {crc32c}); skipping upload.")
+                return GcsUploadResult(name, gcs_uri, size, crc32c, skipped=True)
+
+            # The client sends objects up to 8 MiB as one multipart request and larger ones as a
+            # resumable upload in chunks of this size, each retried on its own
+            blob = bucket.blob(name, chunk_size=_upload_chunk_size())
+            content_type = artifact.content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+            logging.info(f"GCS_UTILS: Uploading {size} bytes to '{gcs_uri}'...")
+            try:
+                # The generation precondition makes the upload idempotent, so the client retries it on
+                # transient errors; checksum="crc32c" has the client check the stored object's crc32c.
+                blob.upload_from_file(stream, size=size, content_type=content_type, checksum="crc32c",
+                                      if_generation_match=existing.generation if existing is not None else 0)
+            except PreconditionFailed:
+                # Another writer got there first; fine as long as it wrote the same bytes
+                current = bucket.get_blob(name)
+                if current is None or current.crc32c != crc32c:
+                    raise
+                return GcsUploadResult(name, gcs_uri, size, crc32c, skipped=True)
+        logging.info(f"GCS_UTILS: File '{name}' uploaded successfully to bucket '{bucket.name}'.")
+        return GcsUploadResult(name, gcs_uri, size, crc32c)
+    except Exception as e:
+        logging.error(f"GCS_UTILS: Error uploading '{name}' to bucket '{bucket.name}': {e}", exc_info=True)
+        return GcsUploadResult(name, None, size, crc32c, error=str(e))
+
+
+def upload_artifacts_to_gcs(gcs_client: storage.Client, artifacts: Sequence[GcsArtifact],
+                            bucket_name: Optional[str] = None) -> List[GcsUploadResult]:
+    """
+    Uploads a run's artifacts concurrently (GCS_UPLOAD_MAX_WORKERS at a time).
+    Each upload carries its content type and crc32c, is skipped when the destination already holds the
+    same crc32c, and large objects go up as resumable uploads in GCS_UPLOAD_CHUNK_MB chunks, with retries.
+    Returns one result per artifact, in input order; failures are reported in the result, never raised.
+    """
+    if not gcs_client:
+        logging.error("GCS_UTILS: GCS client not available (was None when passed). Cannot upload artifacts.")
+        return [GcsUploadResult(a.blob_name, None, 0, None, error="no GCS client") for a in artifacts]
+
+    actual_bucket_name = bucket_name if bucket_name else getattr(app_config, 'GCS_BUCKET_NAME', None)
+    if not actual_bucket_name:
+        logging.error("GCS_UTILS: Bucket name not provided and not found in app_config.")
+        return [GcsUploadResult(a.blob_name, None, 0, None, error="no bucket name") for a in artifacts]
+
+    bucket = gcs_client.bucket(actual_bucket_name)
+    futures = [_get_upload_executor().submit(_upload_artifact, bucket, artifact) for artifact in artifacts]
+    return [future.result() for future in futures]
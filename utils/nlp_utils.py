@@ -1,41 +1,131 @@
 import re
-from typing import Dict
-def split_resume_sections(pdf_text: str) -> Dict[str, str]:
-    headers = [
-        ('summary', r'SUMMARY'),
-        ('work_experience', r'WORK EXPERIENCE'), # Current section being processed
-        ('technical_skills', r'TECHNICAL SKILLS'), # Expected next by this list
-        ('projects', r'PROJECTS'),
-    ]
-    pattern = r'(?i)(' + '|'.join(h[1] for h in headers) + r')'
-    matches = list(re.finditer(pattern, pdf_text)) # These are in order of appearance in PDF
-    section_texts = {}
-    for idx, (section_key, header_regex_pattern_from_list) in enumerate(headers): # Iterating in order of `headers` list
-        # Find this header_regex_pattern_from_list in matches
-        current_header_match = next((m for m in matches if m.group(0).strip().upper() == header_regex_pattern_from_list.upper()), None) # Corrected to use .upper() on the pattern for comparison consistency
-        
-        if not current_header_match:
-            section_texts[section_key] = ''
-            continue
-        
-        start_of_content = current_header_match.end()
-        end_of_content = len(pdf_text) # Default end
-
-        # Try to find the *actual next occurring header in the PDF* from the `matches` list
-        # to define the end of the current section's content.
-        current_header_start_in_pdf = current_header_match.start()
-        next_actual_header_in_pdf_match = None
-        
-        for m_obj in matches: # Iterate through all headers found in PDF order
-            if m_obj.start() > current_header_start_in_pdf: # Found a header that appears after the current one
-                next_actual_header_in_pdf_match = m_obj
-                break # Take the very first one
-
-        if next_actual_header_in_pdf_match:
-            end_of_content = next_actual_header_in_pdf_match.start()
-            
-        section_texts[section_key] = pdf_text[start_of_content:end_of_content].strip()
-    return section_texts
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from utils.file_utils import PdfLayout
+
+# Canonical section key -> header spellings seen on real resumes. Matching is case-insensitive,
+# whitespace-tolerant, and treats "and"/"&" alike. Only the first four keys feed ResumeSections;
+# the rest exist so their content does not bleed into the section above them.
+SECTION_HEADER_SYNONYMS: Dict[str, List[str]] = {
+    'summary': ['summary', 'professional summary', 'career summary', 'executive summary', 'profile',
+                'professional profile', 'objective', 'career objective', 'about me', 'overview'],
+    'work_experience': ['work experience', 'experience', 'professional experience', 'relevant experience',
+                        'employment history', 'employment', 'work history', 'career history',
+                        'industry experience'],
+    'technical_skills': ['technical skills', 'skills', 'core competencies', 'key skills', 'technologies',
+                         'tools & technologies', 'skills & tools', 'skills & expertise', 'technical proficiencies',
+                         'technical expertise', 'areas of expertise'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'selected projects', 'key projects',
+                 'project experience', 'side projects', 'research projects'],
+    'education': ['education', 'academic background', 'education & certifications', 'academics'],
+    'certifications': ['certifications', 'licenses & certifications', 'certificates'],
+    'publications': ['publications', 'research', 'papers'],
+    'awards': ['awards', 'honors & awards', 'achievements', 'honors'],
+    'volunteering': ['volunteer experience', 'volunteering', 'leadership & activities', 'leadership', 'activities'],
+    'additional': ['languages', 'interests', 'hobbies', 'additional information'],
+}
+RESUME_SECTION_KEYS = ('summary', 'work_experience', 'technical_skills', 'projects')
+
+
+def _normalize_header(text: str) -> str:
+    text = re.sub(r'[*#_:]+', ' ', text.lower())
+    text = re.sub(r'\s+(?:and|&)\s+', ' & ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+@dataclass(slots=True)
+class SectionSpan:
+    """A detected resume section: canonical key, header text and offsets into the source text."""
+    key: str
+    header: str
+    header_start: int
+    start: int  # First character of the section content
+    end: int    # One past the last character of the section content
+
+
+class ResumeSectionizer:
+    """
+    Single-pass resume sectionizer. All header spellings are compiled into one line-anchored
+    alternation, so detection is one finditer over the text; section bounds follow directly
+    from consecutive header positions.
+    """
+
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None):
+        table = synonyms or SECTION_HEADER_SYNONYMS
+        self._lookup: Dict[str, str] = {}
+        for key, spellings in table.items():
+            for spelling in spellings:
+                self._lookup.setdefault(_normalize_header(spelling), key)
+        alternatives = []
+        for normalized in sorted(self._lookup, key=len, reverse=True):  # Longest spelling wins
+            words = [re.escape(w) if w != '&' else r'(?:&|and)' for w in normalized.split(' ')]
+            alternatives.append(r'\s+'.join(words))
+        self._header_re = re.compile(
+            r'^[ \t]*(?:#{1,4}[ \t]*)?(?:\*\*)?[ \t]*(' + '|'.join(alternatives) + r')[ \t]*(?:\*\*)?[ \t]*:?[ \t]*$',
+            re.IGNORECASE | re.MULTILINE,
+        )
+
+    def _layout_accepts(self, layout: PdfLayout, match: "re.Match") -> bool:
+        # Font cue: a header line is styled as a header or set in capitals. Plain body-style
+        # lines that happen to read "Experience" or "Skills" are not section starts.
+        line = layout.line_at_offset(match.start())
+        if line is None:
+            return True  # Offset drift (e.g. leading whitespace); trust the text match
+        header_text = match.group(1)
+        return layout.is_header_line(line) or header_text.isupper()
+
+    def _layout_only_headers(self, layout: PdfLayout, taken: set) -> List[SectionSpan]:
+        # Styled all-caps lines that are not in the synonym table still end the section above them.
+        spans = []
+        for line in layout.lines:
+            stripped = line.text.strip()
+            if (line.start not in taken and stripped.isupper() and len(stripped.split()) <= 4
+                    and layout.is_header_line(line) and not any(ch.isdigit() for ch in stripped)):
+                line_end = line.start + len(line.text)
+                spans.append(SectionSpan('other', stripped, line.start, line_end, line_end))
+        return spans
+
+    def sectionize(self, text: str, layout: Optional[PdfLayout] = None) -> List[SectionSpan]:
+        """All sections in document order with content offsets. O(len(text)) plus O(lines) with a layout."""
+        use_layout = layout is not None and layout.text == text
+        headers: List[SectionSpan] = []
+        for m in self._header_re.finditer(text):
+            if use_layout and not self._layout_accepts(layout, m):
+                continue
+            key = self._lookup.get(_normalize_header(m.group(1)), 'other')
+            headers.append(SectionSpan(key, m.group(1).strip(), m.start(), m.end(), m.end()))
+        if use_layout and headers:
+            taken = {h.header_start for h in headers}
+            first_start = headers[0].header_start
+            extra = [h for h in self._layout_only_headers(layout, taken) if h.header_start > first_start]
+            if extra:
+                headers = sorted(headers + extra, key=lambda h: h.header_start)
+        for current, following in zip(headers, headers[1:]):
+            current.end = following.header_start
+        if headers:
+            headers[-1].end = len(text)
+        return [h for h in headers if h.key != 'other']
+
+
+_DEFAULT_SECTIONIZER = ResumeSectionizer()
+
+
+def sectionize_resume(pdf_text: str, layout: Optional[PdfLayout] = None,
+                      sectionizer: Optional[ResumeSectionizer] = None) -> List[SectionSpan]:
+    """All recognised sections (including education, certifications, ...) with offsets."""
+    return (sectionizer or _DEFAULT_SECTIONIZER).sectionize(pdf_text, layout)
+
+
+def split_resume_sections(pdf_text: str, layout: Optional[PdfLayout] = None,
+                          sectionizer: Optional[ResumeSectionizer] = None) -> Dict[str, str]:
+    """Text of the four tailorable sections (empty string when absent), keyed for ResumeSections."""
+    section_texts: Dict[str, List[str]] = {key: [] for key in RESUME_SECTION_KEYS}
+    for span in sectionize_resume(pdf_text, layout, sectionizer):
+        if span.key in section_texts:
+            content = pdf_text[span.start:span.end].strip()
+            if content:
+                section_texts[span.key].append(content)
+    return {key: "\n\n".join(parts) for key, parts in section_texts.items()}
 
 def parse_job_description(jd_text: str) -> Dict:
     """Parse job description text into job_title and requirements."""
@@ -0,0 +1,296 @@
+# Resume_Tailoring/utils/storage.py
+"""
+Object storage behind one interface, so the pipeline does not depend on google.cloud.storage.
+
+StorageBackend has put_many/put (with skip-if-identical by crc32c), open_read/get, exists, list and
+signed_url. There are two implementations: GcsStorageBackend (the bucket, through gcs_utils) and
+LocalStorageBackend (a directory tree with the same object names). get_storage_backend() picks one
+from STORAGE_BACKEND. "auto" uses GCS when credentials or an emulator are configured and local disk
+otherwise, so batch runs and benchmarks see real storage I/O even on an offline box. Objects are
+streamed through files in chunks, so large artifacts are never read fully into memory on the way.
+"""
+import base64
+import io
+import logging
+import mimetypes
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Sequence
+
+import google_crc32c
+
+from .gcs_utils import GcsArtifact, crc32c_base64, get_gcs_client, upload_artifacts_to_gcs
+
+try:
+    import config as app_config
+except ImportError:
+    app_config = None
+
+logger = logging.getLogger(__name__)
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class StorageArtifact:
+    """One object to store: in-memory `data` or a `local_path` streamed from disk."""
+    name: str
+    data: Optional[bytes] = None
+    local_path: Optional[str] = None
+    content_type: Optional[str] = None  # Guessed from the name when None
+
+
+@dataclass(frozen=True, slots=True)
+class PutResult:
+    name: str
+    uri: Optional[str]
+    size: int
+    crc32c: Optional[str]
+    skipped: bool = False  # The destination already held identical content
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class StoredObject:
+    name: str
+    size: int
+    crc32c: Optional[str]
+    content_type: Optional[str]
+    updated: Optional[float]  # Epoch seconds
+
+
+class StorageBackend(ABC):
+    """Object store keyed by '/'-separated names. Implementations log and return None/False on failure."""
+    name = "base"
+
+    def is_available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def uri(self, object_name: str) -> str:
+        ...
+
+    @abstractmethod
+    def put_many(self, artifacts: Sequence[StorageArtifact]) -> List[PutResult]:
+        """Stores every artifact; one result per artifact, in input order. Never raises."""
+
+    def put(self, artifact: StorageArtifact) -> PutResult:
+        return self.put_many([artifact])[0]
+
+    @abstractmethod
+    def open_read(self, object_name: str) -> Optional[BinaryIO]:
+        """A readable stream over the object (the caller closes it), or None when missing."""
+
+    def get(self, object_name: str) -> Optional[bytes]:
+        stream = self.open_read(object_name)
+        if stream is None:
+            return None
+        with stream:
+            return stream.read()
+
+    @abstractmethod
+    def exists(self, object_name: str) -> bool:
+        ...
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        """Objects whose names start with `prefix`, in name order."""
+
+    @abstractmethod
+    def signed_url(self, object_name: str, expires_seconds: int = 3600) -> Optional[str]:
+        """A time-limited URL for downloading the object, or None when the backend cannot sign."""
+
+
+class GcsStorageBackend(StorageBackend):
+    """The configured bucket; uploads go through the concurrent crc32c uploader in gcs_utils."""
+    name = "gcs"
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+
+    def _bucket(self):
+        client = get_gcs_client()
+        return client.bucket(self.bucket_name) if client else None
+
+    def is_available(self) -> bool:
+        return bool(self.bucket_name) and get_gcs_client() is not None
+
+    def uri(self, object_name: str) -> str:
+        return f"gs://{self.bucket_name}/{object_name}"
+
+    def put_many(self, artifacts: Sequence[StorageArtifact]) -> List[PutResult]:
+        results = upload_artifacts_to_gcs(get_gcs_client(), [
+            GcsArtifact(a.name, data=a.data, local_path=a.local_path, content_type=a.content_type) for a in artifacts
+        ], bucket_name=self.bucket_name)
+        return [PutResult(r.blob_name, r.gcs_uri, r.size, r.crc32c, r.skipped, r.error) for r in results]
+
+    def open_read(self, object_name: str) -> Optional[BinaryIO]:
+        bucket = self._bucket()
+        if bucket is None:
+            return None
+        try:
+            blob = bucket.get_blob(object_name)
+            return blob.open("rb") if blob is not None else None  # Chunked ranged reads, not one download
+        except Exception as e:
+            logger.error(f"Could not read '{self.uri(object_name)}': {e}", exc_info=True)
+            return None
+
+    def exists(self, object_name: str) -> bool:
+        bucket = self._bucket()
+        try:
+            return bucket is not None and bucket.blob(object_name).exists()
+        except Exception as e:
+            logger.error(f"Could not check '{self.uri(object_name)}': {e}", exc_info=True)
+            return False
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        client = get_gcs_client()
+        if client is None:
+            return
+        try:
+            for blob in client.list_blobs(self.bucket_name, prefix=prefix or None):
+                yield StoredObject(blob.name, int(blob.size or 0), blob.crc32c, blob.content_type,
+                                   blob.updated.timestamp() if blob.updated else None)
+        except Exception as e:
+            logger.error(f"Could not list '{self.uri(prefix)}': {e}", exc_info=True)
+
+    def signed_url(self, object_name: str, expires_seconds: int = 3600) -> Optional[str]:
+        bucket = self._bucket()
+        if bucket is None:
+            return None
+        try:
+            return bucket.blob(object_name).generate_signed_url(
+                version="v4", expiration=timedelta(seconds=expires_seconds), method="GET")
+        except Exception as e:  # Signing needs a service account key (not ADC user or anonymous credentials)
+            logger.warning(f"Could not sign a URL for '{self.uri(object_name)}': {e}")
+            return None
+
+
+class LocalStorageBackend(StorageBackend):
+    """Objects as files under `root`, with the same names as in the bucket; writes are atomic."""
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, object_name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, object_name))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Object name escapes the storage root: '{object_name}'")
+        return path
+
+    def uri(self, object_name: str) -> str:
+        return Path(self._path(object_name)).as_uri()
+
+    def _put(self, artifact: StorageArtifact) -> PutResult:
+        name = artifact.name
+        size = 0
+        crc32c = None
+        try:
+            path = self._path(name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            source: BinaryIO = io.BytesIO(artifact.data) if artifact.data is not None \
+                else open(artifact.local_path, "rb")
+            with source:
+                # Copy to a temp file beside the destination, checksumming on the way
+                checksum = google_crc32c.Checksum()
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as out:
+                        for chunk in iter(lambda: source.read(_COPY_CHUNK_BYTES), b""):
+                            checksum.update(chunk)
+                            out.write(chunk)
+                            size += len(chunk)
+                    crc32c = base64.b64encode(checksum.digest()).decode("ascii")
+                    if not size:
+                        return PutResult(name, None, 0, None, error="no content")
+                    if os.path.exists(path) and self._file_crc32c(path) == crc32c:
+                        return PutResult(name, self.uri(name), size, crc32c, skipped=True)
+                    os.replace(tmp_path, path)
+                    tmp_path = None
+                finally:
+                    if tmp_path is not None:
+                        os.remove(tmp_path)
+            return PutResult(name, self.uri(name), size, crc32c)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not store '{name}' under '{self.root}': {e}", exc_info=True)
+            return PutResult(name, None, size, crc32c, error=str(e))
+
+    @staticmethod
+    def _file_crc32c(path: str) -> str:
+        with open(path, "rb") as f:
+            return crc32c_base64(f)
+
+    def put_many(self, artifacts: Sequence[StorageArtifact]) -> List[PutResult]:
+        return [self._put(artifact) for artifact in artifacts]
+
+    def open_read(self, object_name: str) -> Optional[BinaryIO]:
+        try:
+            return open(self._path(object_name), "rb")
+        except (OSError, ValueError):
+            return None
+
+    def exists(self, object_name: str) -> bool:
+        try:
+            return os.path.isfile(self._path(object_name))
+        except ValueError:
+            return False
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        # Walk only the directory the prefix lives in, then match names as GCS does (plain string prefix)
+        start = os.path.join(self.root, os.path.dirname(prefix))
+        names = []
+        for dirpath, _dirnames, filenames in os.walk(start):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                name = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, "/")
+                if name.startswith(prefix):
+                    names.append(name)
+        for name in sorted(names):
+            path = self._path(name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield StoredObject(name, stat.st_size, None, mimetypes.guess_type(name)[0], stat.st_mtime)
+
+    def signed_url(self, object_name: str, expires_seconds: int = 3600) -> Optional[str]:
+        return self.uri(object_name) if self.exists(object_name) else None
+
+
+_storage_backend: Optional[StorageBackend] = None
+_storage_backend_lock = threading.Lock()
+
+
+def _gcs_configured() -> bool:
+    return any([getattr(app_config, 'STORAGE_EMULATOR_HOST', None), os.environ.get("STORAGE_EMULATOR_HOST"),
+                os.environ.get(getattr(app_config, 'GOOGLE_CREDENTIALS_ENV_VAR_NAME', 'GOOGLE_CREDENTIALS_JSON_CONTENT')),
+                os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")])
+
+
+def get_storage_backend() -> StorageBackend:
+    """The process-wide backend chosen by STORAGE_BACKEND ("gcs", "local" or "auto")."""
+    global _storage_backend
+    with _storage_backend_lock:
+        if _storage_backend is None:
+            choice = str(getattr(app_config, 'STORAGE_BACKEND', 'auto')).lower()
+            if choice == "auto":
+                choice = "gcs" if _gcs_configured() else "local"
+            if choice == "gcs":
+                _storage_backend = GcsStorageBackend(getattr(app_config, 'GCS_BUCKET_NAME', None))
+            else:
+                root = getattr(app_config, 'LOCAL_STORAGE_DIR', None) \
+                    or os.path.join(tempfile.gettempdir(), "resume_storage")
+                _storage_backend = LocalStorageBackend(root)
+            logger.info(f"Storage backend: {_storage_backend.name}")
+        return _storage_backend